@@ -0,0 +1,55 @@
+# Подача заявки на мероприятие — общий код для /api/apply/ и POST /api/applications/.
+#
+# Существование мероприятия, наличие профиля таланта и допуск по факультету
+# проверяются одним SELECT с подзапросами EXISTS. Дубликаты отсекает уникальное
+# ограничение (user, event): вставка идёт в точке сохранения, и IntegrityError
+# превращается в ошибку «заявка уже подана» — без отдельной проверки и гонок.
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Subquery
+
+from .models import Application, Event, TalentProfile
+
+
+class SubmissionError(Exception):
+    def __init__(self, detail, status_code=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def submit_application(user, event_id, message=''):
+    """Создаёт заявку пользователя на мероприятие или бросает SubmissionError."""
+    if not event_id:
+        raise SubmissionError('Отсутствует ID мероприятия (event_id)')
+    try:
+        event_id = int(event_id)
+    except (TypeError, ValueError):
+        raise SubmissionError('Некорректный ID мероприятия (event_id)')
+
+    profile = TalentProfile.objects.filter(user_id=user.pk)
+    eligibility = (
+        Event.objects
+        .filter(pk=event_id)
+        .annotate(
+            has_profile=Exists(profile),
+            faculty_allowed=Exists(Event.faculties.through.objects.filter(
+                event_id=OuterRef('pk'),
+                faculty_id=Subquery(profile.values('faculty_id')[:1]),
+            )),
+        )
+        .values('faculty_restriction', 'has_profile', 'faculty_allowed')
+        .first()
+    )
+    if eligibility is None:
+        raise SubmissionError(f'Мероприятие с ID {event_id} не найдено', 404)
+    if not eligibility['has_profile']:
+        raise SubmissionError('У вас нет профиля таланта для подачи заявки')
+    if eligibility['faculty_restriction'] and not eligibility['faculty_allowed']:
+        raise SubmissionError('Это мероприятие ограничено по факультетам, и ваш факультет не соответствует.', 403)
+
+    try:
+        with transaction.atomic():
+            return Application.objects.create(user_id=user.pk, event_id=event_id, message=message or '')
+    except IntegrityError:
+        raise SubmissionError('Вы уже подали заявку на это мероприятие')
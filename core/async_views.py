@@ -0,0 +1,69 @@
+# Асинхронные представления DRF.
+#
+# DRF не умеет выполнять async-обработчики, поэтому AsyncAPIViewMixin подменяет
+# dispatch: аутентификация и проверка прав выполняются в потоке (sync_to_async),
+# async-обработчики (async def get / async def list) ожидаются напрямую, а обычные
+# синхронные действия того же ViewSet (create, update, ...) уходят в поток.
+# Под ASGI такие запросы не занимают поток воркера, пока ждут базу.
+#
+# Внутри async-обработчика к базе обращаются только через async ORM
+# (afirst, acount, async for). QuerySet для списков должен заранее загружать всё,
+# что нужно сериализатору (select_related/prefetch_related): ленивый запрос во время
+# сериализации завершится ошибкой SynchronousOnlyOperation.
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from rest_framework.response import Response
+
+from .pagination import apaginate_queryset
+
+
+class AsyncAPIViewMixin:
+    """Подмешивается к APIView/ViewSet перед базовым классом DRF."""
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncListMixin(AsyncAPIViewMixin):
+    """Асинхронный аналог ListModelMixin.list для GenericAPIView."""
+
+    async def alist(self, request, *args, **kwargs):
+        # Фильтры могут проверять значения по базе (django-filter), поэтому — в потоке
+        queryset = await sync_to_async(lambda: self.filter_queryset(self.get_queryset()))()
+
+        if self.paginator is not None:
+            page = await apaginate_queryset(self.paginator, queryset, request, view=self)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+        objects = [obj async for obj in queryset]
+        return Response(self.get_serializer(objects, many=True).data)
@@ -0,0 +1,187 @@
+# JWT с ролевыми claims и аутентификация без запроса к таблице пользователей.
+#
+# В токен записываются роль пользователя, ID профилей таланта/организатора и
+# факультета, а также версия claims. Версия хранится в кэше и меняется сигналами
+# при изменении профилей (core/signals.py). Если версия в токене актуальна,
+# безопасные (read-only) запросы получают ClaimsUser, который обращается к БД
+# только при доступе к полям, которых нет в токене. Иначе пользователь загружается
+# из БД как обычно, так что устаревший токен не даёт устаревших прав.
+#
+# Версии имеют смысл только при общем для воркеров кэше (см. CACHES в settings):
+# gunicorn с несколькими воркерами не запустится с локальным кэшем (core/checks.py).
+# AUTH_CLAIMS_SHORTCUTS=0 отключает доверие к claims — пользователь всегда читается из БД.
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework.permissions import BasePermission
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .models import OrganizerProfile, TalentProfile
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+ROLE_CLAIM = 'role'
+CLAIMS_VERSION_CLAIM = 'claims_ver'
+CLAIMS_VERSION_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _version_key(user_id):
+    return f'auth:claims_version:{user_id}'
+
+
+def get_claims_version(user_id, create=False):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None and create:
+        cache.add(key, uuid.uuid4().hex, CLAIMS_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_claims(user_id):
+    """Делает claims во всех выданных токенах пользователя устаревшими."""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, CLAIMS_VERSION_TIMEOUT)
+
+
+def user_claims(user):
+    """Claims роли и профилей для пользователя (по запросу на каждый тип профиля)."""
+    talent = TalentProfile.objects.filter(user_id=user.pk).values('id', 'faculty_id').first()
+    organizer_id = OrganizerProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+    return {
+        ROLE_CLAIM: 'organizer' if organizer_id else 'talent',
+        'talent_profile_id': talent['id'] if talent else None,
+        'organizer_profile_id': organizer_id,
+        'faculty_id': talent['faculty_id'] if talent else None,
+        'is_staff': user.is_staff,
+        CLAIMS_VERSION_CLAIM: get_claims_version(user.pk, create=True),
+    }
+
+
+def add_claims(token, user):
+    for claim, value in user_claims(user).items():
+        token[claim] = value
+    return token
+
+
+def get_tokens_for_user(user):
+    """RefreshToken с claims роли; access-токен наследует их."""
+    return add_claims(RefreshToken.for_user(user), user)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        # Новый access-токен получает актуальные claims, а не копию из refresh-токена
+        access = AccessToken(data['access'])
+        user = get_user_model().objects.get(**{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]})
+        data['access'] = str(add_claims(access, user))
+        return data
+
+
+class ClaimsUser:
+    """
+    Пользователь, восстановленный из claims токена. Поля из токена доступны сразу,
+    остальные атрибуты загружают объект User из БД при первом обращении.
+    В запросах ORM используйте user.pk / user_id=..., а не сам объект.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, token):
+        self.token = token
+        self.id = self.pk = token[api_settings.USER_ID_CLAIM]
+        self.role = token.get(ROLE_CLAIM)
+        self.talent_profile_id = token.get('talent_profile_id')
+        self.organizer_profile_id = token.get('organizer_profile_id')
+        self.faculty_id = token.get('faculty_id')
+        self.is_staff = bool(token.get('is_staff', False))
+
+    @cached_property
+    def _user(self):
+        return get_user_model().objects.get(**{api_settings.USER_ID_FIELD: self.pk})
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name == '_user':
+            raise AttributeError(name)
+        return getattr(self._user, name)
+
+    def __str__(self):
+        return f'ClaimsUser {self.pk}'
+
+    def __eq__(self, other):
+        return getattr(other, 'pk', None) == self.pk and getattr(other, 'is_authenticated', False)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, который для безопасных методов не читает таблицу пользователей."""
+
+    def authenticate(self, request):
+        self._safe_method = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self._safe_method and settings.AUTH_CLAIMS_SHORTCUTS and self.claims_are_current(validated_token):
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+    @staticmethod
+    def claims_are_current(token):
+        version = token.get(CLAIMS_VERSION_CLAIM)
+        user_id = token.get(api_settings.USER_ID_CLAIM)
+        return version is not None and user_id is not None and version == get_claims_version(user_id)
+
+
+# Роль пользователя без лишних запросов, если она уже есть в claims
+
+def is_organizer(user):
+    if isinstance(user, ClaimsUser):
+        return user.role == 'organizer'
+    return hasattr(user, 'organizerprofile')
+
+
+class IsOrganizer(BasePermission):
+    message = 'Доступно только организаторам'
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and is_organizer(request.user))
+
+
+def get_talent_profile_id(user):
+    if isinstance(user, ClaimsUser):
+        return user.talent_profile_id
+    return TalentProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+
+
+def get_faculty_id(user):
+    if isinstance(user, ClaimsUser):
+        return user.faculty_id
+    return TalentProfile.objects.filter(user_id=user.pk).values_list('faculty_id', flat=True).first()
+
+
+async def aget_talent_profile_id(user):
+    if isinstance(user, ClaimsUser):
+        return user.talent_profile_id
+    return await TalentProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).afirst()
+
+
+async def aget_faculty_id(user):
+    if isinstance(user, ClaimsUser):
+        return user.faculty_id
+    return await TalentProfile.objects.filter(user_id=user.pk).values_list('faculty_id', flat=True).afirst()
@@ -0,0 +1,57 @@
+# Фоновый пул потоков для работы, которую не нужно делать в потоке запроса
+# (обработка изображений, рассылки). Задачи ставятся после коммита транзакции,
+# чтобы воркер видел уже сохранённые данные.
+
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .log import request_id_var
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                    thread_name_prefix='core-background',
+                )
+    return _executor
+
+
+def _run(func, args, kwargs, request_id):
+    # Задача выполняется в пустом контексте: метрики запроса (core/perf.py) и чтение
+    # с реплик (core/routers.py) к ней не относятся — переносится только request_id
+    request_id_var.set(request_id)
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Ошибка фоновой задачи %s', getattr(func, '__name__', func))
+    finally:
+        # Поток пула живёт долго — не держим соединения с БД между задачами
+        close_old_connections()
+
+
+def submit(func, *args, **kwargs):
+    """Выполняет func в фоновом пуле (или сразу, если BACKGROUND_TASKS_EAGER)."""
+    request_id = request_id_var.get()
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        contextvars.Context().run(_run, func, args, kwargs, request_id)
+        return None
+    return get_executor().submit(contextvars.Context().run, _run, func, args, kwargs, request_id)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """Ставит задачу в пул после успешного коммита текущей транзакции."""
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
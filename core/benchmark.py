@@ -0,0 +1,231 @@
+# Бенчмарк API внутри процесса (manage.py benchmark).
+#
+# Запросы идут через django.test.Client — весь стек middleware и представлений,
+# но без сети и сервера, поэтому результаты сравнимы между запусками на одной машине.
+# Смесь запросов задаётся весами сценариев (MIXES или --mix events=5,apply=1).
+# Пользователи, мероприятия и заявки выбираются из базы (например, из данных
+# seed_load_data); сценарии записи действительно меняют данные.
+
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import Client
+
+from .authentication import get_tokens_for_user
+from .models import Application, Event, OrganizerProfile, TalentProfile
+
+SEARCH_TERMS = ('Хакатон', 'Python', 'Форум', 'дизайну', 'Олимпиада')
+
+
+def _host():
+    # Client по умолчанию ходит на testserver, который разрешён только в тестах
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def latency_summary(latencies):
+    """Перцентили задержки в миллисекундах."""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {key: None for key in ('p50', 'p90', 'p95', 'p99', 'max')}
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        'p50': round(cuts[49], 1),
+        'p90': round(cuts[89], 1),
+        'p95': round(cuts[94], 1),
+        'p99': round(cuts[98], 1),
+        'max': round(latencies[-1], 1),
+    }
+
+
+class Fixtures:
+    """Выборка пользователей и объектов, к которым обращаются сценарии."""
+
+    def __init__(self, users=50, rng=None):
+        rng = rng or random.Random()
+        talent_ids = list(TalentProfile.objects.order_by('?').values_list('user_id', flat=True)[:users])
+        organizer_ids = list(OrganizerProfile.objects.order_by('?').values_list('user_id', flat=True)[:users])
+        if not talent_ids or not organizer_ids:
+            raise ValueError('Нужны таланты и организаторы — заполните базу командой seed_load_data')
+
+        self.talent_tokens = self._tokens(talent_ids)
+        self.organizer_tokens = self._tokens(organizer_ids)
+        self.event_ids = list(
+            Event.objects.filter(status='published').order_by('?').values_list('pk', flat=True)[:1000]
+        )
+        self.applications = defaultdict(list)
+        for application_id, organizer_id in (
+            Application.objects.filter(event__organizer_id__in=organizer_ids)
+            .order_by('?').values_list('pk', 'event__organizer_id')[:5000]
+        ):
+            self.applications[organizer_id].append(application_id)
+        self.rng = rng
+
+    @staticmethod
+    def _tokens(user_ids):
+        return {user.pk: str(get_tokens_for_user(user).access_token) for user in User.objects.filter(pk__in=user_ids)}
+
+    def talent(self):
+        return self.rng.choice(list(self.talent_tokens.items()))
+
+    def organizer(self):
+        return self.rng.choice(list(self.organizer_tokens.items()))
+
+    def event_id(self):
+        return self.rng.choice(self.event_ids) if self.event_ids else 0
+
+
+# Сценарий: fixtures -> (метод, путь, данные, access-токен)
+
+def _get(path, role='talent'):
+    def scenario(fixtures):
+        _, token = getattr(fixtures, role)()
+        return 'get', path(fixtures) if callable(path) else path, None, token
+    return scenario
+
+
+def _apply(fixtures):
+    _, token = fixtures.talent()
+    return 'post', '/api/apply/', {'event_id': fixtures.event_id()}, token
+
+
+def _change_status(fixtures):
+    user_id, token = fixtures.organizer()
+    application_ids = fixtures.applications.get(user_id)
+    if not application_ids:
+        return 'get', '/api/applications/inbox/', None, token
+    return ('post', f'/api/applications/{fixtures.rng.choice(application_ids)}/change_status/',
+            {'status': fixtures.rng.choice(['approved', 'rejected', 'pending'])}, token)
+
+
+SCENARIOS = {
+    'events': _get('/api/events/'),
+    'events-cursor': _get('/api/events/?pagination=cursor'),
+    'event-detail': _get(lambda f: f'/api/events/{f.event_id()}/'),
+    'search': _get(lambda f: f'/api/events/?search={f.rng.choice(SEARCH_TERMS)}'),
+    'recommendations': _get('/api/recommendations/'),
+    'skills': _get('/api/skills/'),
+    'my-applications': _get('/api/applications/'),
+    'activity-stats': _get('/api/user/activity/stats/'),
+    'inbox': _get('/api/applications/inbox/', role='organizer'),
+    'organizer-events': _get('/api/events/?organizer=me', role='organizer'),
+    'apply': _apply,
+    'change-status': _change_status,
+}
+
+MIXES = {
+    'read': {'events': 30, 'event-detail': 15, 'search': 10, 'recommendations': 15, 'skills': 10,
+             'my-applications': 10, 'inbox': 5, 'organizer-events': 5},
+    'mixed': {'events': 25, 'event-detail': 10, 'search': 10, 'recommendations': 10, 'skills': 5,
+              'my-applications': 10, 'inbox': 10, 'apply': 10, 'change-status': 10},
+    'write': {'apply': 50, 'change-status': 50},
+}
+
+
+def parse_mix(value):
+    """'read' или 'events=5,apply=1' -> {сценарий: вес}."""
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Неизвестный сценарий {name!r}; доступны: {", ".join(sorted(SCENARIOS))}')
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f'Некорректный вес сценария {name!r}: {weight!r}')
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError('Сумма весов сценариев должна быть больше нуля')
+    return mix
+
+
+def run(mix, requests=1000, concurrency=4, users=50, random_seed=None):
+    """Выполняет requests запросов в concurrency потоков. Возвращает сводку по сценариям."""
+    rng = random.Random(random_seed)
+    fixtures = Fixtures(users=users, rng=rng)
+    names, weights = zip(*mix.items())
+    plan = rng.choices(names, weights, k=requests)
+    # Аргументы запросов готовятся заранее: в потоках — только HTTP-стек
+    calls = [(name, SCENARIOS[name](fixtures)) for name in plan]
+
+    results = defaultdict(list)
+    lock = threading.Lock()
+
+    def execute(client, item):
+        name, (method, path, data, token) = item
+        headers = {'Authorization': f'Bearer {token}'}
+        started = time.perf_counter()
+        try:
+            if method == 'post':
+                response = client.post(path, data, content_type='application/json', headers=headers)
+            else:
+                response = client.get(path, headers=headers)
+            status = response.status_code
+        except Exception:
+            status = None
+        latency = (time.perf_counter() - started) * 1000
+        with lock:
+            results[name].append((status, latency))
+
+    def worker(chunk):
+        client = Client(raise_request_exception=False, SERVER_NAME=_host())
+        try:
+            for item in chunk:
+                execute(client, item)
+        finally:
+            # У каждого потока своё соединение с базой
+            connections.close_all()
+
+    concurrency = max(1, min(concurrency, len(calls) or 1))
+    chunks = [calls[i::concurrency] for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, chunks))
+    elapsed = time.perf_counter() - started
+
+    return summarize(results, elapsed, concurrency)
+
+
+def _row(samples, elapsed):
+    statuses = [status for status, _ in samples]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for status in statuses if status is None or status >= 500),
+        'client_errors': sum(1 for status in statuses if status is not None and 400 <= status < 500),
+        'rps': round(len(samples) / elapsed, 1) if elapsed else None,
+        **latency_summary([latency for _, latency in samples]),
+    }
+
+
+def summarize(results, elapsed, concurrency):
+    everything = [sample for samples in results.values() for sample in samples]
+    return {
+        'concurrency': concurrency,
+        'elapsed_seconds': round(elapsed, 3),
+        'total': _row(everything, elapsed),
+        'scenarios': {name: _row(samples, elapsed) for name, samples in sorted(results.items())},
+    }
+
+
+def compare(current, baseline):
+    """Изменение rps и p95 относительно сохранённой сводки, в процентах."""
+    def delta(new, old):
+        if new is None or not old:
+            return None
+        return round((new - old) / old * 100, 1)
+
+    rows = {}
+    for name, row in [('total', current['total']), *current['scenarios'].items()]:
+        old = baseline['total'] if name == 'total' else baseline.get('scenarios', {}).get(name)
+        if old:
+            rows[name] = {'rps': delta(row['rps'], old['rps']), 'p95': delta(row['p95'], old['p95'])}
+    return rows
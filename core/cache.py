@@ -0,0 +1,90 @@
+# Кэш справочников (навыки, факультеты) поверх кэш-фреймворка Django.
+#
+# Для каждого справочника в кэше хранится ключ версии. Сигналы post_save/post_delete
+# меняют версию (после коммита транзакции), поэтому старые записи просто перестают
+# читаться и вытесняются сами. Версия общая для воркеров только при общем кэше.
+# Версия же служит ETag: клиент с актуальным If-None-Match получает 304 без запроса к БД.
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.response import Response
+
+REFERENCE_CACHE_TIMEOUT = getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 60 * 60)
+REFERENCE_CACHE_MAX_AGE = getattr(settings, 'REFERENCE_CACHE_MAX_AGE', 5 * 60)
+
+
+def _version_key(namespace):
+    return f'refdata:{namespace}:version'
+
+
+def get_version(namespace):
+    """Текущая версия справочника; при пустом кэше заводится новая."""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Случайное значение, а не счётчик: после очистки кэша версия не совпадёт
+        # ни с одним ETag, который уже есть у клиентов.
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """Инвалидирует все закэшированные ответы справочника после коммита текущей транзакции."""
+    # До коммита параллельный запрос прочитал бы старые данные и закэшировал их
+    # под новой версией (и с новым ETag) — до следующего изменения справочника
+    transaction.on_commit(lambda: cache.set(_version_key(namespace), uuid.uuid4().hex, timeout=None))
+
+
+class ReferenceDataCacheMixin:
+    """
+    Read-through кэш для list/retrieve справочного ViewSet'а.
+    Ответ кэшируется по версии справочника и полному пути запроса,
+    а ETag/If-None-Match позволяют клиенту не скачивать данные повторно.
+    """
+    cache_namespace = None
+    cache_public = True
+
+    def _etag(self, version):
+        return f'"{self.cache_namespace}-{version}"'
+
+    def _cache_key(self, version):
+        path = hashlib.md5(self.request.get_full_path().encode('utf-8')).hexdigest()
+        return f'refdata:{self.cache_namespace}:{version}:{path}'
+
+    def _cached_response(self, render):
+        version = get_version(self.cache_namespace)
+        etag = self._etag(version)
+
+        if_none_match = self.request.headers.get('If-None-Match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            key = self._cache_key(version)
+            data = cache.get(key)
+            if data is None:
+                response = render()
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cache.set(key, response.data, REFERENCE_CACHE_TIMEOUT)
+            else:
+                response = Response(data)
+
+        response['ETag'] = etag
+        if self.cache_public:
+            patch_cache_control(response, public=True, max_age=REFERENCE_CACHE_MAX_AGE)
+        else:
+            patch_cache_control(response, private=True, max_age=REFERENCE_CACHE_MAX_AGE)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(lambda: super(ReferenceDataCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(lambda: super(ReferenceDataCacheMixin, self).retrieve(request, *args, **kwargs))
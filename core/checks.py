@@ -0,0 +1,43 @@
+# Проверка конфигурации кэша при запуске нескольких воркеров.
+#
+# Часть состояния хранится в кэше и должна быть видна всем процессам сразу:
+# без общего кэша (LocMem у каждого воркера) изменения, сделанные в одном воркере,
+# не видны остальным. gunicorn.conf.py вызывает require_shared_cache в on_starting,
+# поэтому такой запуск завершается ошибкой, а не работает с устаревшими данными.
+# Модуль не импортирует DRF и модели: он выполняется в мастер-процессе до django.setup().
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias='default'):
+    return settings.CACHES[alias]['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+def shared_cache_features():
+    """Включённые механизмы, которым нужен общий для воркеров кэш."""
+    # Иначе каждый воркер отдаёт свой ETag и отвечает 304 на устаревшие данные
+    features = ['версии справочников и их ETag (core/cache.py)']
+    if getattr(settings, 'AUTH_CLAIMS_SHORTCUTS', True):
+        features.append('версии claims в JWT (core/authentication.py; отключается AUTH_CLAIMS_SHORTCUTS=0)')
+    if getattr(settings, 'DATABASE_REPLICAS', []):
+        # Следующий GET после записи может прийти в другой воркер и уйти на отстающую реплику
+        features.append('чтение своих записей при работе с репликами (core/routers.py)')
+    return features
+
+
+def require_shared_cache(workers):
+    if workers <= 1 or is_shared_cache():
+        return
+    features = shared_cache_features()
+    if features:
+        raise ImproperlyConfigured(
+            f'Воркеров: {workers}, а кэш у каждого процесса свой '
+            f"({settings.CACHES['default']['BACKEND']}). Задайте DJANGO_CACHE_BACKEND и "
+            f'DJANGO_CACHE_LOCATION (например, Redis). Общий кэш нужен для: {"; ".join(features)}'
+        )
@@ -0,0 +1,44 @@
+# Метрики соединений с базой данных.
+#
+# Пул psycopg (DB_POOL=1, см. settings.py) общий для всех потоков процесса,
+# поэтому метрики относятся к текущему воркеру gunicorn. Заполненность
+# (saturation) — доля соединений, занятых запросами, от максимального размера
+# пула; requests_waiting > 0 означает, что запросы уже ждут соединение.
+
+import os
+
+from django.db import connections
+
+
+def pool_stats(alias):
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return {
+            'alias': alias,
+            'vendor': connection.vendor,
+            'pooled': False,
+            'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+            'health_checks': settings_dict.get('CONN_HEALTH_CHECKS'),
+        }
+
+    stats = pool.get_stats()
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    pool_max = stats.get('pool_max') or pool.max_size
+    return {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'pooled': True,
+        'in_use': in_use,
+        'saturation': round(in_use / pool_max, 3) if pool_max else None,
+        'timeout': pool.timeout,
+        **stats,
+    }
+
+
+def all_pool_stats():
+    return {
+        'pid': os.getpid(),
+        'databases': [pool_stats(alias) for alias in connections],
+    }
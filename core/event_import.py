@@ -0,0 +1,172 @@
+# Массовый импорт мероприятий организатора (POST /api/events/import/, manage.py import_events).
+#
+# Строки проверяются сериализатором без обращений к базе, навыки и факультеты
+# сопоставляются по названию без учёта регистра — по одному запросу на справочник.
+# Недостающие навыки создаются, неизвестный факультет — ошибка строки.
+# Мероприятия и строки связующих таблиц вставляются bulk_create в одной транзакции;
+# строки с ошибками пропускаются, остальные импортируются.
+#
+# bulk_create не шлёт сигналов, поэтому индекс навыков (EventSkillIndex),
+# search_vector и версия кэша справочника навыков обновляются здесь же;
+# рассылка уведомлений об опубликованных мероприятиях ставится после коммита.
+
+import csv
+import io
+import json
+
+from django.db import transaction
+
+from .cache import bump_version
+from .models import Event, EventSkillIndex, Faculty, Skill
+from .notifications import schedule_publication_notifications
+from .search import update_search_vectors
+from .serializers import EventImportRowSerializer
+
+MAX_ROWS = 1000
+# Разделитель списков навыков и факультетов в ячейке CSV
+LIST_SEPARATOR = ';'
+
+
+def _split(value):
+    return [part.strip() for part in (value or '').split(LIST_SEPARATOR) if part.strip()]
+
+
+def parse_csv(text):
+    """Строки CSV с заголовком: title, description, date, location, status, faculty_restriction, skills, faculties."""
+    rows = []
+    reader = csv.DictReader(io.StringIO(text.lstrip('\ufeff')))
+    try:
+        for row in reader:
+            row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+            for key in ('skills', 'faculties'):
+                if key in row:
+                    row[key] = _split(row[key])
+            for key in ('status', 'faculty_restriction'):
+                if key in row and not row[key]:
+                    del row[key]
+            rows.append(row)
+    except csv.Error as exc:
+        # Номер строки данных, как в results импорта (заголовок не считается)
+        raise ValueError(f'Некорректный CSV, строка {len(rows) + 1}: {exc}')
+    return rows
+
+
+def parse_json(text):
+    """Список объектов мероприятий или {"events": [...]}."""
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get('events')
+    if not isinstance(data, list):
+        raise ValueError('Ожидается список мероприятий или объект с ключом events')
+    return data
+
+
+def parse_file(name, content):
+    """Разбор загруженного файла по расширению (.csv или .json)."""
+    text = content.decode('utf-8-sig') if isinstance(content, bytes) else content
+    if name.lower().endswith('.json'):
+        return parse_json(text)
+    if name.lower().endswith('.csv'):
+        return parse_csv(text)
+    raise ValueError('Поддерживаются файлы .csv и .json')
+
+
+def _key(name):
+    return name.casefold()
+
+
+def _skill_ids():
+    return {_key(name): pk for pk, name in Skill.objects.order_by().values_list('pk', 'name')}
+
+
+def _resolve_skills(names):
+    """({название без учёта регистра: id}, [созданные навыки]); недостающие навыки создаются."""
+    if not names:
+        return {}, []
+    # Справочник небольшой: одним запросом целиком, сравнение без учёта регистра — в Python
+    # (LOWER в SQLite не работает с кириллицей)
+    skills = _skill_ids()
+    missing = {}
+    for name in names:
+        if _key(name) not in skills:
+            missing.setdefault(_key(name), name)
+    missing = list(missing.values())
+    if missing:
+        # ignore_conflicts: навык мог появиться параллельно, в том числе в другом регистре,
+        # поэтому после вставки справочник перечитывается целиком, а не по name__in
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        skills = _skill_ids()
+        bump_version('skills')
+    return skills, missing
+
+
+def _resolve_faculties(names):
+    """{название или короткое название без учёта регистра: id}."""
+    if not names:
+        return {}
+    faculties = {}
+    for pk, name, short_name in Faculty.objects.order_by().values_list('pk', 'name', 'short_name'):
+        faculties.setdefault(_key(short_name), pk)
+        faculties[_key(name)] = pk
+    return faculties
+
+
+def import_events(organizer, rows):
+    """
+    Создаёт мероприятия organizer из списка словарей. Возвращает
+    {'created': n, 'created_skills': [...], 'results': [{'row', 'id'} или {'row', 'errors'}]}.
+    """
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f'Не больше {MAX_ROWS} мероприятий за один импорт')
+
+    results, valid = [], []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            results.append({'row': number, 'errors': {'non_field_errors': ['Ожидается объект мероприятия']}})
+            continue
+        serializer = EventImportRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            results.append({'row': number, 'errors': serializer.errors})
+
+    faculties = _resolve_faculties({name for _, data in valid for name in data.get('faculties', [])})
+    accepted = []
+    for number, data in valid:
+        unknown = [name for name in data.get('faculties', []) if _key(name) not in faculties]
+        if unknown:
+            results.append({'row': number, 'errors': {'faculties': [f'Неизвестные факультеты: {", ".join(unknown)}']}})
+        else:
+            accepted.append((number, data))
+
+    with transaction.atomic():
+        skills, created_skills = _resolve_skills({name for _, data in accepted for name in data.get('skills', [])})
+        events = Event.objects.bulk_create([
+            Event(
+                organizer_id=organizer.pk,
+                **{key: value for key, value in data.items() if key not in ('skills', 'faculties')},
+            )
+            for _, data in accepted
+        ])
+
+        skill_links, faculty_links, index_rows = [], [], []
+        for event, (_, data) in zip(events, accepted):
+            skill_ids = {skills[_key(name)] for name in data.get('skills', [])}
+            faculty_ids = {faculties[_key(name)] for name in data.get('faculties', [])}
+            skill_links += [Event.required_skills.through(event_id=event.pk, skill_id=pk) for pk in skill_ids]
+            faculty_links += [Event.faculties.through(event_id=event.pk, faculty_id=pk) for pk in faculty_ids]
+            index_rows += [
+                EventSkillIndex(skill_id=pk, event_id=event.pk, event_status=event.status, event_date=event.date)
+                for pk in skill_ids
+            ]
+        Event.required_skills.through.objects.bulk_create(skill_links)
+        Event.faculties.through.objects.bulk_create(faculty_links)
+        EventSkillIndex.objects.bulk_create(index_rows)
+        if events:
+            update_search_vectors(Event.objects.filter(pk__in=[event.pk for event in events]))
+        for event in events:
+            schedule_publication_notifications(event)
+
+    results += [{'row': number, 'id': event.pk} for event, (number, _) in zip(events, accepted)]
+    results.sort(key=lambda result: result['row'])
+    return {'created': len(events), 'created_skills': sorted(created_skills), 'results': results}
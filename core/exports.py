@@ -0,0 +1,361 @@
+# Потоковая выгрузка заявителей мероприятия (CSV, XLSX, DOCX).
+#
+# Строки читаются одним запросом values().iterator(chunk_size=...) по заявкам
+# с пользователем, профилем и факультетом; навыки в PostgreSQL собираются
+# подзапросом STRING_AGG, на других СУБД — одним запросом на порцию строк.
+# Файл отдаётся порциями байтов, поэтому память не зависит от числа заявителей.
+#
+# XLSX и DOCX — zip-архивы. Архив пишется в поток (zipfile поддерживает
+# запись без seek), листы XLSX — с inline-строками, без общей таблицы строк.
+# Для DOCX каркас документа (стили, заголовок, шапка таблицы) строит python-docx,
+# а строки таблицы вставляются в word/document.xml по мере чтения из базы.
+
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import OuterRef, Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Application, TalentProfile
+from .search import is_postgres
+
+CHUNK_SIZE = 2000
+# Сколько строк собирается в одну порцию ответа
+ROWS_PER_CHUNK = 500
+
+FIELDS = (
+    'id', 'status', 'created_at', 'message', 'organizer_comment',
+    'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    'user__talent_profile__id', 'user__talent_profile__faculty__name',
+    'user__talent_profile__education_level', 'user__talent_profile__course',
+)
+
+COLUMNS = (
+    ('id', 'ID заявки'),
+    ('status', 'Статус'),
+    ('created_at', 'Дата подачи'),
+    ('user__username', 'Пользователь'),
+    ('user__email', 'Email'),
+    ('user__first_name', 'Имя'),
+    ('user__last_name', 'Фамилия'),
+    ('user__talent_profile__faculty__name', 'Факультет'),
+    ('user__talent_profile__education_level', 'Уровень образования'),
+    ('user__talent_profile__course', 'Курс'),
+    ('skills', 'Навыки'),
+    ('message', 'Сообщение'),
+    ('organizer_comment', 'Комментарий организатора'),
+)
+
+STATUSES = dict(Application.STATUS_CHOICES)
+EDUCATION_LEVELS = dict(TalentProfile.EDUCATION_LEVELS)
+SKILLS_SEPARATOR = ', '
+
+# Символы, недопустимые в XML 1.0
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _skills_subquery():
+    through = TalentProfile.skills.through
+    return Subquery(
+        through.objects
+        .filter(talentprofile_id=OuterRef('user__talent_profile__id'))
+        .values('talentprofile_id')
+        .annotate(names=StringAgg('skill__name', SKILLS_SEPARATOR, order_by='skill__name'))
+        .values('names')
+    )
+
+
+def _with_skills(rows, using):
+    """Навыки для порции строк — одним запросом по ID профилей порции."""
+    through = TalentProfile.skills.through
+    for batch in _batches(rows, CHUNK_SIZE):
+        profile_ids = {row['user__talent_profile__id'] for row in batch} - {None}
+        skills = {}
+        for profile_id, name in (
+            through.objects.using(using)
+            .filter(talentprofile_id__in=profile_ids)
+            .order_by('skill__name')
+            .values_list('talentprofile_id', 'skill__name')
+        ):
+            skills.setdefault(profile_id, []).append(name)
+        for row in batch:
+            row['skills'] = SKILLS_SEPARATOR.join(skills.get(row['user__talent_profile__id'], ()))
+            yield row
+
+
+def applicant_rows(event_id, using=None, chunk_size=CHUNK_SIZE):
+    """Заявки мероприятия словарями с ключами COLUMNS, по возрастанию ID."""
+    queryset = Application.objects.using(using).filter(event_id=event_id).order_by('id')
+    using = queryset.db
+    if is_postgres(using):
+        rows = queryset.annotate(skills=_skills_subquery()).values(*FIELDS, 'skills').iterator(chunk_size)
+    else:
+        rows = _with_skills(queryset.values(*FIELDS).iterator(chunk_size), using)
+    for row in rows:
+        yield _display(row)
+
+
+def _display(row):
+    created_at = row['created_at']
+    if isinstance(created_at, datetime):
+        created_at = timezone.localtime(created_at) if timezone.is_aware(created_at) else created_at
+        row['created_at'] = created_at.strftime('%Y-%m-%d %H:%M')
+    row['status'] = STATUSES.get(row['status'], row['status'])
+    level = row['user__talent_profile__education_level']
+    row['user__talent_profile__education_level'] = EDUCATION_LEVELS.get(level, level)
+    row['skills'] = row['skills'] or ''
+    return row
+
+
+def _values(row):
+    return ['' if row[key] is None else row[key] for key, _ in COLUMNS]
+
+
+def _headers():
+    return [title for _, title in COLUMNS]
+
+
+def _xml_text(value):
+    return escape(_XML_INVALID.sub('', str(value)))
+
+
+# CSV
+
+# Ячейки, которые Excel и LibreOffice выполняют как формулу (=HYPERLINK(...), +cmd|...)
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(rows, event=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM — чтобы Excel открыл UTF-8 с кириллицей
+    buffer.write('\ufeff')
+    writer.writerow(_headers())
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        writer.writerows([_csv_cell(value) for value in _values(row)] for row in batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+# Запись zip-архива в поток
+
+class _ZipSink(io.RawIOBase):
+    """Принимает записи zipfile и отдаёт накопленное через drain(); seek не поддерживается."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _zip_chunks(static_parts, streamed_name, streamed_chunks):
+    """
+    Архив из static_parts (пары имя, байты) и одного файла streamed_name, содержимое
+    которого поступает порциями из streamed_chunks.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in static_parts:
+            archive.writestr(name, data)
+        with archive.open(streamed_name, 'w', force_zip64=True) as file:
+            for chunk in streamed_chunks:
+                file.write(chunk)
+                if data := sink.drain():
+                    yield data
+    yield sink.drain()
+
+
+# XLSX
+
+XLSX_PARTS = (
+    ('[Content_Types].xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+     '<Default Extension="xml" ContentType="application/xml"/>'
+     '<Override PartName="/xl/workbook.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+     '<Override PartName="/xl/worksheets/sheet1.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+     '<Override PartName="/xl/styles.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+     '</Types>'),
+    ('_rels/.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+     'Target="xl/workbook.xml"/>'
+     '</Relationships>'),
+    ('xl/workbook.xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+     'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+     '<sheets><sheet name="Заявители" sheetId="1" r:id="rId1"/></sheets>'
+     '</workbook>'),
+    ('xl/_rels/workbook.xml.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+     'Target="worksheets/sheet1.xml"/>'
+     '<Relationship Id="rId2" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+     'Target="styles.xml"/>'
+     '</Relationships>'),
+    # Стиль 1 — полужирный шрифт для шапки
+    ('xl/styles.xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+     '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+     '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+     '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+     '<fill><patternFill patternType="gray125"/></fill></fills>'
+     '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+     '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+     '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+     '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+     '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+     '</styleSheet>'),
+)
+
+
+def _xlsx_cell(value, style=''):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f'<c{style}><v>{value}</v></c>'
+    return f'<c t="inlineStr"{style}><is><t xml:space="preserve">{_xml_text(value)}</t></is></c>'
+
+
+def _xlsx_row(values, style=''):
+    return '<row>' + ''.join(_xlsx_cell(value, style) for value in values) + '</row>'
+
+
+def _sheet_chunks(rows):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+        'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+        '<sheetData>' + _xlsx_row(_headers(), ' s="1"')
+    ).encode('utf-8')
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        yield ''.join(_xlsx_row(_values(row)) for row in batch).encode('utf-8')
+    yield b'</sheetData></worksheet>'
+
+
+def xlsx_chunks(rows, event=None):
+    parts = [(name, data.encode('utf-8')) for name, data in XLSX_PARTS]
+    return _zip_chunks(parts, 'xl/worksheets/sheet1.xml', _sheet_chunks(rows))
+
+
+# DOCX
+
+DOCX_DOCUMENT = 'word/document.xml'
+
+
+def _docx_template(event):
+    """Части пустого отчёта и word/document.xml, разрезанный в конце таблицы."""
+    from docx import Document
+
+    document = Document()
+    document.add_heading(f'Заявители: {event.title}', level=1)
+    if event.date:
+        document.add_paragraph(f'Дата проведения: {event.date:%d.%m.%Y}')
+    table = document.add_table(rows=1, cols=len(COLUMNS))
+    table.style = 'Table Grid'
+    for cell, title in zip(table.rows[0].cells, _headers()):
+        cell.paragraphs[0].add_run(title).bold = True
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    with zipfile.ZipFile(buffer) as archive:
+        parts = [(info.filename, archive.read(info)) for info in archive.infolist()
+                 if info.filename != DOCX_DOCUMENT]
+        body = archive.read(DOCX_DOCUMENT)
+    split = body.rindex(b'</w:tbl>')
+    return parts, body[:split], body[split:]
+
+
+def _docx_row(values):
+    cells = ''.join(
+        f'<w:tc><w:p><w:r><w:t xml:space="preserve">{_xml_text(value)}</w:t></w:r></w:p></w:tc>'
+        for value in values
+    )
+    return f'<w:tr>{cells}</w:tr>'
+
+
+def _document_chunks(head, tail, rows):
+    yield head
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        yield ''.join(_docx_row(_values(row)) for row in batch).encode('utf-8')
+    yield tail
+
+
+def docx_chunks(rows, event):
+    parts, head, tail = _docx_template(event)
+    return _zip_chunks(parts, DOCX_DOCUMENT, _document_chunks(head, tail, rows))
+
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', csv_chunks),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', xlsx_chunks),
+    'docx': ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', docx_chunks),
+}
+
+
+async def _async_chunks(chunks):
+    # Под ASGI синхронный итератор StreamingHttpResponse целиком собирается в память,
+    # поэтому порции читаются по одной в потоке (соединение с базой остаётся в нём же)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def export_response(request, event, file_type, using=None):
+    """StreamingHttpResponse с заявителями мероприятия в формате file_type (ключ FORMATS)."""
+    content_type, writer = FORMATS[file_type]
+    chunks = iter(writer(applicant_rows(event.pk, using=using), event))
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = _async_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="applicants-event-{event.pk}.{file_type}"'
+    # nginx не буферизует ответ целиком
+    response['X-Accel-Buffering'] = 'no'
+    return response
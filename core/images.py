@@ -0,0 +1,182 @@
+# Обработка загруженных изображений (аватары, обложки мероприятий).
+#
+# Для каждого оригинала генерируются варианты thumb/card/full в WebP и JPEG
+# без EXIF (ориентация из EXIF применяется к пикселям). Имена вариантов
+# выводятся из имени оригинала: media/variants/<путь оригинала>__<вариант>.<формат>.
+# По имени варианта однозначно восстанавливается оригинал (см. original_name).
+#
+# До завершения фоновой обработки вариантов нет, поэтому process_image отмечает
+# готовность в модели (<поле>_variants_ready, сбрасывается сигналом при замене
+# файла), а сериализаторы строят URL по флагу без обращений к хранилищу.
+#
+# Оригинал тоже отдаётся клиентам, поэтому EXIF (в том числе GPS) удаляется из
+# него ещё при загрузке (strip_metadata).
+
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import ExifTags, Image, ImageOps, ImageSequence
+
+from .background import submit_on_commit
+from .models import Event, OrganizerProfile, TalentProfile
+
+VARIANTS_DIR = 'variants'
+
+# Максимальные размеры (ширина, высота); пропорции сохраняются
+VARIANTS = {
+    'thumb': (160, 160),
+    'card': (640, 640),
+    'full': (1600, 1600),
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+# Значение EXIF Orientation -> поворот, приводящий пиксели к нормальной ориентации
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Поля с изображениями, для которых создаются варианты
+IMAGE_FIELDS = (
+    (TalentProfile, 'avatar'),
+    (OrganizerProfile, 'avatar'),
+    (Event, 'image'),
+)
+
+
+def variant_name(name, variant, fmt):
+    return posixpath.join(VARIANTS_DIR, f'{name}__{variant}.{EXTENSIONS[fmt]}')
+
+
+def original_name(name):
+    """Имя оригинала для файла варианта или None, если name — не вариант."""
+    prefix = VARIANTS_DIR + '/'
+    if not name.startswith(prefix):
+        return None
+    base, sep, suffix = name[len(prefix):].rpartition('__')
+    if not sep or posixpath.splitext(suffix)[0] not in VARIANTS:
+        return None
+    return base
+
+
+def variant_names(name):
+    return [variant_name(name, variant, fmt) for variant in VARIANTS for fmt in FORMATS]
+
+
+def image_field(model):
+    return dict(IMAGE_FIELDS)[model]
+
+
+def ready_field(field):
+    return f'{field}_variants_ready'
+
+
+def variant_urls(field_file, request=None):
+    """Словарь {вариант: {формат: url}} для ImageField или None, если варианты ещё не созданы."""
+    if not field_file or not getattr(field_file.instance, ready_field(field_file.field.name), False):
+        return None
+    urls = {}
+    for variant in VARIANTS:
+        urls[variant] = {}
+        for fmt in FORMATS:
+            url = default_storage.url(variant_name(field_file.name, variant, fmt))
+            urls[variant][fmt] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def mark_variants_ready(name):
+    """Отмечает готовность вариантов у всех записей, которые ссылаются на файл name."""
+    for model, field in IMAGE_FIELDS:
+        model.objects.filter(**{field: name}).update(**{ready_field(field): True})
+
+
+def strip_metadata(upload):
+    """Загруженный файл без EXIF; файлы без метаданных возвращаются как есть."""
+    upload.seek(0)
+    image = Image.open(upload)
+    if not image.getexif() and 'exif' not in image.info:
+        upload.seek(0)
+        return upload
+    # MPO (снимки камер телефонов) — JPEG с дополнительными кадрами-превью: сохраняется основной кадр
+    pil_format = 'JPEG' if image.format == 'MPO' else image.format
+    options = {'icc_profile': image.info['icc_profile']} if 'icc_profile' in image.info else {}
+    if pil_format == 'JPEG':
+        options['quality'] = 95
+    method = _ORIENTATION_TRANSPOSE.get(image.getexif().get(ExifTags.Base.Orientation))
+    if pil_format != 'JPEG' and getattr(image, 'n_frames', 1) > 1:
+        frames = [frame.copy() for frame in ImageSequence.Iterator(image)]
+        options.update(
+            save_all=True, loop=image.info.get('loop', 0),
+            duration=[frame.info.get('duration', 0) for frame in frames],
+        )
+    else:
+        frames = [image.copy()]
+    # Ориентация из EXIF применяется к пикселям всех кадров, иначе без тега снимок окажется повёрнут
+    if method is not None:
+        frames = [frame.transpose(method) for frame in frames]
+    if len(frames) > 1:
+        options['append_images'] = frames[1:]
+    buffer = BytesIO()
+    frames[0].save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue(), name=upload.name)
+
+
+def _encode(image, fmt):
+    pil_format, options = FORMATS[fmt]
+    if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    # exif не передаётся — метаданные в вариантах не сохраняются
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def process_image(name, force=False):
+    """Генерирует варианты для файла name из MEDIA_ROOT. Возвращает число записанных файлов."""
+    targets = variant_names(name)
+    if not force and all(default_storage.exists(target) for target in targets):
+        mark_variants_ready(name)
+        return 0
+
+    with default_storage.open(name, 'rb') as source:
+        original = Image.open(source)
+        original = ImageOps.exif_transpose(original)
+        if original.mode == 'P':
+            original = original.convert('RGBA')
+        original.load()
+
+    written = 0
+    for variant, size in VARIANTS.items():
+        image = original.copy()
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        for fmt in FORMATS:
+            target = variant_name(name, variant, fmt)
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            default_storage.save(target, ContentFile(_encode(image, fmt)))
+            written += 1
+    mark_variants_ready(name)
+    return written
+
+
+def schedule_image_processing(field_file):
+    """Ставит генерацию вариантов в фоновый пул после коммита транзакции."""
+    if field_file:
+        submit_on_commit(process_image, field_file.name)
@@ -0,0 +1,126 @@
+# Логирование проекта: JSON-строки в stdout через неблокирующую очередь.
+#
+# Логгеры приложения — иерархия core.* (logging.getLogger(__name__) в модулях core).
+# QueueJsonHandler только кладёт запись в очередь; форматирование и запись в поток
+# выполняет отдельный поток QueueListener, поэтому запрос не ждёт stdout. При
+# переполнении очереди записи отбрасываются (счётчик dropped), а не блокируют воркер.
+#
+# Каждая запись получает request_id текущего запроса (request_id_middleware) —
+# по нему связываются все строки одного запроса, включая фоновые задачи.
+# SamplingFilter пропускает только долю DEBUG/INFO-записей выбранных логгеров
+# (LOG_SAMPLE_RATES в settings.py); WARNING и выше не сэмплируются.
+
+import atexit
+import json
+import logging
+import random
+import sys
+from collections.abc import Mapping
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+
+request_id_var = ContextVar('request_id', default=None)
+
+# Атрибуты LogRecord, которые не попадают в JSON как extra-поля
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+
+def get_request_id():
+    return request_id_var.get()
+
+
+def field_names(data):
+    """Имена полей запроса для лога — без значений (пароли, файлы, персональные данные)."""
+    return sorted(data) if isinstance(data, Mapping) else None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            payload['request_id'] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    rates: {'core.views': 0.1} — доля пропускаемых записей уровня ниже WARNING.
+    Применяется самое длинное совпадающее имя логгера; без совпадения пропускается всё.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rate_for(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class QueueJsonHandler(QueueHandler):
+    """QueueHandler со встроенным QueueListener, который пишет JSON в stream."""
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(Queue(queue_size))
+        self.dropped = 0
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.target.setFormatter(JsonFormatter())
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        atexit.register(self._stop_listener)
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def prepare(self, record):
+        # Выполняется в потоке запроса: фиксируем request_id и готовый текст,
+        # исключение сериализуем сразу (traceback не переживёт очередь)
+        record = logging.makeLogRecord(record.__dict__)
+        record.request_id = request_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.target.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def flush(self):
+        # Дожидается записи всего, что уже в очереди (используется в тестах и при остановке)
+        if self.listener._thread is not None:
+            self.listener.stop()
+            self.listener.start()
+        self.target.flush()
+
+    def close(self):
+        self._stop_listener()
+        super().close()
@@ -0,0 +1,65 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import MIXES, SCENARIOS, compare, parse_mix, run
+
+COLUMNS = ('requests', 'errors', 'client_errors', 'rps', 'p50', 'p90', 'p95', 'p99', 'max')
+
+
+class Command(BaseCommand):
+    help = ('Бенчмарк API внутри процесса: смесь запросов чтения/записи через весь стек Django, '
+            'пропускная способность и перцентили задержки по сценариям. '
+            f'Смеси: {", ".join(MIXES)}; сценарии: {", ".join(SCENARIOS)}')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mix', default='read',
+                            help='Готовая смесь (read, mixed, write) или веса: events=5,apply=1')
+        parser.add_argument('--requests', type=int, default=1000, help='Всего запросов')
+        parser.add_argument('--concurrency', type=int, default=4, help='Параллельных потоков')
+        parser.add_argument('--users', type=int, default=50, help='Сколько талантов и организаторов задействовать')
+        parser.add_argument('--seed', type=int, help='Зерно генератора для повторяемой последовательности запросов')
+        parser.add_argument('--output', help='Сохранить сводку в JSON-файл (для последующего --baseline)')
+        parser.add_argument('--baseline', help='JSON-файл прошлого запуска: вывести изменение rps и p95')
+        parser.add_argument('--json', action='store_true', help='Вывести сводку в формате JSON')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+
+        try:
+            summary = run(mix, requests=max(options['requests'], 1), concurrency=options['concurrency'],
+                          users=options['users'], random_seed=options['seed'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        summary['mix'] = mix
+        if baseline:
+            summary['change_percent'] = compare(summary, baseline)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(summary, file, ensure_ascii=False, indent=2)
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, ensure_ascii=False))
+            return
+
+        table = [['Сценарий', *COLUMNS]]
+        for name, row in [*summary['scenarios'].items(), ('total', summary['total'])]:
+            table.append([name, *(str(row[key]) for key in COLUMNS)])
+        widths = [max(len(line[i]) for line in table) for i in range(len(table[0]))]
+        for line in table:
+            self.stdout.write('  '.join(value.ljust(width) for value, width in zip(line, widths)).rstrip())
+        self.stdout.write(
+            f"{summary['total']['requests']} запросов за {summary['elapsed_seconds']} с "
+            f"в {summary['concurrency']} потоков"
+        )
+        for name, change in summary.get('change_percent', {}).items():
+            self.stdout.write(f"{name}: rps {change['rps']:+}%, p95 {change['p95']:+}%"
+                              if None not in change.values() else f'{name}: нет данных для сравнения')
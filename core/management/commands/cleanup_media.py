@@ -1,63 +1,166 @@
+import json
 import os
-from django.core.management.base import BaseCommand
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.apps import apps
 from django.conf import settings
-from django.db.models import F
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from core.images import original_name
+
+
+def file_fields():
+    """Все FileField/ImageField всех моделей проекта: [(model, field_name), ...]."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+def walk_media(root):
+    """Обходит дерево os.scandir без построения полного списка файлов."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError:
+            continue
 
-from core.models import Event, TalentProfile # Импортируйте ваши модели
 
 class Command(BaseCommand):
-    help = 'Очищает неиспользуемые медиафайлы (изображения мероприятий и аватары талантов)'
+    help = 'Удаляет медиафайлы, на которые не ссылается ни одно файловое поле моделей'
 
-    def handle(self, *args, **options):
-        self.stdout.write(self.style.SUCCESS('Запуск очистки медиафайлов...'))
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Только показать, что будет удалено')
+        parser.add_argument('--min-age', type=int, default=3600,
+                            help='Не трогать файлы моложе указанного числа секунд (загрузки в процессе)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Сколько путей проверять в БД одним запросом')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Количество потоков для удаления файлов')
+        parser.add_argument('--json', action='store_true',
+                            help='Вывести итог в формате JSON')
 
+    def handle(self, *args, **options):
         media_root = settings.MEDIA_ROOT
         if not media_root:
-            self.stdout.write(self.style.ERROR('MEDIA_ROOT не определен в settings.py'))
+            self.stderr.write(self.style.ERROR('MEDIA_ROOT не определен в settings.py'))
             return
+        media_root = os.fspath(media_root)
+
+        self.options = options
+        self.fields = file_fields()
+        self.summary = {
+            'dry_run': options['dry_run'],
+            'scanned': 0,
+            'skipped_recent': 0,
+            'referenced': 0,
+            'deleted': 0,
+            'deleted_bytes': 0,
+            'errors': 0,
+        }
+        started = time.monotonic()
+        cutoff = time.time() - options['min_age']
 
-        # 1. Получаем список всех файлов в папке MEDIA_ROOT
-        all_media_files = set()
-        for root, _, files in os.walk(media_root):
-            for file in files:
-                # Формируем путь относительно MEDIA_ROOT
-                relative_path = os.path.relpath(os.path.join(root, file), media_root)
-                # Используем слеши '/' для стандартизации путей, как в URL
-                all_media_files.add(relative_path.replace(os.sep, '/'))
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS('Запуск очистки медиафайлов...'))
 
-        self.stdout.write(f'Найдено {len(all_media_files)} файлов в папке медиа.')
+        self.pending = {}
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as executor:
+            self.executor = executor
+            batch = []
+            for entry in walk_media(media_root):
+                if entry.name.startswith('.'):
+                    continue
+                self.summary['scanned'] += 1
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    self.summary['errors'] += 1
+                    continue
+                if stat.st_mtime > cutoff:
+                    self.summary['skipped_recent'] += 1
+                    continue
 
-        # 2. Получаем список медиафайлов, которые используются в моделях
-        used_media_files = set()
+                # Путь относительно MEDIA_ROOT со слешами '/', как в полях моделей
+                relative_path = os.path.relpath(entry.path, media_root).replace(os.sep, '/')
+                batch.append((relative_path, entry.path, stat.st_size))
+                if len(batch) >= options['batch_size']:
+                    self._process_batch(batch)
+                    batch = []
+            if batch:
+                self._process_batch(batch)
+            self._drain(wait(self.pending).done)
 
-        # Для изображений мероприятий
-        # Используем F() expression для получения чистого значения поля без преобразований
-        used_media_files.update(Event.objects.exclude(image='').exclude(image__isnull=True).values_list('image', flat=True))
+        self.summary['duration_seconds'] = round(time.monotonic() - started, 3)
 
-        # Для аватаров талантов
-        used_media_files.update(TalentProfile.objects.exclude(avatar='').exclude(avatar__isnull=True).values_list('avatar', flat=True))
+        if options['json']:
+            self.stdout.write(json.dumps(self.summary, ensure_ascii=False))
+            return
+        action = 'Будет удалено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(
+            f"Проверено файлов: {self.summary['scanned']}, используется: {self.summary['referenced']}, "
+            f"пропущено новых: {self.summary['skipped_recent']}, ошибок: {self.summary['errors']}."
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Очистка завершена. {action} {self.summary['deleted']} файлов "
+            f"({self.summary['deleted_bytes']} байт)."
+        ))
 
-        self.stdout.write(f'Найдено {len(used_media_files)} используемых медиафайлов в базе данных.')
+    def _referenced(self, names):
+        """Какие из имён встречаются хотя бы в одном файловом поле."""
+        found = set()
+        for model, field in self.fields:
+            remaining = names - found
+            if not remaining:
+                break
+            found.update(
+                model._default_manager.filter(**{f'{field}__in': remaining}).values_list(field, flat=True)
+            )
+        return found
 
-        # 3. Определяем неиспользуемые файлы
-        unused_media_files = all_media_files - used_media_files
+    def _process_batch(self, batch):
+        # Вариант изображения живёт, пока жив его оригинал
+        owners = {path: original_name(path) or path for path, _, _ in batch}
+        referenced = self._referenced(set(owners.values()))
 
-        self.stdout.write(f'Найдено {len(unused_media_files)} неиспользуемых медиафайлов.')
+        for relative_path, full_path, size in batch:
+            if owners[relative_path] in referenced:
+                self.summary['referenced'] += 1
+                continue
+            if self.options['verbosity'] >= 2 and not self.options['json']:
+                self.stdout.write(f'Не используется: {relative_path}')
+            if self.options['dry_run']:
+                self.summary['deleted'] += 1
+                self.summary['deleted_bytes'] += size
+                continue
+            self.pending[self.executor.submit(os.remove, full_path)] = (relative_path, size)
+            if len(self.pending) >= self.options['batch_size']:
+                done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+                self._drain(done)
 
-        # 4. Удаляем неиспользуемые файлы
-        deleted_count = 0
-        for relative_path in unused_media_files:
-            full_path = os.path.join(media_root, relative_path.replace('/', os.sep))
+    def _drain(self, done):
+        for future in done:
+            relative_path, size = self.pending.pop(future)
             try:
-                # Проверяем, что файл существует перед удалением
-                if os.path.exists(full_path) and os.path.isfile(full_path):
-                    os.remove(full_path)
-                    self.stdout.write(self.style.SUCCESS(f'Удален: {relative_path}'))
-                    deleted_count += 1
-                else:
-                    # Если файл не существует на диске, но числится как неиспользуемый (что странно), пропускаем
-                     self.stdout.write(self.style.WARNING(f'Файл не найден на диске (пропущен): {relative_path}'))
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'Ошибка при удалении файла {relative_path}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS(f'Очистка завершена. Удалено {deleted_count} файлов.'))
+                future.result()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.summary['errors'] += 1
+                if not self.options['json']:
+                    self.stderr.write(self.style.ERROR(f'Ошибка при удалении файла {relative_path}: {e}'))
+                continue
+            self.summary['deleted'] += 1
+            self.summary['deleted_bytes'] += size
@@ -0,0 +1,47 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.event_import import MAX_ROWS, import_events, parse_file
+
+
+class Command(BaseCommand):
+    help = ('Массовый импорт мероприятий организатора из CSV или JSON. Навыки и факультеты указываются '
+            'по названиям (в CSV — через «;»), недостающие навыки создаются. '
+            f'Файл обрабатывается пакетами по {MAX_ROWS} строк; строки с ошибками пропускаются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл .csv или .json')
+        parser.add_argument('--organizer', required=True, help='Имя пользователя организатора')
+        parser.add_argument('--json', action='store_true', help='Вывести результат в формате JSON')
+
+    def handle(self, *args, **options):
+        organizer = User.objects.filter(username=options['organizer'], organizerprofile__isnull=False).first()
+        if organizer is None:
+            raise CommandError(f"Организатор {options['organizer']!r} не найден")
+        try:
+            with open(options['path'], 'rb') as file:
+                rows = parse_file(options['path'], file.read())
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        summary = {'created': 0, 'created_skills': [], 'results': []}
+        for start in range(0, len(rows), MAX_ROWS):
+            result = import_events(organizer, rows[start:start + MAX_ROWS])
+            summary['created'] += result['created']
+            summary['created_skills'] += result['created_skills']
+            summary['results'] += [{**row, 'row': row['row'] + start} for row in result['results']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, ensure_ascii=False))
+            return
+
+        errors = [row for row in summary['results'] if 'errors' in row]
+        for row in errors:
+            self.stdout.write(self.style.WARNING(f"Строка {row['row']}: {json.dumps(row['errors'], ensure_ascii=False)}"))
+        if summary['created_skills']:
+            self.stdout.write(f"Созданы навыки: {', '.join(summary['created_skills'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Создано мероприятий: {summary['created']}, строк с ошибками: {len(errors)}"
+        ))
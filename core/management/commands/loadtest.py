@@ -0,0 +1,119 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import latency_summary
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест HTTP-эндпоинта запущенного сервера: пропускная способность и перцентили задержки. '
+            'Например, сравнение списка мероприятий с DB_POOL=0 и DB_POOL=1')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/events/',
+                            help='Адрес эндпоинта')
+        parser.add_argument('--requests', type=int, default=1000, help='Всего запросов')
+        parser.add_argument('--concurrency', type=int, default=20, help='Параллельных клиентов')
+        parser.add_argument('--username', help='Пользователь для получения JWT через /api/token/')
+        parser.add_argument('--password', help='Пароль пользователя')
+        parser.add_argument('--token', help='Готовый access-токен')
+        parser.add_argument('--timeout', type=float, default=30, help='Таймаут запроса, секунд')
+        parser.add_argument('--json', action='store_true', help='Вывести итог в формате JSON')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme not in ('http', 'https'):
+            raise CommandError('Поддерживаются только http:// и https:// адреса')
+        self.url = url
+        self.path = url.path + (f'?{url.query}' if url.query else '')
+        self.timeout = options['timeout']
+        self.local = threading.local()
+
+        self.headers = {'Accept': 'application/json'}
+        token = options['token'] or self._obtain_token(options['username'], options['password'])
+        if token:
+            self.headers['Authorization'] = f'Bearer {token}'
+
+        # Прогрев: первый запрос открывает соединения и заполняет кэши
+        status, _ = self._request('GET', self.path)
+        if status >= 400:
+            raise CommandError(f'Эндпоинт вернул {status}')
+
+        total = max(options['requests'], 1)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(options['concurrency'], 1)) as executor:
+            results = list(executor.map(lambda _: self._timed(), range(total)))
+        elapsed = time.perf_counter() - started
+
+        summary = self._summary(results, elapsed, options['concurrency'])
+        if options['json']:
+            self.stdout.write(json.dumps(summary, ensure_ascii=False))
+            return
+        self.stdout.write(
+            f"{summary['requests']} запросов за {summary['elapsed_seconds']} с, "
+            f"{summary['rps']} запросов/с, ошибок: {summary['errors']}"
+        )
+        self.stdout.write(
+            'Задержка, мс: ' + ', '.join(f'{key} {summary[key]}' for key in ('p50', 'p90', 'p95', 'p99', 'max'))
+        )
+
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection_class = (
+                http.client.HTTPSConnection if self.url.scheme == 'https' else http.client.HTTPConnection
+            )
+            connection = connection_class(self.url.hostname, self.url.port, timeout=self.timeout)
+            self.local.connection = connection
+        return connection
+
+    def _request(self, method, path, body=None, headers=None):
+        # Соединение keep-alive на поток; при разрыве — одна повторная попытка
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers={**self.headers, **(headers or {})})
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (ConnectionError, http.client.HTTPException):
+                connection.close()
+                self.local.connection = None
+                if attempt:
+                    raise
+
+    def _timed(self):
+        started = time.perf_counter()
+        try:
+            status, _ = self._request('GET', self.path)
+        except (OSError, http.client.HTTPException):
+            status = None
+        return status, (time.perf_counter() - started) * 1000
+
+    def _obtain_token(self, username, password):
+        if not username:
+            return None
+        status, body = self._request(
+            'POST', '/api/token/',
+            body=json.dumps({'username': username, 'password': password or ''}),
+            headers={'Content-Type': 'application/json'},
+        )
+        if status != 200:
+            raise CommandError(f'Не удалось получить токен: {status}')
+        return json.loads(body)['access']
+
+    def _summary(self, results, elapsed, concurrency):
+        errors = sum(1 for status, _ in results if status is None or status >= 400)
+        return {
+            'url': self.url.geturl(),
+            'requests': len(results),
+            'concurrency': concurrency,
+            'errors': errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'rps': round(len(results) / elapsed, 1) if elapsed else None,
+            **latency_summary(latency for _, latency in results),
+        }
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.notifications import notify_event_published, pending_events
+
+
+class Command(BaseCommand):
+    help = ('Повторяет рассылку уведомлений для опубликованных мероприятий, по которым она не завершилась '
+            '(например, воркер перезапустился с задачей в очереди)')
+
+    def handle(self, *args, **options):
+        events = list(pending_events().values_list('pk', flat=True))
+        for event_id in events:
+            created = notify_event_published(event_id)
+            self.stdout.write(f'Мероприятие {event_id}: новых уведомлений {created}')
+        self.stdout.write(self.style.SUCCESS(f'Готово. Мероприятий: {len(events)}.'))
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.perf import collect, reset_all, summarize
+
+COLUMNS = (
+    ('route', 'Маршрут'),
+    ('count', 'Запросов'),
+    ('avg_ms', 'Ср., мс'),
+    ('p95_ms', 'p95, мс'),
+    ('p99_ms', 'p99, мс'),
+    ('max_ms', 'Макс., мс'),
+    ('avg_queries', 'SQL'),
+    ('avg_serialize_queries', 'SQL в сериализации'),
+    ('avg_db_ms', 'БД, мс'),
+    ('avg_serialize_ms', 'Сериализация, мс'),
+    ('avg_render_ms', 'Рендеринг, мс'),
+    ('avg_bytes', 'Байт'),
+)
+
+
+class Command(BaseCommand):
+    help = ('Сводка метрик запросов по маршрутам: время, число SQL-запросов, сериализация, размер ответа. '
+            'Читает гистограммы, которые воркеры публикуют в кэш (PERF_PUBLISH_SECONDS)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', default='count', choices=[key for key, _ in COLUMNS],
+                            help='Поле для сортировки (по убыванию, маршрут — по алфавиту)')
+        parser.add_argument('--json', action='store_true', help='Вывести сводку в формате JSON')
+        parser.add_argument('--reset', action='store_true', help='Очистить накопленные гистограммы после вывода')
+
+    def handle(self, *args, **options):
+        rows = summarize(collect())
+        key = options['sort']
+        rows.sort(key=lambda row: row[key], reverse=key != 'route')
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, ensure_ascii=False, indent=2))
+        elif not rows:
+            self.stdout.write('Метрик пока нет.')
+        else:
+            table = [[title for _, title in COLUMNS]] + [[str(row[key]) for key, _ in COLUMNS] for row in rows]
+            widths = [max(len(line[i]) for line in table) for i in range(len(COLUMNS))]
+            for line in table:
+                self.stdout.write('  '.join(value.ljust(width) for value, width in zip(line, widths)).rstrip())
+
+        if options['reset']:
+            reset_all()
+            self.stdout.write(self.style.SUCCESS('Гистограммы очищены.'))
@@ -0,0 +1,53 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+
+from core.images import IMAGE_FIELDS, process_image
+
+
+def referenced_images():
+    """Имена всех изображений, на которые ссылаются модели (без повторов внутри поля)."""
+    for model, field in IMAGE_FIELDS:
+        names = (
+            model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            .order_by(field).values_list(field, flat=True).distinct()
+        )
+        yield from names.iterator(chunk_size=2000)
+
+
+class Command(BaseCommand):
+    help = 'Генерирует варианты изображений (thumb/card/full, WebP и JPEG) для уже загруженных файлов и отмечает их готовность'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Количество потоков обработки')
+        parser.add_argument('--force', action='store_true', help='Перегенерировать существующие варианты')
+
+    def handle(self, *args, **options):
+        self.processed = self.skipped = self.failed = 0
+        workers = options['workers']
+        # Держим в очереди ограниченное число задач, чтобы не копить все имена в памяти
+        max_pending = workers * 4
+        pending = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for name in referenced_images():
+                pending[executor.submit(process_image, name, options['force'])] = name
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, pending)
+            self._collect(wait(pending).done, pending)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово. Обработано: {self.processed}, пропущено: {self.skipped}, ошибок: {self.failed}.'
+        ))
+
+    def _collect(self, done, pending):
+        for future in done:
+            name = pending.pop(future)
+            try:
+                if future.result():
+                    self.processed += 1
+                else:
+                    self.skipped += 1
+            except Exception as e:
+                self.failed += 1
+                self.stdout.write(self.style.ERROR(f'Ошибка обработки {name}: {e}'))
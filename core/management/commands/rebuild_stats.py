@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.stats import BATCH_SIZE, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает таблицы статистики (факультеты, активность пользователей, навыки)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Размер пачки для чтения и вставки строк')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Пересчёт статистики...')
+        counts = rebuild_stats(batch_size=options['batch_size'])
+        for table, count in counts.items():
+            self.stdout.write(f'{table}: {count}')
+        self.stdout.write(self.style.SUCCESS('Статистика пересчитана.'))
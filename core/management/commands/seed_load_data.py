@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seeding import BATCH_SIZE, DEFAULT_PREFIX, LOAD_PASSWORD, can_copy, clear_seeded, seed
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу синтетическими данными для нагрузочных тестов: пользователи, профили, '
+            'мероприятия с навыками и факультетами, заявки. В PostgreSQL крупные таблицы пишутся через COPY')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--talents', type=int, default=1000, help='Число талантов')
+        parser.add_argument('--organizers', type=int, default=50, help='Число организаторов')
+        parser.add_argument('--events', type=int, default=2000, help='Число мероприятий')
+        parser.add_argument('--applications', type=int, default=20000, help='Всего заявок')
+        parser.add_argument('--skills', type=int, default=200, help='Навыков в справочнике')
+        parser.add_argument('--faculties', type=int, default=12, help='Факультетов в справочнике')
+        parser.add_argument('--skills-per-event', type=int, default=4, help='Навыков у мероприятия')
+        parser.add_argument('--skills-per-talent', type=int, default=5, help='Навыков у таланта')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Размер пачки bulk_create')
+        parser.add_argument('--prefix', default=DEFAULT_PREFIX, help='Префикс имён создаваемых пользователей')
+        parser.add_argument('--seed', type=int, default=0, help='Зерно генератора (одинаковые данные при повторе)')
+        parser.add_argument('--no-copy', action='store_true', help='Не использовать COPY даже в PostgreSQL')
+        parser.add_argument('--clear', action='store_true',
+                            help='Удалить ранее созданные данные с этим префиксом перед заполнением')
+        parser.add_argument('--clear-only', action='store_true', help='Только удалить данные с этим префиксом')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if not prefix:
+            raise CommandError('Префикс не может быть пустым')
+
+        if options['clear'] or options['clear_only']:
+            deleted = clear_seeded(prefix)
+            self.stdout.write(f'Удалено пользователей с префиксом {prefix!r}: {deleted}')
+            if options['clear_only']:
+                return
+
+        use_copy = not options['no_copy'] and can_copy()
+        self.stdout.write(f'Заполнение ({"COPY" if use_copy else "bulk_create"})...')
+        try:
+            counts = seed(
+                talents=options['talents'], organizers=options['organizers'], events=options['events'],
+                applications=options['applications'], skills=options['skills'], faculties=options['faculties'],
+                skills_per_event=options['skills_per_event'], skills_per_talent=options['skills_per_talent'],
+                prefix=prefix, batch_size=options['batch_size'], use_copy=use_copy, random_seed=options['seed'],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for table, count in counts.items():
+            self.stdout.write(f'{table}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово. Пароль всех пользователей {prefix}*: {LOAD_PASSWORD}'
+        ))
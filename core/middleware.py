@@ -0,0 +1,138 @@
+# Middleware проекта.
+
+import re
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.functional import SimpleLazyObject, empty
+
+from . import perf
+from .log import request_id_var
+from .routers import SAFE_METHODS, set_replica_reads, sticky_key
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def _request_id(request):
+    # ID от nginx/клиента принимается, только если он похож на идентификатор
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    return incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+
+
+@sync_and_async_middleware
+def request_id_middleware(get_response):
+    """Присваивает запросу request_id для логов (core/log.py) и возвращает его в X-Request-ID."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            request.id = _request_id(request)
+            token = request_id_var.set(request.id)
+            try:
+                response = await get_response(request)
+            finally:
+                request_id_var.reset(token)
+            response[REQUEST_ID_HEADER] = request.id
+            return response
+    else:
+        def middleware(request):
+            request.id = _request_id(request)
+            token = request_id_var.set(request.id)
+            try:
+                response = get_response(request)
+            finally:
+                request_id_var.reset(token)
+            response[REQUEST_ID_HEADER] = request.id
+            return response
+    return middleware
+
+
+def _written_by(request, response):
+    """Пользователь, успешно изменивший данные этим запросом, или None."""
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return None
+    # DRF переносит аутентифицированного пользователя в исходный HttpRequest;
+    # незагруженный пользователь сессии значит, что запрос анонимный
+    user = getattr(request, 'user', None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """Сбрасывает чтение с реплик после запроса и включает read-your-writes после записи."""
+    timeout = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            try:
+                response = await get_response(request)
+            finally:
+                set_replica_reads(False)
+            user = _written_by(request, response)
+            if user is not None and timeout > 0:
+                await cache.aset(sticky_key(user.pk), True, timeout)
+            return response
+    else:
+        def middleware(request):
+            try:
+                response = get_response(request)
+            finally:
+                # Поток WSGI-воркера обслуживает следующие запросы в том же контексте
+                set_replica_reads(False)
+            user = _written_by(request, response)
+            if user is not None and timeout > 0:
+                cache.set(sticky_key(user.pk), True, timeout)
+            return response
+    return middleware
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    return f"{request.method} {match.view_name if match else '<unmatched>'}"
+
+
+def _record_request(request, response, metrics, started):
+    total_ms = (time.perf_counter() - started) * 1000
+    if getattr(settings, 'PERF_SERVER_TIMING', False):
+        response['Server-Timing'] = perf.server_timing(metrics, total_ms)
+    if getattr(settings, 'PERF_QUERY_COUNT_HEADER', False):
+        response['X-Query-Count'] = str(metrics.queries)
+    size = None if response.streaming else len(response.content)
+    perf.registry.record(_route(request), total_ms, metrics, size)
+
+
+@sync_and_async_middleware
+def performance_middleware(get_response):
+    """Считает запросы к базе, время сериализации и рендеринга, размер ответа (core/perf.py)."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            metrics, token = perf.start_request()
+            started = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                perf.finish_request(token)
+            _record_request(request, response, metrics, started)
+            if perf.registry.due():
+                # Публикация обращается к кэшу синхронно — не в цикле событий
+                await sync_to_async(perf.registry.publish)()
+            return response
+    else:
+        def middleware(request):
+            metrics, token = perf.start_request()
+            started = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                perf.finish_request(token)
+            _record_request(request, response, metrics, started)
+            perf.registry.publish()
+            return response
+    return middleware
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_event_skill_index(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    EventSkillIndex = apps.get_model('core', 'EventSkillIndex')
+    through = Event.required_skills.through
+    rows = through.objects.values_list('skill_id', 'event_id', 'event__status', 'event__date')
+    EventSkillIndex.objects.bulk_create(
+        (
+            EventSkillIndex(skill_id=skill_id, event_id=event_id, event_status=status, event_date=event_date)
+            for skill_id, event_id, status, event_date in rows.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_alter_application_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSkillIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_status', models.CharField(choices=[('draft', 'Черновик'), ('published', 'Опубликовано'), ('closed', 'Закрыто'), ('cancelled', 'Отменено')], max_length=20)),
+                ('event_date', models.DateField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='core.event')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_index', to='core.skill')),
+            ],
+            options={
+                'verbose_name': 'Индекс навыков мероприятий',
+                'verbose_name_plural': 'Индекс навыков мероприятий',
+                'indexes': [models.Index(fields=['skill', 'event_status', 'event'], name='event_skill_idx_lookup')],
+                'constraints': [models.UniqueConstraint(fields=('skill', 'event'), name='unique_event_skill_index')],
+            },
+        ),
+        migrations.RunPython(build_event_skill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:18
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    # GIN-индекс существует только в PostgreSQL; на других СУБД меняется лишь состояние
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def fill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Копия core.search.event_search_vector на момент миграции: последующие правки
+    # поиска не должны менять то, что делает эта миграция
+    Event = apps.get_model('core', 'Event')
+    OrganizerProfile = apps.get_model('core', 'OrganizerProfile')
+    organization_name = Subquery(
+        OrganizerProfile.objects
+        .filter(user_id=OuterRef('organizer_id'))
+        .values('organization_name')[:1]
+    )
+    Event.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='russian')
+        + SearchVector('description', weight='B', config='russian')
+        + SearchVector(Coalesce(organization_name, Value('')), weight='C', config='russian')
+        + SearchVector('location', weight='C', config='russian')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddPostgresIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_idx'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:20
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+BATCH_SIZE = 2000
+
+
+def _bulk_create_batches(model, objs):
+    objs = iter(objs)
+    while batch := list(islice(objs, BATCH_SIZE)):
+        model.objects.bulk_create(batch)
+
+
+def fill_stats(apps, schema_editor):
+    # Копия core.stats.rebuild_stats на момент миграции (таблицы только что созданы и пусты):
+    # последующие правки счётчиков не должны менять то, что делает эта миграция
+    Application = apps.get_model('core', 'Application')
+    Faculty = apps.get_model('core', 'Faculty')
+    Event = apps.get_model('core', 'Event')
+    FacultyStats = apps.get_model('core', 'FacultyStats')
+    UserActivityStats = apps.get_model('core', 'UserActivityStats')
+    UserSkillStat = apps.get_model('core', 'UserSkillStat')
+
+    applications_by_faculty = dict(
+        Application.objects
+        .filter(user__talent_profile__faculty__isnull=False)
+        .values_list('user__talent_profile__faculty')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    _bulk_create_batches(FacultyStats, (
+        FacultyStats(
+            faculty_id=faculty_id,
+            users_count=users_count,
+            applications_count=applications_by_faculty.get(faculty_id, 0),
+        )
+        for faculty_id, users_count in Faculty.objects.annotate(
+            users=Count('talentprofile')
+        ).filter(users__gt=0).values_list('id', 'users').iterator(chunk_size=BATCH_SIZE)
+    ))
+
+    _bulk_create_batches(UserActivityStats, (
+        UserActivityStats(user_id=row['user_id'], total_applications=row['total'], approved_applications=row['approved'])
+        for row in Application.objects.values('user_id').annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status='approved')),
+        ).order_by().iterator(chunk_size=BATCH_SIZE)
+    ))
+
+    through = Event.required_skills.through
+    _bulk_create_batches(UserSkillStat, (
+        UserSkillStat(user_id=row['event__application__user_id'], skill_id=row['skill_id'], count=row['total'])
+        for row in through.objects.filter(event__application__isnull=False).values(
+            'event__application__user_id', 'skill_id'
+        ).annotate(total=Count('id')).order_by().iterator(chunk_size=BATCH_SIZE)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_event_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('users_count', models.PositiveIntegerField(default=0)),
+                ('applications_count', models.PositiveIntegerField(default=0)),
+                ('faculty', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='core.faculty')),
+            ],
+            options={
+                'verbose_name': 'Статистика факультета',
+                'verbose_name_plural': 'Статистика факультетов',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserActivityStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_applications', models.PositiveIntegerField(default=0)),
+                ('approved_applications', models.PositiveIntegerField(default=0)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='activity_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Статистика активности',
+                'verbose_name_plural': 'Статистика активности',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserSkillStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_stats', to='core.skill')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Статистика навыков пользователя',
+                'verbose_name_plural': 'Статистика навыков пользователей',
+                'constraints': [models.UniqueConstraint(fields=('user', 'skill'), name='unique_user_skill_stat')],
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_stats_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='talentprofile',
+            index=models.Index(fields=['education_level', 'course'], name='talent_level_course_idx'),
+        ),
+        # Связующая таблица TalentProfile.skills создаётся Django автоматически, и индексы
+        # для неё в модели не объявить. Уникальный индекс (talentprofile_id, skill_id)
+        # не помогает искать профили по навыку — нужен обратный порядок колонок.
+        migrations.RunSQL(
+            'CREATE INDEX talent_skills_skill_idx ON core_talentprofile_skills (skill_id, talentprofile_id)',
+            'DROP INDEX talent_skills_skill_idx',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_event_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_variants_ready',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='organizerprofile',
+            name='avatar_variants_ready',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='talentprofile',
+            name='avatar_variants_ready',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
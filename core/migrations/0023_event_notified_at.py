@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:09
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+def mark_existing_published(apps, schema_editor):
+    # Уже опубликованные мероприятия считаются разосланными, иначе первый запуск
+    # notify_published_events разошлёт уведомления обо всех старых мероприятиях
+    Event = apps.get_model('core', 'Event')
+    Event.objects.filter(status='published').update(notified_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_image_variants_ready'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_existing_published, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 
 
@@ -46,12 +50,18 @@ class TalentProfile(models.Model):
     education_level = models.CharField(max_length=20, choices=EDUCATION_LEVELS, blank=True, null=True, verbose_name="Уровень образования")
     course = models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="Курс")
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    # Варианты аватара созданы (core/images.py); сбрасывается при замене файла
+    avatar_variants_ready = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Профиль таланта"
         verbose_name_plural = "Профили талантов"
+        indexes = [
+            # Фильтры поиска талантов по уровню образования и курсу
+            models.Index(fields=['education_level', 'course'], name='talent_level_course_idx'),
+        ]
 
     def __str__(self):
         return f"Профиль {self.user.username}"
@@ -72,6 +82,7 @@ class OrganizerProfile(models.Model):
     website = models.URLField(blank=True)
     verified = models.BooleanField(default=False)  # Подтвержденный организатор или нет
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    avatar_variants_ready = models.BooleanField(default=False, editable=False)
 
     def __str__(self):
         return f"{self.organization_name} ({self.user.username})"
@@ -80,6 +91,40 @@ class OrganizerProfile(models.Model):
         verbose_name = "Профиль организатора"
         verbose_name_plural = "Профили организаторов"
 
+class EventQuerySet(models.QuerySet):
+    def with_list_plan(self, user=None):
+        """
+        План выборки для выдачи мероприятий списком: всё, что читает EventSerializer,
+        загружается фиксированным числом запросов независимо от размера страницы.
+        """
+        # Число заявок считается коррелированным подзапросом, а не JOIN + GROUP BY,
+        # чтобы не размножать строки при фильтрации по факультетам и навыкам.
+        applications = (
+            Application.objects
+            .filter(event=OuterRef('pk'))
+            .order_by()
+            .values('event')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        queryset = (
+            self
+            .select_related('organizer__organizerprofile')
+            .prefetch_related('required_skills', 'faculties')
+            .defer('search_vector')
+            .annotate(applications_count=Coalesce(Subquery(applications, output_field=IntegerField()), 0))
+        )
+        if user is not None and user.is_authenticated:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'application_set',
+                    queryset=Application.objects.filter(user_id=user.pk).only('id', 'event_id', 'status'),
+                    to_attr='user_applications',
+                )
+            )
+        return queryset
+
+
 # Event содержит информацию о мероприятии, включая требуемые навыки.
 class Event(models.Model):
     STATUS_CHOICES = [
@@ -95,12 +140,19 @@ class Event(models.Model):
     required_skills = models.ManyToManyField(Skill, related_name='events', verbose_name="Требуемые навыки")
     date = models.DateField()
     image = models.ImageField(upload_to='events/', null=True, blank=True)
+    image_variants_ready = models.BooleanField(default=False, editable=False)
     location = models.CharField(max_length=200)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     faculty_restriction = models.BooleanField(default=False, verbose_name="Ограничение по факультетам")
     faculties = models.ManyToManyField(Faculty, blank=True, related_name='events', verbose_name="Доступные факультеты")
+    # Полнотекстовый индекс (только PostgreSQL), обновляется сигналами — см. core/search.py
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Рассылка уведомлений о публикации завершена (core/notifications.py)
+    notified_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = EventQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -109,6 +161,35 @@ class Event(models.Model):
         verbose_name = "Мероприятие"
         verbose_name_plural = "Мероприятия"
         ordering = ['-date']
+        indexes = [
+            # Лента и фильтр ?status=... с сортировкой по дате
+            models.Index(fields=['status', '-date'], name='event_status_date_idx'),
+            # Мероприятия организатора (?organizer=me)
+            models.Index(fields=['organizer', '-date'], name='event_organizer_date_idx'),
+            # Частичный индекс только по опубликованным мероприятиям
+            models.Index(
+                fields=['-date', '-id'],
+                name='event_published_date_idx',
+                condition=models.Q(status='published'),
+            ),
+            GinIndex(fields=['search_vector'], name='event_search_vector_idx'),
+        ]
+
+class ApplicationQuerySet(models.QuerySet):
+    def with_applicant_plan(self):
+        """Подгружает заявителя, его профиль таланта, факультет и навыки пакетно."""
+        return (
+            self
+            .select_related('user__organizerprofile', 'user__talent_profile__faculty')
+            .prefetch_related('user__talent_profile__skills')
+        )
+
+    def with_event_plan(self, user=None):
+        """Подгружает мероприятия заявок один раз на каждое уникальное мероприятие."""
+        return self.prefetch_related(
+            Prefetch('event', queryset=Event.objects.with_list_plan(user))
+        )
+
 
 # Application связывает таланта и мероприятие для подачи заявки.
 class Application(models.Model):
@@ -125,9 +206,113 @@ class Application(models.Model):
     message = models.TextField(blank=True)  # Сообщение от таланта
     organizer_comment = models.TextField(blank=True)  # Комментарий организатора
 
+    objects = ApplicationQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.user.username} - {self.event.title}"
 
     class Meta:
         verbose_name = "Заявка"
-        verbose_name_plural = "Заявки"
\ No newline at end of file
+        verbose_name_plural = "Заявки"
+        constraints = [
+            # Одна заявка от пользователя на мероприятие; покрывает и поиск дубликатов
+            models.UniqueConstraint(fields=['user', 'event'], name='unique_application_user_event'),
+        ]
+        indexes = [
+            # Входящие организатора: заявки по мероприятиям, новые сверху
+            models.Index(fields=['event', '-created_at'], name='application_event_created_idx'),
+            # Заявки таланта, новые сверху
+            models.Index(fields=['user', '-created_at'], name='application_user_created_idx'),
+        ]
+
+# EventSkillIndex — денормализованный инвертированный индекс навык → мероприятие.
+# Хранит статус и дату мероприятия, чтобы подбор рекомендаций шёл по одному
+# индексу без перебора мероприятий. Синхронизируется сигналами (см. core/signals.py).
+class EventSkillIndex(models.Model):
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='event_index')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='skill_index')
+    event_status = models.CharField(max_length=20, choices=Event.STATUS_CHOICES)
+    event_date = models.DateField()
+
+    class Meta:
+        verbose_name = "Индекс навыков мероприятий"
+        verbose_name_plural = "Индекс навыков мероприятий"
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'event'], name='unique_event_skill_index'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'event_status', 'event'], name='event_skill_idx_lookup'),
+        ]
+
+    def __str__(self):
+        return f"{self.skill_id} → {self.event_id}"
+
+
+# Счётчики статистики. Поддерживаются сигналами (core/stats.py),
+# пересчитываются целиком командой rebuild_stats.
+class FacultyStats(models.Model):
+    faculty = models.OneToOneField(Faculty, on_delete=models.CASCADE, related_name='stats')
+    users_count = models.PositiveIntegerField(default=0)
+    applications_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Статистика факультета"
+        verbose_name_plural = "Статистика факультетов"
+
+    def __str__(self):
+        return f"{self.faculty_id}: {self.users_count} / {self.applications_count}"
+
+
+class UserActivityStats(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='activity_stats')
+    total_applications = models.PositiveIntegerField(default=0)
+    approved_applications = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Статистика активности"
+        verbose_name_plural = "Статистика активности"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.total_applications} / {self.approved_applications}"
+
+
+# Сколько раз навык встречался в мероприятиях, на которые пользователь подал заявку
+class UserSkillStat(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_stats')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='user_stats')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Статистика навыков пользователя"
+        verbose_name_plural = "Статистика навыков пользователей"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'skill'], name='unique_user_skill_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} / {self.skill_id}: {self.count}"
+
+
+# EventNotification — строка ленты уведомлений таланта о публикации подходящего
+# мероприятия. Заполняется фоновой рассылкой (см. core/notifications.py).
+class EventNotification(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_notifications')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='notifications')
+    match_count = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Уведомление о мероприятии"
+        verbose_name_plural = "Уведомления о мероприятиях"
+        constraints = [
+            # Повторная рассылка по тому же мероприятию не создаёт дублей
+            models.UniqueConstraint(fields=['user', 'event'], name='unique_event_notification'),
+        ]
+        indexes = [
+            # Лента пользователя, новые сверху
+            models.Index(fields=['user', '-id'], name='notification_user_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ← {self.event_id}"
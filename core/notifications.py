@@ -0,0 +1,94 @@
+# Уведомления талантов о публикации подходящих мероприятий (GET /api/notifications/).
+#
+# Когда мероприятие становится опубликованным, фоновая задача находит подходящих
+# талантов одним запросом: связующая таблица навыков профилей (индекс
+# (skill_id, talentprofile_id), миграция 0020) фильтруется подзапросом навыков
+# мероприятия, ограничение по факультетам — подзапросом факультетов, группировка по
+# пользователю даёт число совпавших навыков. Строки ленты пишутся bulk_create
+# пакетами по BATCH_SIZE; повторная рассылка не создаёт дублей.
+#
+# Рассылка ставится явно (представления мероприятий, импорт), а не сигналом post_save:
+# он срабатывает до того, как сериализатор сохранит required_skills и faculties.
+#
+# Задача выполняется во внутрипроцессном пуле (core/background.py) и теряется, если
+# воркер перезапускается (max_requests, деплой). Получатели выводятся из состояния
+# базы, повторный запуск не создаёт дублей, а завершение отмечается в Event.notified_at:
+# manage.py notify_published_events повторяет рассылку для опубликованных мероприятий
+# без отметки (запускать по расписанию и после деплоя).
+
+import logging
+from itertools import islice
+
+from django.db.models import Count
+from django.utils import timezone
+
+from .background import submit_on_commit
+from .models import Event, EventNotification, TalentProfile
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def eligible_talents(event):
+    """QuerySet пар (user_id, число совпавших навыков) талантов, подходящих мероприятию."""
+    matches = TalentProfile.skills.through.objects.filter(
+        skill_id__in=Event.required_skills.through.objects.filter(event_id=event.pk).values('skill_id')
+    )
+    if event.faculty_restriction:
+        matches = matches.filter(
+            talentprofile__faculty_id__in=Event.faculties.through.objects.filter(event_id=event.pk).values('faculty_id')
+        )
+    return (
+        matches
+        .exclude(talentprofile__user_id=event.organizer_id)
+        .values('talentprofile__user_id')
+        .annotate(match_count=Count('skill_id'))
+        .values_list('talentprofile__user_id', 'match_count')
+        .order_by()
+    )
+
+
+def notify_event_published(event_id):
+    """Фоновая задача: добавляет мероприятие в ленты подходящих талантов. Возвращает число новых уведомлений."""
+    event = (
+        Event.objects.filter(pk=event_id, status='published')
+        .only('id', 'organizer_id', 'faculty_restriction')
+        .first()
+    )
+    if event is None:
+        # Мероприятие успели снять с публикации или удалить
+        return 0
+
+    # ignore_conflicts не сообщает, сколько строк вставлено: новые уведомления — разница
+    # числа строк мероприятия до и после рассылки
+    existing = EventNotification.objects.filter(event_id=event.pk)
+    before = existing.count()
+    eligible = 0
+    rows = eligible_talents(event).iterator(chunk_size=BATCH_SIZE)
+    while batch := list(islice(rows, BATCH_SIZE)):
+        EventNotification.objects.bulk_create(
+            [EventNotification(user_id=user_id, event_id=event.pk, match_count=count) for user_id, count in batch],
+            ignore_conflicts=True,
+        )
+        eligible += len(batch)
+    created = existing.count() - before
+    Event.objects.filter(pk=event.pk).update(notified_at=timezone.now())
+    logger.info('Уведомления о публикации мероприятия',
+                extra={'event_id': event_id, 'eligible': eligible, 'notified': created})
+    return created
+
+
+def pending_events():
+    """Опубликованные мероприятия, рассылка по которым не завершилась."""
+    return Event.objects.filter(status='published', notified_at__isnull=True).order_by('pk')
+
+
+def schedule_publication_notifications(event, previous_status=None):
+    """Ставит рассылку после коммита, если мероприятие только что опубликовано."""
+    if event.status == 'published' and previous_status != 'published':
+        if event.notified_at is not None:
+            # Повторная публикация: до завершения новой рассылки мероприятие снова ждёт её
+            Event.objects.filter(pk=event.pk).update(notified_at=None)
+            event.notified_at = None
+        submit_on_commit(notify_event_published, event.pk)
@@ -0,0 +1,202 @@
+# Keyset-пагинация (по курсору) для длинных лент.
+#
+# Вместо COUNT(*) + OFFSET следующая страница выбирается условием по значениям
+# сортировки последней строки, поэтому стоимость страницы не зависит от её номера.
+# Режим включается параметром ?pagination=cursor (или наличием ?cursor=...),
+# по умолчанию эндпоинты продолжают отдавать PageNumberPagination.
+#
+# Обе пагинации умеют работать из асинхронных представлений (apaginate_queryset):
+# COUNT и выборка страницы выполняются через async ORM.
+
+import base64
+import binascii
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Некорректный курсор'
+
+    def __init__(self, ordering):
+        # Последнее поле сортировки должно быть уникальным (обычно id) — оно разрешает равенства
+        self.ordering = tuple(ordering)
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+        self.max_page_size = getattr(settings, 'CURSOR_PAGINATION_MAX_PAGE_SIZE', 100)
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        return params.get('pagination') == 'cursor' or cls.cursor_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def _fields(self, queryset):
+        for item in self.ordering:
+            name = item.lstrip('-')
+            yield name, item.startswith('-'), queryset.model._meta.get_field(name)
+
+    def encode_cursor(self, values):
+        payload = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    def decode_cursor(self, queryset, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            fields = list(self._fields(queryset))
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [field.to_python(value) for (_, _, field), value in zip(fields, values)]
+        except (TypeError, ValueError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, queryset, values):
+        """Условие «строго после позиции курсора» для составной сортировки."""
+        # (a < x) OR (a = x AND b < y) OR ... для сортировки по убыванию
+        fields = list(self._fields(queryset))
+        condition = Q()
+        for i, (name, descending, _) in enumerate(fields):
+            step = Q(**{f'{name}__lt' if descending else f'{name}__gt': values[i]})
+            for j, (prev_name, _, _) in enumerate(fields[:i]):
+                step &= Q(**{prev_name: values[j]})
+            condition |= step
+        # Дизъюнкция сама по себе не использует индекс как диапазон, и глубокие страницы
+        # сканировались бы с начала. Избыточная граница a <= x даёт планировщику точку
+        # входа в индекс (a, b), так что стоимость страницы не зависит от её номера.
+        name, descending, _ = fields[0]
+        return Q(**{f'{name}__lte' if descending else f'{name}__gte': values[0]}) & condition
+
+    def _start(self, request):
+        """Читает параметры запроса; возвращает True, если клиент запросил общее количество."""
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.count = None
+        return request.query_params.get(self.count_query_param) in ('1', 'true')
+
+    def _page_queryset(self, queryset):
+        queryset = queryset.order_by(*self.ordering)
+        encoded = self.request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self._after(queryset, self.decode_cursor(queryset, encoded)))
+        return queryset[:self.page_size_value + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._start(request):
+            self.count = queryset.order_by().count()
+        return self._finish(queryset, list(self._page_queryset(queryset)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self._start(request):
+            self.count = await queryset.order_by().acount()
+        return self._finish(queryset, [row async for row in self._page_queryset(queryset)])
+
+    def _finish(self, queryset, rows):
+        self.has_next = len(rows) > self.page_size_value
+        page = rows[:self.page_size_value]
+
+        self.next_cursor = None
+        if self.has_next and page:
+            last = page[-1]
+            self.next_cursor = self.encode_cursor([
+                field.value_to_string(last) for _, _, field in self._fields(queryset)
+            ])
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, 'pagination', 'cursor')
+        url = remove_query_param(url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        payload = {'next': self.get_next_link(), 'results': data}
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Подключает KeysetPagination к GenericAPIView по запросу клиента.
+    keyset_ordering задаёт сортировку ленты; последнее поле — уникальный id.
+    """
+    keyset_ordering = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.keyset_ordering and KeysetPagination.is_requested(self.request):
+                self._paginator = KeysetPagination(self.keyset_ordering)
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """PageNumberPagination, которую можно вызывать из асинхронных представлений."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # count у Paginator — cached_property, подставляем значение из async-запроса
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        object_list = [obj async for obj in queryset[bottom:top]]
+        self.page = paginator._get_page(object_list, number, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+async def apaginate_queryset(paginator, queryset, request, view=None):
+    """Асинхронная пагинация любым пагинатором DRF (синхронные выполняются в потоке)."""
+    if hasattr(paginator, 'apaginate_queryset'):
+        return await paginator.apaginate_queryset(queryset, request, view)
+    return await sync_to_async(paginator.paginate_queryset)(queryset, request, view)
@@ -0,0 +1,284 @@
+# Инструментирование запросов: SQL, сериализация, рендеринг, размер ответа.
+#
+# performance_middleware (core/middleware.py) создаёт RequestMetrics в contextvars
+# на время запроса. Счётчики заполняют:
+#   - query_wrapper — execute_wrapper, который signals.py ставит на каждое новое
+#     подключение к базе (в том числе в потоках sync_to_async);
+#   - TimedSerializerMixin — время верхнеуровневого to_representation и число
+#     запросов, сделанных во время сериализации (признак N+1);
+#   - TimedJSONRenderer — время рендеринга JSON.
+#
+# Итоги запроса уходят в заголовки Server-Timing / X-Query-Count и в гистограммы
+# по маршрутам (RouteHistograms). Гистограммы живут в памяти воркера и раз в
+# PERF_PUBLISH_SECONDS публикуются в кэш, откуда их собирают /api/metrics/requests/
+# и команда perf_report (для нескольких воркеров нужен общий кэш, см. CACHES).
+#
+# Снимок каждого воркера лежит под своим ключом с TTL; список pid в WORKERS_KEY
+# только помогает их найти. Воркер, потерянный при одновременной записи списка,
+# добавляет себя снова при следующей публикации, а pid с истёкшим снимком
+# (воркер перезапущен по max_requests) collect() из списка удаляет.
+# Сброс (reset_all) меняет эпоху: воркеры, увидев новую эпоху, очищают гистограммы
+# в памяти, а снимки прошлой эпохи при сборе пропускаются.
+
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+# Верхние границы корзин гистограммы длительности, мс (последняя корзина — всё, что больше)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+WORKERS_KEY = 'perf:workers'
+WORKER_KEY = 'perf:worker:{pid}'
+EPOCH_KEY = 'perf:epoch'
+# Снимок остановленного воркера остаётся в сводке не дольше часа
+SNAPSHOT_TIMEOUT = 60 * 60
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_ms', 'serialize_ms', 'serialize_queries', 'render_ms', 'nested')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.serialize_ms = 0.0
+        self.serialize_queries = 0
+        self.render_ms = 0.0
+        self.nested = False
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def query_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedSerializerMixin:
+    """Учитывает время и запросы сериализации; вложенные сериализаторы не считаются повторно."""
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.nested:
+            return super().to_representation(instance)
+        metrics.nested = True
+        queries = metrics.queries
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.nested = False
+            metrics.serialize_ms += (time.perf_counter() - started) * 1000
+            metrics.serialize_queries += metrics.queries - queries
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.render_ms += (time.perf_counter() - started) * 1000
+
+
+def server_timing(metrics, total_ms):
+    return ', '.join([
+        f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+        f'serialize;dur={metrics.serialize_ms:.1f};desc="{metrics.serialize_queries} queries"',
+        f'render;dur={metrics.render_ms:.1f}',
+        f'total;dur={total_ms:.1f}',
+    ])
+
+
+def _empty_route():
+    return {
+        'count': 0,
+        'duration_ms': {'sum': 0.0, 'max': 0.0, 'buckets': [0] * (len(BUCKETS_MS) + 1)},
+        'queries': {'sum': 0, 'max': 0},
+        'serialize_queries_sum': 0,
+        'db_ms_sum': 0.0,
+        'serialize_ms_sum': 0.0,
+        'render_ms_sum': 0.0,
+        'bytes_sum': 0,
+    }
+
+
+def _bucket(duration_ms):
+    for index, bound in enumerate(BUCKETS_MS):
+        if duration_ms <= bound:
+            return index
+    return len(BUCKETS_MS)
+
+
+def current_epoch():
+    return cache.get_or_set(EPOCH_KEY, lambda: uuid.uuid4().hex, None)
+
+
+class RouteHistograms:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._published_at = 0.0
+        self._epoch = None
+
+    def record(self, route, duration_ms, metrics, size):
+        with self._lock:
+            stats = self._routes.setdefault(route, _empty_route())
+            stats['count'] += 1
+            stats['duration_ms']['sum'] += duration_ms
+            stats['duration_ms']['max'] = max(stats['duration_ms']['max'], duration_ms)
+            stats['duration_ms']['buckets'][_bucket(duration_ms)] += 1
+            stats['queries']['sum'] += metrics.queries
+            stats['queries']['max'] = max(stats['queries']['max'], metrics.queries)
+            stats['serialize_queries_sum'] += metrics.serialize_queries
+            stats['db_ms_sum'] += metrics.db_ms
+            stats['serialize_ms_sum'] += metrics.serialize_ms
+            stats['render_ms_sum'] += metrics.render_ms
+            stats['bytes_sum'] += size or 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: {**stats, 'duration_ms': {**stats['duration_ms'],
+                                                 'buckets': list(stats['duration_ms']['buckets'])},
+                        'queries': dict(stats['queries'])}
+                for route, stats in self._routes.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def sync_epoch(self, epoch):
+        """Очищает гистограммы, если после прошлой проверки эпоха сменилась (reset_all)."""
+        with self._lock:
+            if self._epoch is not None and self._epoch != epoch:
+                self._routes = {}
+            self._epoch = epoch
+
+    def due(self):
+        return time.monotonic() - self._published_at >= getattr(settings, 'PERF_PUBLISH_SECONDS', 10)
+
+    def publish(self, force=False):
+        """Публикует снимок воркера в кэш не чаще раза в PERF_PUBLISH_SECONDS."""
+        if not force and not self.due():
+            return
+        self._published_at = time.monotonic()
+        epoch = current_epoch()
+        self.sync_epoch(epoch)
+        pid = os.getpid()
+        cache.set(WORKER_KEY.format(pid=pid), {'epoch': epoch, 'routes': self.snapshot()}, SNAPSHOT_TIMEOUT)
+        workers = cache.get(WORKERS_KEY) or []
+        if pid not in workers:
+            cache.set(WORKERS_KEY, [*workers, pid], SNAPSHOT_TIMEOUT)
+
+
+registry = RouteHistograms()
+
+
+def merge(snapshots):
+    merged = {}
+    for snapshot in snapshots:
+        for route, stats in snapshot.items():
+            target = merged.setdefault(route, _empty_route())
+            target['count'] += stats['count']
+            target['duration_ms']['sum'] += stats['duration_ms']['sum']
+            target['duration_ms']['max'] = max(target['duration_ms']['max'], stats['duration_ms']['max'])
+            target['duration_ms']['buckets'] = [
+                a + b for a, b in zip(target['duration_ms']['buckets'], stats['duration_ms']['buckets'])
+            ]
+            target['queries']['sum'] += stats['queries']['sum']
+            target['queries']['max'] = max(target['queries']['max'], stats['queries']['max'])
+            for key in ('serialize_queries_sum', 'db_ms_sum', 'serialize_ms_sum', 'render_ms_sum', 'bytes_sum'):
+                target[key] += stats[key]
+    return merged
+
+
+def collect():
+    """Гистограммы всех воркеров, опубликованные в кэше, с актуальным снимком текущего."""
+    epoch = current_epoch()
+    registry.sync_epoch(epoch)
+    pid = os.getpid()
+    workers = cache.get(WORKERS_KEY) or []
+    published = cache.get_many([WORKER_KEY.format(pid=worker) for worker in workers])
+    alive = [worker for worker in workers if WORKER_KEY.format(pid=worker) in published]
+    if len(alive) < len(workers):
+        cache.set(WORKERS_KEY, alive, SNAPSHOT_TIMEOUT)
+
+    snapshots = [registry.snapshot()]
+    for worker in alive:
+        snapshot = published[WORKER_KEY.format(pid=worker)]
+        if worker != pid and snapshot.get('epoch') == epoch:
+            snapshots.append(snapshot['routes'])
+    return merge(snapshots)
+
+
+def reset_all():
+    """Сбрасывает гистограммы всех воркеров: они очистят свои при следующей публикации."""
+    epoch = uuid.uuid4().hex
+    cache.set(EPOCH_KEY, epoch, None)
+    registry.reset()
+    registry.sync_epoch(epoch)
+    workers = cache.get(WORKERS_KEY) or []
+    cache.delete_many([WORKER_KEY.format(pid=worker) for worker in workers] + [WORKERS_KEY])
+
+
+def _percentile(buckets, count, max_ms, quantile):
+    # Верхняя граница корзины, в которую попадает квантиль (для последней — максимум)
+    threshold = quantile * count
+    cumulative = 0
+    for index, bucket_count in enumerate(buckets):
+        cumulative += bucket_count
+        if cumulative >= threshold:
+            return BUCKETS_MS[index] if index < len(BUCKETS_MS) else round(max_ms, 1)
+    return round(max_ms, 1)
+
+
+def summarize(histograms):
+    rows = []
+    for route, stats in sorted(histograms.items()):
+        count = stats['count'] or 1
+        duration = stats['duration_ms']
+        rows.append({
+            'route': route,
+            'count': stats['count'],
+            'avg_ms': round(duration['sum'] / count, 1),
+            'p50_ms': _percentile(duration['buckets'], stats['count'], duration['max'], 0.5),
+            'p95_ms': _percentile(duration['buckets'], stats['count'], duration['max'], 0.95),
+            'p99_ms': _percentile(duration['buckets'], stats['count'], duration['max'], 0.99),
+            'max_ms': round(duration['max'], 1),
+            'avg_queries': round(stats['queries']['sum'] / count, 1),
+            'max_queries': stats['queries']['max'],
+            'avg_serialize_queries': round(stats['serialize_queries_sum'] / count, 1),
+            'avg_db_ms': round(stats['db_ms_sum'] / count, 1),
+            'avg_serialize_ms': round(stats['serialize_ms_sum'] / count, 1),
+            'avg_render_ms': round(stats['render_ms_sum'] / count, 1),
+            'avg_bytes': round(stats['bytes_sum'] / count),
+            'buckets_ms': dict(zip([*map(str, BUCKETS_MS), 'inf'], duration['buckets'])),
+        })
+    return rows
@@ -0,0 +1,38 @@
+# Движок рекомендаций: ранжирует опубликованные мероприятия по числу совпавших навыков.
+#
+# Подсчёт идёт одним SQL-запросом по инвертированному индексу EventSkillIndex:
+# навыки таланта подставляются подзапросом, строки индекса группируются по
+# мероприятию, а сортировка и пагинация выполняются на стороне базы.
+
+from django.db.models import Count
+
+from .models import Event, TalentProfile
+
+
+def talent_skill_ids(talent_profile):
+    """Подзапрос с ID навыков таланта (не выполняется отдельно)."""
+    return TalentProfile.skills.through.objects.filter(
+        talentprofile_id=talent_profile.pk
+    ).values('skill_id')
+
+
+def recommended_events(talent_profile, queryset=None):
+    """
+    Возвращает QuerySet опубликованных мероприятий, у которых есть хотя бы один
+    общий навык с талантом, с аннотацией match_score (число совпавших навыков).
+    Порядок: больше совпадений → более поздняя дата → больший ID.
+    """
+    if queryset is None:
+        queryset = Event.objects.all()
+
+    return (
+        queryset
+        .filter(
+            # Статус берётся из строки индекса: он совпадает с Event.status (core/signals.py)
+            # и входит в индекс (skill, event_status, event)
+            skill_index__event_status='published',
+            skill_index__skill_id__in=talent_skill_ids(talent_profile),
+        )
+        .annotate(match_score=Count('skill_index'))
+        .order_by('-match_score', '-date', '-id')
+    )
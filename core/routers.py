@@ -0,0 +1,72 @@
+# Чтение с реплик базы данных.
+#
+# Реплики перечисляются в settings.DATABASE_REPLICAS (из DATABASE_REPLICA_URLS).
+# ReplicaRouter отправляет чтение на случайную реплику только внутри запросов,
+# которые явно это разрешили (ReplicaReadMixin для безопасных методов), всё
+# остальное — и любые записи — идёт в default.
+#
+# Чтобы пользователь сразу видел свои изменения, после успешного POST/PUT/PATCH/DELETE
+# его запросы REPLICA_STICKY_SECONDS секунд читают из default
+# (core.middleware.replica_routing_middleware запоминает это в кэше). Кэш должен быть
+# общим для воркеров — иначе gunicorn с репликами не запустится (core/checks.py).
+#
+# Флаг хранится в contextvars: он переносится в потоки sync_to_async и обратно,
+# поэтому работает и для async-представлений (core/async_views.py).
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def set_replica_reads(enabled):
+    _replica_reads.set(enabled)
+
+
+def sticky_key(user_id):
+    return f'db:sticky:{user_id}'
+
+
+def is_sticky(user):
+    return bool(user and user.is_authenticated and cache.get(sticky_key(user.pk)))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if aliases and _replica_reads.get():
+            return random.choice(aliases)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и default
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплик приходит репликацией с основной базы
+        return db not in replicas()
+
+
+class ReplicaReadMixin:
+    """
+    Разрешает чтение с реплик для безопасных методов представления.
+    Подмешивается к APIView/ViewSet; флаг сбрасывает replica_routing_middleware.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and replicas() and not is_sticky(request.user):
+            set_replica_reads(True)
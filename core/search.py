@@ -0,0 +1,76 @@
+# Полнотекстовый поиск мероприятий.
+#
+# В PostgreSQL поиск идёт по колонке Event.search_vector (GIN-индекс) с русской
+# морфологией и ранжированием SearchRank. Колонка пересчитывается сигналами при
+# сохранении мероприятия и при смене названия организации. На других СУБД
+# (SQLite в тестах) используется поиск по подстроке с упрощённым ранжированием.
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+SEARCH_CONFIG = 'russian'
+
+
+def is_postgres(alias):
+    return connections[alias].vendor == 'postgresql'
+
+
+def event_search_vector(organizer_profile_model):
+    """Выражение tsvector для мероприятия; название организации берётся подзапросом."""
+    organization_name = Subquery(
+        organizer_profile_model.objects
+        .filter(user_id=OuterRef('organizer_id'))
+        .values('organization_name')[:1]
+    )
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        + SearchVector(Coalesce(organization_name, Value('')), weight='C', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Пересчитывает search_vector для мероприятий из queryset одним UPDATE."""
+    if not is_postgres(queryset.db):
+        return 0
+    from .models import OrganizerProfile
+    return queryset.update(search_vector=event_search_vector(OrganizerProfile))
+
+
+def search_events(queryset, query):
+    """Фильтрует queryset по поисковой строке и сортирует по релевантности."""
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if is_postgres(queryset.db):
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+        return (
+            queryset
+            .filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-search_rank', '-date', '-id')
+        )
+
+    # Запасной вариант без полнотекстового индекса: все слова должны встретиться
+    # хотя бы в одном из полей, совпадение в заголовке ранжируется выше.
+    # SQLite сравнивает без учёта регистра только ASCII-символы.
+    fields = ('title', 'description', 'location', 'organizer__organizerprofile__organization_name')
+    terms = query.split()
+    for term in terms:
+        term_filter = Q()
+        for field in fields:
+            term_filter |= Q(**{f'{field}__icontains': term})
+        queryset = queryset.filter(term_filter)
+
+    title_match = Q()
+    for term in terms:
+        title_match &= Q(title__icontains=term)
+    return (
+        queryset
+        .annotate(search_rank=Case(When(title_match, then=Value(1)), default=Value(0), output_field=IntegerField()))
+        .order_by('-search_rank', '-date', '-id')
+    )
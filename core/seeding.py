@@ -0,0 +1,238 @@
+# Синтетические данные для нагрузочных тестов (manage.py seed_load_data).
+#
+# Пользователи, профили и мероприятия создаются bulk_create порциями (их ID нужны
+# для связей), а связующие таблицы, индекс навыков и заявки — через COPY в
+# PostgreSQL или bulk_create на других СУБД. Сигналы при этом не срабатывают,
+# поэтому в конце явно заполняются search_vector, пересчитывается статистика
+# (rebuild_stats) и сбрасываются версии кэша справочников.
+#
+# Все сгенерированные пользователи имеют общий префикс имени (по умолчанию load_)
+# и пароль LOAD_PASSWORD; clear_seeded() удаляет их вместе со всеми данными.
+
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_version
+from .models import (Application, Event, EventNotification, EventSkillIndex, Faculty, OrganizerProfile, Skill,
+                     TalentProfile, UserActivityStats, UserSkillStat)
+from .search import update_search_vectors
+from .stats import rebuild_stats
+
+DEFAULT_PREFIX = 'load_'
+LOAD_PASSWORD = 'load-test-password'
+BATCH_SIZE = 5000
+
+EVENT_KINDS = ('Хакатон', 'Конференция', 'Олимпиада', 'Мастер-класс', 'Форум', 'Семинар', 'Турнир', 'Воркшоп')
+EVENT_TOPICS = ('по Python', 'по дизайну', 'по робототехнике', 'по маркетингу', 'по биологии',
+                'по анализу данных', 'по журналистике', 'по истории', 'по экономике', 'по физике')
+CITIES = ('Астрахань', 'Волгоград', 'Москва', 'Казань', 'Онлайн')
+# Доли статусов мероприятий
+EVENT_STATUSES = (('published', 70), ('draft', 10), ('closed', 10), ('cancelled', 10))
+APPLICATION_STATUSES = (('pending', 60), ('approved', 25), ('rejected', 15))
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def can_copy():
+    return connection.vendor == 'postgresql'
+
+
+def insert_rows(model, fields, rows, batch_size=BATCH_SIZE, use_copy=False):
+    """
+    Вставляет кортежи значений fields (имена атрибутов, например user_id).
+    С use_copy строки передаются в PostgreSQL потоком через COPY FROM STDIN.
+    """
+    count = 0
+    if use_copy:
+        columns = ', '.join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            with cursor.copy(f'COPY {table} ({columns}) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+        return count
+    for batch in _batches(rows, batch_size):
+        model.objects.bulk_create([model(**dict(zip(fields, row))) for row in batch], batch_size=batch_size)
+        count += len(batch)
+    return count
+
+
+def _reference_data(model, names, defaults=None):
+    existing = dict(model.objects.filter(name__in=names).values_list('name', 'pk'))
+    model.objects.bulk_create([model(name=name, **(defaults(name) if defaults else {}))
+                               for name in names if name not in existing])
+    return list(model.objects.filter(name__in=names).values_list('pk', flat=True))
+
+
+def _create_users(prefix, kind, count, password, batch_size):
+    ids = []
+    for batch in _batches(range(count), batch_size):
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}{kind}{i}', email=f'{prefix}{kind}{i}@example.com', password=password)
+            for i in batch
+        ], batch_size=batch_size)
+        ids.extend(user.pk for user in users)
+    return ids
+
+
+def seed(talents=1000, organizers=50, events=2000, applications=20000, skills=200, faculties=12,
+         skills_per_event=4, skills_per_talent=5, prefix=DEFAULT_PREFIX, batch_size=BATCH_SIZE,
+         use_copy=None, random_seed=0, log=None):
+    """Создаёт набор данных заданного размера. Возвращает число созданных строк по таблицам."""
+    rng = random.Random(random_seed)
+    use_copy = can_copy() if use_copy is None else use_copy and can_copy()
+    log = log or (lambda message: None)
+    counts = {}
+
+    if User.objects.filter(username__startswith=prefix).exists():
+        raise ValueError(f'Пользователи с префиксом {prefix!r} уже есть — сначала удалите их (clear_seeded)')
+    if events and not organizers:
+        raise ValueError('Для мероприятий нужен хотя бы один организатор')
+    # Не больше одной заявки пользователя на мероприятие
+    applications = min(applications, talents * events)
+
+    skill_ids = _reference_data(Skill, [f'Навык {i}' for i in range(skills)])
+    faculty_ids = _reference_data(Faculty, [f'Факультет {i}' for i in range(faculties)],
+                                  lambda name: {'short_name': name.replace('Факультет ', 'Ф')})
+    skills_per_event = min(skills_per_event, len(skill_ids))
+    skills_per_talent = min(skills_per_talent, len(skill_ids))
+
+    password = make_password(LOAD_PASSWORD)
+    log('Пользователи...')
+    organizer_ids = _create_users(prefix, 'organizer', organizers, password, batch_size)
+    talent_ids = _create_users(prefix, 'talent', talents, password, batch_size)
+    counts['users'] = len(organizer_ids) + len(talent_ids)
+
+    log('Профили...')
+    counts['organizer_profiles'] = insert_rows(
+        OrganizerProfile, ('user_id', 'organization_name', 'description', 'contact_info', 'website', 'verified'),
+        ((user_id, f'Организация {i}', '', f'org{i}@example.com', '', rng.random() < 0.5)
+         for i, user_id in enumerate(organizer_ids)),
+        batch_size,
+    )
+    profile_ids = []
+    for batch in _batches(talent_ids, batch_size):
+        profiles = TalentProfile.objects.bulk_create([
+            TalentProfile(user_id=user_id, faculty_id=rng.choice(faculty_ids) if faculty_ids else None,
+                          education_level=rng.choice(TalentProfile.EDUCATION_LEVELS)[0], course=rng.randint(1, 4))
+            for user_id in batch
+        ], batch_size=batch_size)
+        profile_ids.extend(profile.pk for profile in profiles)
+    counts['talent_profiles'] = len(profile_ids)
+    counts['talent_skills'] = insert_rows(
+        TalentProfile.skills.through, ('talentprofile_id', 'skill_id'),
+        ((profile_id, skill_id) for profile_id in profile_ids
+         for skill_id in rng.sample(skill_ids, skills_per_talent)),
+        batch_size, use_copy,
+    )
+
+    log('Мероприятия...')
+    today = date.today()
+    event_ids = []
+    counts.update(events=0, event_skills=0, event_faculties=0, event_skill_index=0)
+    for batch in _batches(range(events), batch_size):
+        created = Event.objects.bulk_create([
+            Event(
+                organizer_id=rng.choice(organizer_ids),
+                title=f'{rng.choice(EVENT_KINDS)} {rng.choice(EVENT_TOPICS)} #{i}',
+                description='Синтетическое мероприятие для нагрузочного тестирования.',
+                location=rng.choice(CITIES),
+                status=_weighted(rng, EVENT_STATUSES),
+                date=today + timedelta(days=rng.randint(-180, 365)),
+                faculty_restriction=bool(faculty_ids) and rng.random() < 0.15,
+            )
+            for i in batch
+        ], batch_size=batch_size)
+        event_ids.extend(event.pk for event in created)
+        counts['events'] += len(created)
+
+        # Связи пишутся сразу для порции — статус и дата нужны индексу навыков
+        event_skills = [(event, rng.sample(skill_ids, skills_per_event)) for event in created]
+        counts['event_skills'] += insert_rows(
+            Event.required_skills.through, ('event_id', 'skill_id'),
+            ((event.pk, skill_id) for event, ids in event_skills for skill_id in ids),
+            batch_size, use_copy,
+        )
+        counts['event_skill_index'] += insert_rows(
+            EventSkillIndex, ('skill_id', 'event_id', 'event_status', 'event_date'),
+            ((skill_id, event.pk, event.status, event.date) for event, ids in event_skills for skill_id in ids),
+            batch_size, use_copy,
+        )
+        counts['event_faculties'] += insert_rows(
+            Event.faculties.through, ('event_id', 'faculty_id'),
+            ((event.pk, faculty_id) for event in created if event.faculty_restriction
+             for faculty_id in rng.sample(faculty_ids, min(3, len(faculty_ids)))),
+            batch_size, use_copy,
+        )
+
+    log('Заявки...')
+    counts['applications'] = insert_rows(
+        Application, ('user_id', 'event_id', 'status', 'created_at', 'message', 'organizer_comment'),
+        _application_rows(rng, talent_ids, event_ids, applications),
+        batch_size, use_copy,
+    )
+
+    log('Поисковый индекс и статистика...')
+    update_search_vectors(Event.objects.filter(organizer__username__startswith=prefix))
+    rebuild_stats(batch_size=batch_size)
+    bump_version('skills')
+    bump_version('faculties')
+    return counts
+
+
+def _application_rows(rng, talent_ids, event_ids, total):
+    """Заявки распределены по талантам равномерно, без повторов пары (пользователь, мероприятие)."""
+    if not total:
+        return
+    now = timezone.now()
+    per_talent, extra = divmod(total, len(talent_ids))
+    for i, user_id in enumerate(talent_ids):
+        for event_id in rng.sample(event_ids, per_talent + (i < extra)):
+            created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 180))
+            yield user_id, event_id, _weighted(rng, APPLICATION_STATUSES), created_at, '', ''
+
+
+def clear_seeded(prefix=DEFAULT_PREFIX):
+    """
+    Удаляет пользователей с префиксом и все их данные без сигналов (по одному DELETE
+    на таблицу), затем пересчитывает статистику. Возвращает число удалённых пользователей.
+    """
+    users = User.objects.filter(username__startswith=prefix)
+    user_ids = users.values('pk')
+    event_ids = Event.objects.filter(organizer_id__in=user_ids).values('pk')
+    querysets = [
+        Application.objects.filter(Q(user_id__in=user_ids) | Q(event_id__in=event_ids)),
+        EventNotification.objects.filter(Q(user_id__in=user_ids) | Q(event_id__in=event_ids)),
+        EventSkillIndex.objects.filter(event_id__in=event_ids),
+        Event.required_skills.through.objects.filter(event_id__in=event_ids),
+        Event.faculties.through.objects.filter(event_id__in=event_ids),
+        Event.objects.filter(organizer_id__in=user_ids),
+        TalentProfile.skills.through.objects.filter(talentprofile__user_id__in=user_ids),
+        TalentProfile.objects.filter(user_id__in=user_ids),
+        OrganizerProfile.objects.filter(user_id__in=user_ids),
+        UserActivityStats.objects.filter(user_id__in=user_ids),
+        UserSkillStat.objects.filter(user_id__in=user_ids),
+    ]
+    for queryset in querysets:
+        # Каскадный delete() вызывал бы сигналы статистики для каждой заявки
+        queryset._raw_delete(queryset.db)
+    deleted = users._raw_delete(users.db)
+    rebuild_stats()
+    return deleted
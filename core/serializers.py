@@ -1,12 +1,19 @@
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from django.contrib.auth.models import User
-from .models import TalentProfile, OrganizerProfile, Event, Application, Faculty, Skill
+from .models import TalentProfile, OrganizerProfile, Event, EventNotification, Application, Faculty, Skill
+from .images import schedule_image_processing, strip_metadata, variant_urls
+from .log import field_names
+from .perf import TimedSerializerMixin
 from datetime import date
 import re
 from django.contrib.auth.password_validation import validate_password
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+import logging
 
-class UserSerializer(serializers.ModelSerializer):
+logger = logging.getLogger(__name__)
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
     organizer_id = serializers.SerializerMethodField()
     
@@ -58,20 +65,82 @@ class UserSerializer(serializers.ModelSerializer):
         )
         return user
 
-class FacultySerializer(serializers.ModelSerializer):
+# Связи по первичному ключу, проверяемые пачкой: стандартный PrimaryKeyRelatedField(many=True)
+# делает queryset.get(pk=...) на каждый переданный ID
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    default_error_messages = {
+        'does_not_exist_many': 'Объекты с ID {pk_values} не существуют.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        pks = list(dict.fromkeys(child.to_pk(item) for item in data))
+        if not pks:
+            return []
+        objects = child.get_queryset().in_bulk(pks)
+        missing = [pk for pk in pks if pk not in objects]
+        if missing:
+            self.fail('does_not_exist_many', pk_values=', '.join(map(str, missing)))
+        return [objects[pk] for pk in pks]
+
+
+class MetadataFreeImageField(serializers.ImageField):
+    """ImageField, который удаляет EXIF (в том числе GPS) из загруженного файла до сохранения."""
+
+    def to_internal_value(self, data):
+        return strip_metadata(super().to_internal_value(data))
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField, который при many=True загружает все объекты одним запросом."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def to_internal_value(self, data):
+        pk = self.to_pk(data)
+        try:
+            return self.get_queryset().get(pk=pk)
+        except ObjectDoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+
+    def to_pk(self, data):
+        """Приводит значение к типу первичного ключа без обращения к базе."""
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool) or data is None:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.get_queryset().model._meta.pk.to_python(data)
+        except (TypeError, ValueError, ValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class FacultySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Faculty
         fields = '__all__'
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = '__all__'
 
-class TalentProfileSerializer(serializers.ModelSerializer):
+class TalentProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=False)
     faculty = FacultySerializer(read_only=True)
-    faculty_id = serializers.PrimaryKeyRelatedField(
+    faculty_id = BatchedPrimaryKeyRelatedField(
         queryset=Faculty.objects.all(),
         source='faculty',
         write_only=True,
@@ -79,21 +148,24 @@ class TalentProfileSerializer(serializers.ModelSerializer):
         required=False
     )
     education_level_display = serializers.CharField(source='get_education_level_display', read_only=True)
-    avatar = serializers.ImageField(required=False, allow_null=True)
+    avatar = MetadataFreeImageField(required=False, allow_null=True)
+    avatar_variants = serializers.SerializerMethodField()
 
     first_name = serializers.CharField(source='user.first_name', required=False, allow_blank=True)
     last_name = serializers.CharField(source='user.last_name', required=False, allow_blank=True)
 
     skills = SkillSerializer(many=True, read_only=True)
 
+    def get_avatar_variants(self, obj):
+        return variant_urls(obj.avatar, self.context.get('request'))
+
     def validate_preferences(self, value):
         if value and not re.match(r'^[a-zA-Zа-яА-ЯёЁ0-9\s,]+$', value):
             raise serializers.ValidationError("Предпочтения могут содержать только буквы, цифры, пробелы и запятые.")
         return value
 
     def update(self, instance, validated_data):
-        print(f"TalentProfileSerializer update: Instance -> {instance}")
-        print(f"TalentProfileSerializer update: Validated data -> {validated_data}")
+        logger.debug('Обновление профиля таланта', extra={'profile_id': instance.pk, 'fields': field_names(validated_data)})
         skills_data = validated_data.pop('skills', None)
         user_data = validated_data.pop('user', None)
 
@@ -109,7 +181,7 @@ class TalentProfileSerializer(serializers.ModelSerializer):
             user_serializer = self.fields['user']
             user_serializer.update(instance.user, user_data)
 
-        print(f"TalentProfileSerializer update: Profile after save -> {instance.avatar.name if instance.avatar else 'No avatar'}")
+        logger.info('Профиль таланта обновлён', extra={'profile_id': instance.pk, 'avatar': instance.avatar.name or None})
         return instance
 
     class Meta:
@@ -117,22 +189,25 @@ class TalentProfileSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'user', 'skills', 'preferences', 'bio', 
             'faculty', 'faculty_id', 'education_level',
-            'education_level_display', 'course', 'avatar',
+            'education_level_display', 'course', 'avatar', 'avatar_variants',
             'first_name', 'last_name'
         ]
         read_only_fields = ['id']
 
-class OrganizerProfileSerializer(serializers.ModelSerializer):
+class OrganizerProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
     events_count = serializers.SerializerMethodField()
-    avatar = serializers.ImageField(required=False, allow_null=True)
+    avatar = MetadataFreeImageField(required=False, allow_null=True)
+    avatar_variants = serializers.SerializerMethodField()
 
     def get_events_count(self, obj):
         return obj.user.events.count()
 
+    def get_avatar_variants(self, obj):
+        return variant_urls(obj.avatar, self.context.get('request'))
+
     def update(self, instance, validated_data):
-        print(f"OrganizerProfileSerializer update: Instance -> {instance}")
-        print(f"OrganizerProfileSerializer update: Validated data -> {validated_data}")
+        logger.debug('Обновление профиля организатора', extra={'profile_id': instance.pk, 'fields': field_names(validated_data)})
 
         instance.organization_name = validated_data.get('organization_name', instance.organization_name)
         instance.description = validated_data.get('description', instance.description)
@@ -142,21 +217,21 @@ class OrganizerProfileSerializer(serializers.ModelSerializer):
             instance.avatar = validated_data['avatar']
 
         instance.save()
-        print(f"OrganizerProfileSerializer update: Profile after save -> {instance.avatar.name if instance.avatar else 'No avatar'}")
+        logger.info('Профиль организатора обновлён', extra={'profile_id': instance.pk, 'avatar': instance.avatar.name or None})
         return instance
 
     class Meta:
         model = OrganizerProfile
         fields = ['id', 'user', 'organization_name', 'description', 'contact_info', 
-                 'website', 'verified', 'events_count', 'avatar']
+                 'website', 'verified', 'events_count', 'avatar', 'avatar_variants']
         read_only_fields = ['verified']
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     organizer = UserSerializer(read_only=True)
     applications_count = serializers.SerializerMethodField()
     organization_name = serializers.SerializerMethodField()
     faculties = FacultySerializer(many=True, read_only=True)
-    faculty_ids = serializers.PrimaryKeyRelatedField(
+    faculty_ids = BatchedPrimaryKeyRelatedField(
         queryset=Faculty.objects.all(),
         many=True,
         write_only=True,
@@ -164,7 +239,7 @@ class EventSerializer(serializers.ModelSerializer):
         source='faculties'
     )
     required_skills = SkillSerializer(many=True, read_only=True)
-    required_skill_ids = serializers.PrimaryKeyRelatedField(
+    required_skill_ids = BatchedPrimaryKeyRelatedField(
         queryset=Skill.objects.all(),
         many=True,
         write_only=True,
@@ -173,8 +248,16 @@ class EventSerializer(serializers.ModelSerializer):
     )
 
     user_application_status = serializers.SerializerMethodField()
+    image = MetadataFreeImageField(required=False, allow_null=True)
+    image_variants = serializers.SerializerMethodField()
+
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image, self.context.get('request'))
 
     def get_applications_count(self, obj):
+        # Значение из аннотации Event.objects.with_list_plan(), иначе — отдельный запрос
+        if hasattr(obj, 'applications_count'):
+            return obj.applications_count
         return obj.application_set.count()
 
     def get_organization_name(self, obj):
@@ -198,8 +281,11 @@ class EventSerializer(serializers.ModelSerializer):
     def get_user_application_status(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            # Заявка текущего пользователя, предзагруженная через Prefetch
+            if hasattr(obj, 'user_applications'):
+                return obj.user_applications[0].status if obj.user_applications else None
             try:
-                application = obj.application_set.get(user=request.user)
+                application = obj.application_set.get(user_id=request.user.pk)
                 return application.status
             except Application.DoesNotExist:
                 return None
@@ -215,6 +301,7 @@ class EventSerializer(serializers.ModelSerializer):
 
         event.required_skills.set(required_skills_data)
         event.faculties.set(faculties_data)
+        schedule_image_processing(event.image)
 
         return event
 
@@ -222,13 +309,35 @@ class EventSerializer(serializers.ModelSerializer):
         model = Event
         fields = [
             'id', 'organizer', 'organization_name', 'title', 'description',
-            'required_skills', 'required_skill_ids', 'date', 'image', 'location', 'status',
+            'required_skills', 'required_skill_ids', 'date', 'image', 'image_variants', 'location', 'status',
             'created_at', 'updated_at', 'applications_count', 'faculty_restriction',
             'faculties', 'faculty_ids', 'user_application_status'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'user_application_status']
 
-class ApplicationSerializer(serializers.ModelSerializer):
+# Строка массового импорта (core/event_import.py): навыки и факультеты — по названиям,
+# проверка без запросов к базе
+class EventImportRowSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    skills = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+    faculties = serializers.ListField(child=serializers.CharField(max_length=255), required=False)
+
+    def validate_date(self, value):
+        if value < date.today():
+            raise serializers.ValidationError("Дата мероприятия не может быть в прошлом.")
+        return value
+
+    def validate(self, data):
+        if data.get('faculty_restriction') and not data.get('faculties'):
+            raise serializers.ValidationError(
+                {"faculties": "При включении ограничения по факультетам необходимо выбрать хотя бы один факультет."}
+            )
+        return data
+
+    class Meta:
+        model = Event
+        fields = ['title', 'description', 'date', 'location', 'status', 'faculty_restriction', 'skills', 'faculties']
+
+class ApplicationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     event = EventSerializer(read_only=True)
     talent_profile = serializers.SerializerMethodField()
@@ -245,4 +354,109 @@ class ApplicationSerializer(serializers.ModelSerializer):
         model = Application
         fields = ['id', 'user', 'event', 'status', 'created_at', 
                  'message', 'organizer_comment', 'talent_profile']
-        read_only_fields = ['user', 'created_at']
\ No newline at end of file
+        read_only_fields = ['user', 'created_at']
+
+# Ответ на подачу заявки: только сама заявка, без вложенных мероприятия и пользователя
+class ApplicationSubmitSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    event = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:
+        model = Application
+        fields = ['id', 'event', 'status', 'created_at', 'message']
+        read_only_fields = ['id', 'event', 'status', 'created_at']
+
+# Массовая смена статусов заявок организатором
+class ApplicationStatusItemSerializer(TimedSerializerMixin, serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+    comment = serializers.CharField(required=False, allow_blank=True)
+
+
+class ApplicationBulkStatusSerializer(TimedSerializerMixin, serializers.Serializer):
+    MAX_ITEMS = 500
+
+    items = ApplicationStatusItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+    def validate_items(self, items):
+        ids = [item['id'] for item in items]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError('ID заявок не должны повторяться')
+        return items
+
+# Компактное представление заявок для входящих организатора: мероприятие передаётся
+# по ID, а сами мероприятия отдаются один раз в отдельном словаре events.
+
+class ApplicantSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'email', 'first_name', 'last_name')
+
+
+class ApplicantProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    faculty = FacultySerializer(read_only=True)
+    skills = SkillSerializer(many=True, read_only=True)
+    education_level_display = serializers.CharField(source='get_education_level_display', read_only=True)
+    avatar_variants = serializers.SerializerMethodField()
+
+    def get_avatar_variants(self, obj):
+        return variant_urls(obj.avatar, self.context.get('request'))
+
+    class Meta:
+        model = TalentProfile
+        fields = [
+            'id', 'skills', 'bio', 'faculty', 'education_level',
+            'education_level_display', 'course', 'avatar', 'avatar_variants'
+        ]
+
+
+class TalentSearchUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'first_name', 'last_name')
+
+
+class TalentSearchSerializer(ApplicantProfileSerializer):
+    """Профиль в поиске талантов: без email, с числом совпавших навыков."""
+    user = TalentSearchUserSerializer(read_only=True)
+    match_count = serializers.SerializerMethodField()
+
+    def get_match_count(self, obj):
+        return getattr(obj, 'match_count', None)
+
+    class Meta(ApplicantProfileSerializer.Meta):
+        fields = ['id', 'user'] + ApplicantProfileSerializer.Meta.fields[1:] + ['match_count']
+
+
+class ApplicationInboxSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    user = ApplicantSerializer(read_only=True)
+    event = serializers.PrimaryKeyRelatedField(read_only=True)
+    talent_profile = serializers.SerializerMethodField()
+
+    def get_talent_profile(self, obj):
+        try:
+            profile = obj.user.talent_profile
+        except TalentProfile.DoesNotExist:
+            return None
+        return ApplicantProfileSerializer(profile, context=self.context).data
+
+    class Meta:
+        model = Application
+        fields = ['id', 'user', 'event', 'status', 'created_at',
+                 'message', 'organizer_comment', 'talent_profile']
+        read_only_fields = fields
+
+
+class EventNotificationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    event = EventSerializer(read_only=True)
+
+    class Meta:
+        model = EventNotification
+        fields = ['id', 'event', 'match_count', 'created_at', 'read_at']
+        read_only_fields = fields
+
+
+class NotificationReadSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Без ids отмечаются прочитанными все уведомления."""
+    MAX_ITEMS = 500
+
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_ITEMS)
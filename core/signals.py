@@ -0,0 +1,239 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import images, perf, stats
+from .authentication import invalidate_claims
+from .cache import bump_version
+from .models import Application, Event, EventSkillIndex, Faculty, OrganizerProfile, Skill, TalentProfile
+from .search import update_search_vectors
+
+
+# Учёт SQL-запросов для метрик (core/perf.py)
+
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    if perf.query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(perf.query_wrapper)
+
+
+# Синхронизация инвертированного индекса навык → мероприятие
+
+@receiver(m2m_changed, sender=Event.required_skills.through)
+def sync_event_skill_index(sender, instance, action, reverse, pk_set, **kwargs):
+    """Поддерживает EventSkillIndex в актуальном состоянии при изменении навыков мероприятия."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if action == 'post_clear':
+        if reverse:
+            EventSkillIndex.objects.filter(skill=instance).delete()
+        else:
+            EventSkillIndex.objects.filter(event=instance).delete()
+        return
+
+    if not pk_set:
+        return
+
+    if reverse:
+        # skill.events.add(...) / skill.events.remove(...)
+        pairs = [(instance.pk, event_id) for event_id in pk_set]
+        lookup = {'skill': instance, 'event_id__in': pk_set}
+    else:
+        pairs = [(skill_id, instance.pk) for skill_id in pk_set]
+        lookup = {'event': instance, 'skill_id__in': pk_set}
+
+    if action == 'post_remove':
+        EventSkillIndex.objects.filter(**lookup).delete()
+        return
+
+    if reverse:
+        events = {
+            event_id: (event_status, event_date)
+            for event_id, event_status, event_date in Event.objects.filter(
+                pk__in=pk_set
+            ).values_list('id', 'status', 'date')
+        }
+    else:
+        events = {instance.pk: (instance.status, instance.date)}
+    EventSkillIndex.objects.bulk_create(
+        [
+            EventSkillIndex(
+                skill_id=skill_id,
+                event_id=event_id,
+                event_status=events[event_id][0],
+                event_date=events[event_id][1],
+            )
+            for skill_id, event_id in pairs
+            if event_id in events
+        ],
+        ignore_conflicts=True,
+    )
+
+
+@receiver(post_save, sender=Event)
+def sync_event_skill_index_status(sender, instance, created, **kwargs):
+    """Переносит статус и дату мероприятия в строки индекса."""
+    if created:
+        return
+    EventSkillIndex.objects.filter(event=instance).exclude(
+        event_status=instance.status, event_date=instance.date
+    ).update(event_status=instance.status, event_date=instance.date)
+
+
+# Инвалидация кэша справочников
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skills_cache(sender, **kwargs):
+    bump_version('skills')
+
+
+@receiver([post_save, post_delete], sender=Faculty)
+def invalidate_faculties_cache(sender, **kwargs):
+    bump_version('faculties')
+
+
+# Версия claims в JWT (core/authentication.py): роль, профили, факультет
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_claims(sender, instance, **kwargs):
+    invalidate_claims(instance.pk)
+
+
+@receiver(post_init, sender=TalentProfile)
+def remember_claims_faculty(sender, instance, **kwargs):
+    instance._claims_faculty_id = instance.__dict__.get('faculty_id')
+
+
+@receiver(post_save, sender=TalentProfile)
+def invalidate_talent_claims(sender, instance, created, **kwargs):
+    if created or instance.faculty_id != instance._claims_faculty_id:
+        invalidate_claims(instance.user_id)
+    instance._claims_faculty_id = instance.faculty_id
+
+
+@receiver(post_save, sender=OrganizerProfile)
+def invalidate_organizer_claims(sender, instance, created, **kwargs):
+    if created:
+        invalidate_claims(instance.user_id)
+
+
+@receiver(post_delete, sender=TalentProfile)
+@receiver(post_delete, sender=OrganizerProfile)
+def invalidate_profile_claims(sender, instance, **kwargs):
+    invalidate_claims(instance.user_id)
+
+
+# Готовность вариантов изображений (core/images.py)
+
+def _image_name(instance, field):
+    value = instance.__dict__.get(field)
+    return getattr(value, 'name', value) or ''
+
+
+@receiver(post_init, sender=TalentProfile)
+@receiver(post_init, sender=OrganizerProfile)
+@receiver(post_init, sender=Event)
+def remember_image_name(sender, instance, **kwargs):
+    field = images.image_field(sender)
+    instance._variants_source = _image_name(instance, field)
+
+
+@receiver(pre_save, sender=TalentProfile)
+@receiver(pre_save, sender=OrganizerProfile)
+@receiver(pre_save, sender=Event)
+def reset_variants_ready(sender, instance, **kwargs):
+    # Варианты нового файла ещё не созданы — флаг снова выставит process_image
+    field = images.image_field(sender)
+    if _image_name(instance, field) != instance._variants_source:
+        setattr(instance, images.ready_field(field), False)
+
+
+@receiver(post_save, sender=TalentProfile)
+@receiver(post_save, sender=OrganizerProfile)
+@receiver(post_save, sender=Event)
+def remember_saved_image_name(sender, instance, **kwargs):
+    instance._variants_source = _image_name(instance, images.image_field(sender))
+
+
+# Полнотекстовый индекс мероприятий (только PostgreSQL)
+
+@receiver(post_save, sender=Event)
+def refresh_event_search_vector(sender, instance, **kwargs):
+    update_search_vectors(Event.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=OrganizerProfile)
+def refresh_organizer_events_search_vector(sender, instance, **kwargs):
+    update_search_vectors(Event.objects.filter(organizer_id=instance.user_id))
+
+
+# Счётчики статистики (core/stats.py)
+
+@receiver(post_init, sender=TalentProfile)
+def remember_profile_faculty(sender, instance, **kwargs):
+    instance._stats_faculty_id = instance.__dict__.get('faculty_id')
+
+
+@receiver(post_save, sender=TalentProfile)
+def count_talent_profile(sender, instance, created, **kwargs):
+    stats.talent_profile_saved(instance, created)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def uncount_user(sender, instance, origin=None, **kwargs):
+    stats.user_deleting(instance, origin)
+
+
+@receiver(post_delete, sender=TalentProfile)
+def uncount_talent_profile(sender, instance, origin=None, **kwargs):
+    stats.talent_profile_deleted(instance, origin)
+
+
+@receiver(post_init, sender=Application)
+def remember_application_status(sender, instance, **kwargs):
+    instance._stats_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    stats.application_saved(instance, created)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, origin=None, **kwargs):
+    stats.application_deleted(instance, origin)
+
+
+@receiver(pre_delete, sender=Event)
+def uncount_event_skills(sender, instance, **kwargs):
+    stats.event_deleting(instance.pk)
+
+
+@receiver(m2m_changed, sender=Event.required_skills.through)
+def count_event_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # После очистки узнать удалённые навыки уже не получится
+        if reverse:
+            instance._stats_cleared = list(instance.events.values_list('pk', flat=True))
+        else:
+            instance._stats_cleared = list(instance.required_skills.values_list('pk', flat=True))
+        return
+
+    if action == 'post_clear':
+        pk_set, delta = getattr(instance, '_stats_cleared', []), -1
+    elif action == 'post_add':
+        delta = 1
+    elif action == 'post_remove':
+        delta = -1
+    else:
+        return
+
+    if not pk_set:
+        return
+    if reverse:
+        for event_id in pk_set:
+            stats.event_skills_changed(event_id, [instance.pk], delta)
+    else:
+        stats.event_skills_changed(instance.pk, pk_set, delta)
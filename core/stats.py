@@ -0,0 +1,272 @@
+# Инкрементальная статистика для FacultyStatsView и UserActivityStatsView.
+#
+# Счётчики хранятся в FacultyStats, UserActivityStats и UserSkillStat и обновляются
+# сигналами (см. core/signals.py) в транзакции вместе с изменением данных.
+# Уменьшение счётчика никогда не создаёт строку: при каскадном удалении пользователя
+# это привело бы к записи, ссылающейся на удаляемого пользователя.
+# Полный пересчёт — rebuild_stats() / manage.py rebuild_stats.
+
+from collections import defaultdict
+from itertools import islice
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+BATCH_SIZE = 2000
+
+
+def _bump(model, lookup, **deltas):
+    """Атомарно прибавляет deltas к полям строки model(**lookup)."""
+    values = {field: Greatest(F(field) + delta, 0) for field, delta in deltas.items() if delta}
+    if not values:
+        return
+    if model.objects.filter(**lookup).update(**values):
+        return
+    if all(delta <= 0 for delta in deltas.values()):
+        return
+    _, created = model.objects.get_or_create(
+        **lookup, defaults={field: max(delta, 0) for field, delta in deltas.items()}
+    )
+    if not created:
+        model.objects.filter(**lookup).update(**values)
+
+
+def _bump_faculty(faculty_id, **deltas):
+    from .models import FacultyStats
+    if faculty_id is not None:
+        _bump(FacultyStats, {'faculty_id': faculty_id}, **deltas)
+
+
+def _user_faculty_id(user_id):
+    from .models import TalentProfile
+    return TalentProfile.objects.filter(user_id=user_id).values_list('faculty_id', flat=True).first()
+
+
+def _user_total(user_id):
+    from .models import UserActivityStats
+    return UserActivityStats.objects.filter(user_id=user_id).values_list('total_applications', flat=True).first() or 0
+
+
+def bump_skills(user_ids, skill_ids, delta):
+    """Прибавляет delta к счётчикам всех пар (пользователь, навык)."""
+    from .models import UserSkillStat
+    user_ids, skill_ids = list(user_ids), list(skill_ids)
+    if not user_ids or not skill_ids or not delta:
+        return
+    if delta > 0:
+        UserSkillStat.objects.bulk_create(
+            (UserSkillStat(user_id=user_id, skill_id=skill_id, count=0)
+             for user_id in user_ids for skill_id in skill_ids),
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+    stats = UserSkillStat.objects.filter(user_id__in=user_ids, skill_id__in=skill_ids)
+    stats.update(count=Greatest(F('count') + delta, 0))
+    if delta < 0:
+        stats.filter(count=0).delete()
+
+
+def _event_skill_ids(event_id):
+    from .models import Event
+    return Event.required_skills.through.objects.filter(event_id=event_id).values_list('skill_id', flat=True)
+
+
+def _event_applicant_ids(event_id):
+    from .models import Application
+    return Application.objects.filter(event_id=event_id).values_list('user_id', flat=True)
+
+
+# Обработчики изменений
+
+def talent_profile_saved(profile, created):
+    old_faculty_id = None if created else getattr(profile, '_stats_faculty_id', profile.faculty_id)
+    new_faculty_id = profile.faculty_id
+    if created or old_faculty_id != new_faculty_id:
+        with transaction.atomic():
+            # Заявки пользователя переезжают вместе с ним на новый факультет
+            total = _user_total(profile.user_id)
+            if not created:
+                _bump_faculty(old_faculty_id, users_count=-1, applications_count=-total)
+            _bump_faculty(new_faculty_id, users_count=1, applications_count=total)
+    profile._stats_faculty_id = new_faculty_id
+
+
+def user_deleting(user, origin):
+    """
+    Пользователь удаляется вместе с профилем, заявками и UserActivityStats. Порядок
+    каскада не определён, поэтому вклад в статистику факультета снимается здесь,
+    в pre_delete, по значениям до удаления; обработчики профиля и заявок этого
+    пользователя затем ничего не делают (см. _deleted_with_user).
+    """
+    from .models import TalentProfile
+    profile = TalentProfile.objects.filter(user_id=user.pk).values_list('faculty_id', flat=True)[:1]
+    if profile:
+        _bump_faculty(profile[0], users_count=-1, applications_count=-_user_total(user.pk))
+    if origin is not None:
+        # origin — один объект на всё удаление, его видят обработчики всего каскада
+        origin._stats_deleted_users = getattr(origin, '_stats_deleted_users', set()) | {user.pk}
+
+
+def _deleted_with_user(user_id, origin):
+    return user_id in getattr(origin, '_stats_deleted_users', ())
+
+
+def talent_profile_deleted(profile, origin=None):
+    if _deleted_with_user(profile.user_id, origin):
+        return
+    with transaction.atomic():
+        _bump_faculty(profile.faculty_id, users_count=-1, applications_count=-_user_total(profile.user_id))
+
+
+def application_saved(application, created):
+    from .models import UserActivityStats
+    old_status = getattr(application, '_stats_status', application.status)
+    with transaction.atomic():
+        if created:
+            _bump(
+                UserActivityStats, {'user_id': application.user_id},
+                total_applications=1,
+                approved_applications=int(application.status == 'approved'),
+            )
+            _bump_faculty(_user_faculty_id(application.user_id), applications_count=1)
+            bump_skills([application.user_id], _event_skill_ids(application.event_id), 1)
+        elif old_status != application.status:
+            delta = int(application.status == 'approved') - int(old_status == 'approved')
+            _bump(UserActivityStats, {'user_id': application.user_id}, approved_applications=delta)
+    application._stats_status = application.status
+
+
+def applications_status_changed(changes):
+    """Массовая смена статусов (bulk_update не шлёт сигналов).
+
+    changes — тройки (user_id, старый статус, новый статус). Счётчики одобренных
+    заявок обновляются одним UPDATE на каждое встречающееся значение изменения.
+    """
+    from .models import UserActivityStats
+    deltas = defaultdict(int)
+    for user_id, old_status, new_status in changes:
+        deltas[user_id] += int(new_status == 'approved') - int(old_status == 'approved')
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    with transaction.atomic():
+        for delta, user_ids in by_delta.items():
+            if delta > 0:
+                UserActivityStats.objects.bulk_create(
+                    (UserActivityStats(user_id=user_id) for user_id in user_ids),
+                    batch_size=BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+            UserActivityStats.objects.filter(user_id__in=user_ids).update(
+                approved_applications=Greatest(F('approved_applications') + delta, 0)
+            )
+
+
+def application_deleted(application, origin=None):
+    from .models import UserActivityStats
+    if _deleted_with_user(application.user_id, origin):
+        # Счётчики пользователя удаляются каскадом, факультет учтён в user_deleting
+        return
+    with transaction.atomic():
+        _bump(
+            UserActivityStats, {'user_id': application.user_id},
+            total_applications=-1,
+            approved_applications=-int(application.status == 'approved'),
+        )
+        _bump_faculty(_user_faculty_id(application.user_id), applications_count=-1)
+        bump_skills([application.user_id], _event_skill_ids(application.event_id), -1)
+
+
+def event_skills_changed(event_id, skill_ids, delta):
+    """Навыки мероприятия изменились — поправить гистограммы всех его заявителей."""
+    with transaction.atomic():
+        bump_skills(_event_applicant_ids(event_id), skill_ids, delta)
+
+
+def event_deleting(event_id):
+    """
+    Снимает вклад навыков удаляемого мероприятия. Связи навыков удаляются раньше
+    заявок, поэтому post_delete заявок уже не увидит навыков мероприятия.
+    """
+    event_skills_changed(event_id, list(_event_skill_ids(event_id)), -1)
+
+
+# Полный пересчёт
+
+def _bulk_create_batches(model, objs, batch_size):
+    """bulk_create порциями, не собирая весь генератор в память."""
+    objs = iter(objs)
+    while True:
+        batch = list(islice(objs, batch_size))
+        if not batch:
+            return
+        model.objects.bulk_create(batch, batch_size=batch_size)
+
+
+def rebuild_stats(apps=global_apps, batch_size=BATCH_SIZE):
+    """Пересчитывает все счётчики по исходным таблицам. Возвращает число строк каждой таблицы."""
+    Application = apps.get_model('core', 'Application')
+    Faculty = apps.get_model('core', 'Faculty')
+    Event = apps.get_model('core', 'Event')
+    FacultyStats = apps.get_model('core', 'FacultyStats')
+    UserActivityStats = apps.get_model('core', 'UserActivityStats')
+    UserSkillStat = apps.get_model('core', 'UserSkillStat')
+
+    with transaction.atomic():
+        FacultyStats.objects.all().delete()
+        applications_by_faculty = dict(
+            Application.objects
+            .filter(user__talent_profile__faculty__isnull=False)
+            .values_list('user__talent_profile__faculty')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        _bulk_create_batches(
+            FacultyStats,
+            (
+                FacultyStats(
+                    faculty_id=faculty_id,
+                    users_count=users_count,
+                    applications_count=applications_by_faculty.get(faculty_id, 0),
+                )
+                for faculty_id, users_count in Faculty.objects.annotate(
+                    users=Count('talentprofile')
+                ).filter(users__gt=0).values_list('id', 'users').iterator(chunk_size=batch_size)
+            ),
+            batch_size,
+        )
+
+        UserActivityStats.objects.all().delete()
+        _bulk_create_batches(
+            UserActivityStats,
+            (
+                UserActivityStats(user_id=row['user_id'], total_applications=row['total'], approved_applications=row['approved'])
+                for row in Application.objects.values('user_id').annotate(
+                    total=Count('id'),
+                    approved=Count('id', filter=Q(status='approved')),
+                ).order_by().iterator(chunk_size=batch_size)
+            ),
+            batch_size,
+        )
+
+        UserSkillStat.objects.all().delete()
+        through = Event.required_skills.through
+        _bulk_create_batches(
+            UserSkillStat,
+            (
+                UserSkillStat(user_id=row['event__application__user_id'], skill_id=row['skill_id'], count=row['total'])
+                for row in through.objects.filter(event__application__isnull=False).values(
+                    'event__application__user_id', 'skill_id'
+                ).annotate(total=Count('id')).order_by().iterator(chunk_size=batch_size)
+            ),
+            batch_size,
+        )
+
+    return {
+        'faculty_stats': FacultyStats.objects.count(),
+        'user_activity_stats': UserActivityStats.objects.count(),
+        'user_skill_stats': UserSkillStat.objects.count(),
+    }
@@ -0,0 +1,123 @@
+# Поиск талантов для организаторов (GET /api/talents/search/).
+#
+# Фильтры: навыки (любой или все из списка), факультет, уровень образования, курс.
+# С фильтром по навыкам профили ранжируются по числу совпавших навыков: соединение
+# со связующей таблицей TalentProfile.skills, группировка по профилю и сортировка
+# выполняются в базе. Для поиска по навыку у связующей таблицы есть индекс
+# (skill_id, talentprofile_id) — см. миграцию 0020.
+#
+# При match=all совпавшие профили отбираются подзапросом по связующей таблице
+# (GROUP BY talentprofile_id), match_count равен числу навыков в фильтре.
+#
+# Фасеты (число найденных профилей по навыкам, факультетам и уровням образования)
+# считаются одним запросом: три GROUP BY по найденным профилям, объединённые UNION ALL.
+
+from django.db.models import CharField, Count, Value
+from django.db.models.functions import Cast
+from rest_framework.exceptions import ValidationError
+
+from .models import TalentProfile
+
+MATCH_ANY, MATCH_ALL = 'any', 'all'
+MAX_SKILLS = 50
+LOOKUPS = {'faculty': 'faculty_id', 'education_level': 'education_level', 'course': 'course'}
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: f'Ожидается целое число, получено {value!r}'})
+
+
+def parse_filters(params):
+    """Фильтры поиска из query-параметров (без обращений к базе)."""
+    filters = {}
+    skills = [part for part in params.get('skills', '').split(',') if part.strip()]
+    if skills:
+        if len(skills) > MAX_SKILLS:
+            raise ValidationError({'skills': f'Не больше {MAX_SKILLS} навыков'})
+        filters['skills'] = sorted({_int(part, 'skills') for part in skills})
+    match = params.get('match', MATCH_ANY)
+    if match not in (MATCH_ANY, MATCH_ALL):
+        raise ValidationError({'match': f'Допустимые значения: {MATCH_ANY}, {MATCH_ALL}'})
+    filters['match'] = match
+    if params.get('faculty'):
+        filters['faculty'] = _int(params['faculty'], 'faculty')
+    level = params.get('education_level')
+    if level:
+        if level not in dict(TalentProfile.EDUCATION_LEVELS):
+            raise ValidationError({'education_level': f'Неизвестный уровень образования {level!r}'})
+        filters['education_level'] = level
+    if params.get('course'):
+        filters['course'] = _int(params['course'], 'course')
+    return filters
+
+
+def _skill_matches(filters):
+    """Подзапрос ID профилей с любым (или всеми) навыками — только по индексу связующей таблицы."""
+    skill_ids = filters['skills']
+    matches = TalentProfile.skills.through.objects.filter(skill_id__in=skill_ids)
+    if filters.get('match') == MATCH_ALL:
+        matches = (
+            matches.values('talentprofile_id')
+            .annotate(matched=Count('skill_id'))
+            .filter(matched=len(skill_ids))
+        )
+    return matches.values('talentprofile_id')
+
+
+def _filtered(filters, queryset):
+    return queryset.filter(**{lookup: filters[key] for key, lookup in LOOKUPS.items() if key in filters})
+
+
+def search_talents(filters, queryset=None):
+    """
+    QuerySet профилей по фильтрам parse_filters. С навыками — аннотация match_count
+    (число совпавших навыков) и сортировка по ней, иначе — новые профили первыми.
+    """
+    queryset = _filtered(filters, TalentProfile.objects.all() if queryset is None else queryset)
+    skill_ids = filters.get('skills')
+    if not skill_ids:
+        return queryset.order_by('-id')
+    if filters.get('match') == MATCH_ALL:
+        # Совпали все навыки — считать нечего
+        queryset = queryset.filter(pk__in=_skill_matches(filters)).annotate(match_count=Value(len(skill_ids)))
+    else:
+        queryset = queryset.filter(skills__in=skill_ids).annotate(match_count=Count('skills'))
+    return queryset.order_by('-match_count', '-id')
+
+
+def _facet(queryset, kind, field):
+    return (
+        queryset
+        .annotate(facet=Value(kind), key=Cast(field, CharField()))
+        .values('facet', 'key')
+        .annotate(total=Count('*'))
+        .values_list('facet', 'key', 'total')
+        .order_by()
+    )
+
+
+def facets_query(filters):
+    """Один запрос: (вид фасета, значение, число профилей) для skill, faculty и education_level."""
+    found = _filtered(filters, TalentProfile.objects.all())
+    if filters.get('skills'):
+        found = found.filter(pk__in=_skill_matches(filters))
+    found_ids = found.values('pk')
+    profiles = TalentProfile.objects.filter(pk__in=found_ids)
+    skills = TalentProfile.skills.through.objects.filter(talentprofile_id__in=found_ids)
+    return _facet(skills, 'skill', 'skill_id').union(
+        _facet(profiles, 'faculty', 'faculty_id'),
+        _facet(profiles, 'education_level', 'education_level'),
+        all=True,
+    )
+
+
+def group_facets(rows):
+    facets = {'skills': {}, 'faculties': {}, 'education_levels': {}}
+    names = {'skill': 'skills', 'faculty': 'faculties', 'education_level': 'education_levels'}
+    for kind, key, total in rows:
+        if key is not None:
+            facets[names[kind]][key] = total
+    return facets
@@ -8,7 +8,7 @@ class APITestCase(TestCase):
         self.user_data = {
             'username': 'testuser',
             'email': 'test@example.com',
-            'password': 'test123'
+            'password': 'Sup3r-secret!'
         }
 
     def test_register_user(self):
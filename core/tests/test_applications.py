@@ -0,0 +1,212 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Application, Event, Faculty, OrganizerProfile, Skill, TalentProfile, UserActivityStats
+
+
+class ApplicationInboxTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        self.faculty = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК')
+        self.skill = Skill.objects.create(name='Python')
+        self.events = []
+        for i in range(2):
+            event = Event.objects.create(
+                organizer=self.organizer,
+                title=f'Event {i}',
+                description='Description',
+                location='Астрахань',
+                status='published',
+                date=date(2030, 6, 1),
+            )
+            event.required_skills.set([self.skill])
+            self.events.append(event)
+
+        refresh = RefreshToken.for_user(self.organizer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _create_applicants(self, start, count):
+        for i in range(start, start + count):
+            user = User.objects.create_user(username=f'talent{i}', password='testpass')
+            profile = TalentProfile.objects.create(user=user, faculty=self.faculty)
+            profile.skills.set([self.skill])
+            Application.objects.create(user=user, event=self.events[i % 2])
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_inbox_side_loads_events(self):
+        self._create_applicants(0, 4)
+        _, response = self._get('/api/applications/inbox/')
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(set(response.data['events']), {str(e.id) for e in self.events})
+
+        row = response.data['results'][0]
+        self.assertIn(row['event'], [e.id for e in self.events])
+        self.assertEqual(row['talent_profile']['faculty']['id'], self.faculty.id)
+        self.assertEqual(row['talent_profile']['skills'][0]['name'], 'Python')
+
+    # Число запросов не растёт вместе с количеством заявок на странице
+    def test_inbox_and_list_query_count_is_flat(self):
+        self._create_applicants(0, 2)
+        inbox_small, _ = self._get('/api/applications/inbox/')
+        list_small, _ = self._get('/api/applications/')
+        self._create_applicants(2, 8)
+        inbox_large, _ = self._get('/api/applications/inbox/')
+        list_large, _ = self._get('/api/applications/')
+        self.assertEqual(inbox_small, inbox_large)
+        self.assertEqual(list_small, list_large)
+
+
+class ApplicationSubmitTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        self.event = Event.objects.create(
+            organizer=organizer,
+            title='Event',
+            description='Description',
+            location='Астрахань',
+            status='published',
+            date=date(2030, 6, 1),
+        )
+        self.user = User.objects.create_user(username='talent', password='testpass')
+        TalentProfile.objects.create(user=self.user)
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    # Повторная заявка отклоняется уникальным ограничением
+    def test_duplicate_application_rejected(self):
+        response = self.client.post('/api/apply/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.post('/api/apply/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/applications/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Application.objects.filter(user=self.user, event=self.event).count(), 1)
+
+    def test_compact_response(self):
+        response = self.client.post('/api/applications/', {'event_id': self.event.id, 'message': 'Хочу участвовать'},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data), {'id', 'event', 'status', 'created_at', 'message'})
+        self.assertEqual(response.data['message'], 'Хочу участвовать')
+
+    def test_faculty_restriction(self):
+        allowed, other = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК'), Faculty.objects.create(name='ФМИ', short_name='ФМИ')
+        self.event.faculty_restriction = True
+        self.event.save()
+        self.event.faculties.set([allowed])
+
+        TalentProfile.objects.filter(user=self.user).update(faculty=other)
+        response = self.client.post('/api/apply/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post('/api/applications/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        TalentProfile.objects.filter(user=self.user).update(faculty=allowed)
+        # Мероприятие, профиль и факультет проверяются одним запросом перед вставкой
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/apply/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 201)
+        selects = [q['sql'] for q in ctx.captured_queries if 'FROM "core_event"' in q['sql']]
+        self.assertEqual(len(selects), 1)
+
+    def test_missing_event_and_profile(self):
+        response = self.client.post('/api/apply/', {'event_id': 999}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/apply/', {'event_id': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        TalentProfile.objects.filter(user=self.user).delete()
+        response = self.client.post('/api/apply/', {'event_id': self.event.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Application.objects.exists())
+
+
+class ApplicationBulkStatusTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        other = User.objects.create_user(username='other', password='testpass')
+        self.event = Event.objects.create(
+            organizer=self.organizer, title='Event', description='Description',
+            location='Астрахань', status='published', date=date(2030, 6, 1),
+        )
+        self.foreign_event = Event.objects.create(
+            organizer=other, title='Foreign', description='Description',
+            location='Астрахань', status='published', date=date(2030, 6, 1),
+        )
+        self.talents = [User.objects.create_user(username=f'talent{i}', password='testpass') for i in range(3)]
+        refresh = RefreshToken.for_user(self.organizer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _post(self, items):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/applications/bulk_status/', {'items': items}, format='json')
+        return response, len(ctx.captured_queries)
+
+    def test_updates_only_own_applications(self):
+        own = Application.objects.create(user=self.talents[0], event=self.event)
+        foreign = Application.objects.create(user=self.talents[1], event=self.foreign_event)
+
+        response, _ = self._post([
+            {'id': own.id, 'status': 'approved', 'comment': 'Ждём'},
+            {'id': foreign.id, 'status': 'approved'},
+            {'id': 999999, 'status': 'rejected'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['results'], [
+            {'id': own.id, 'status': 'approved'},
+            {'id': foreign.id, 'error': 'Заявка не найдена'},
+            {'id': 999999, 'error': 'Заявка не найдена'},
+        ])
+        own.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((own.status, own.organizer_comment), ('approved', 'Ждём'))
+        self.assertEqual(foreign.status, 'pending')
+
+    def test_stats_follow_status_changes(self):
+        applications = [Application.objects.create(user=user, event=self.event) for user in self.talents]
+        applications[2].status = 'approved'
+        applications[2].save()
+
+        response, _ = self._post([
+            {'id': applications[0].id, 'status': 'approved'},
+            {'id': applications[1].id, 'status': 'rejected'},
+            {'id': applications[2].id, 'status': 'pending'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        approved = dict(UserActivityStats.objects.values_list('user_id', 'approved_applications'))
+        self.assertEqual(approved, {self.talents[0].id: 1, self.talents[1].id: 0, self.talents[2].id: 0})
+
+    def test_validation(self):
+        application = Application.objects.create(user=self.talents[0], event=self.event)
+        response, _ = self._post([{'id': application.id, 'status': 'approved'}] * 2)
+        self.assertEqual(response.status_code, 400)
+        response, _ = self._post([{'id': application.id, 'status': 'unknown'}])
+        self.assertEqual(response.status_code, 400)
+        response, _ = self._post([])
+        self.assertEqual(response.status_code, 400)
+        application.refresh_from_db()
+        self.assertEqual(application.status, 'pending')
+
+    # Число запросов не зависит от количества заявок в запросе
+    def test_query_count_is_flat(self):
+        talents = self.talents + [User.objects.create_user(username=f'extra{i}', password='testpass') for i in range(7)]
+        applications = [Application.objects.create(user=user, event=self.event) for user in talents]
+        _, small = self._post([{'id': a.id, 'status': 'approved'} for a in applications[:2]])
+        _, large = self._post([{'id': a.id, 'status': 'approved'} for a in applications[2:]])
+        self.assertEqual(small, large)
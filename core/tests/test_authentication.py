@@ -0,0 +1,103 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from core.authentication import get_tokens_for_user
+from core.models import Faculty, OrganizerProfile, TalentProfile
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.faculty = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК')
+        self.talent = User.objects.create_user(username='talent', password='testpass')
+        self.profile = TalentProfile.objects.create(user=self.talent, faculty=self.faculty)
+
+    def _authorize(self, user):
+        refresh = get_tokens_for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        return refresh
+
+    def _user_queries(self, url, method='get'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url)
+        return response, [q['sql'] for q in ctx.captured_queries if 'FROM "auth_user"' in q['sql']]
+
+    def test_token_claims(self):
+        refresh = self._authorize(self.talent)
+        access = refresh.access_token
+        self.assertEqual(access['role'], 'talent')
+        self.assertEqual(access['talent_profile_id'], self.profile.id)
+        self.assertEqual(access['faculty_id'], self.faculty.id)
+        self.assertIsNone(access['organizer_profile_id'])
+
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=organizer, organization_name='АГУ', contact_info='-')
+        self.assertEqual(get_tokens_for_user(organizer).access_token['role'], 'organizer')
+
+    def test_login_returns_claims_token(self):
+        response = self.client.post('/api/token/', {'username': 'talent', 'password': 'testpass'})
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response, user_queries = self._user_queries('/api/faculty/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_queries, [])
+
+    # GET-запросы с актуальными claims не читают таблицу пользователей
+    def test_safe_requests_skip_user_lookup(self):
+        self._authorize(self.talent)
+        for url in ('/api/faculty/stats/', '/api/user/activity/stats/', '/api/recommendations/',
+                    '/api/applications/', '/api/events/'):
+            response, user_queries = self._user_queries(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(user_queries, [], url)
+
+    @override_settings(AUTH_CLAIMS_SHORTCUTS=False)
+    def test_shortcuts_can_be_disabled(self):
+        self._authorize(self.talent)
+        response, user_queries = self._user_queries('/api/faculty/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(user_queries)
+
+    # После смены факультета старый токен перестаёт доверять claims
+    def test_changed_profile_falls_back_to_database(self):
+        self._authorize(self.talent)
+        other = Faculty.objects.create(name='ИФ', short_name='ИФ')
+        self.profile.faculty = other
+        self.profile.save()
+
+        response, user_queries = self._user_queries('/api/faculty/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(user_queries)
+        self.assertEqual(response.data['faculty']['id'], other.id)
+
+        # Новый токен снова работает без запроса пользователя
+        self._authorize(self.talent)
+        response, user_queries = self._user_queries('/api/faculty/stats/')
+        self.assertEqual(response.data['faculty']['id'], other.id)
+        self.assertEqual(user_queries, [])
+
+    def test_refresh_updates_claims(self):
+        refresh = self._authorize(self.talent)
+        self.profile.delete()
+        response = self.client.post('/api/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response, _ = self._user_queries('/api/user/activity/stats/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_skill_writes_follow_role(self):
+        self._authorize(self.talent)
+        self.assertEqual(self.client.post('/api/skills/', {'name': 'Rust'}).status_code, 403)
+
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=organizer, organization_name='АГУ', contact_info='-')
+        self._authorize(organizer)
+        self.assertEqual(self.client.post('/api/skills/', {'name': 'Rust'}).status_code, 201)
+
+        self.client.credentials()
+        self.assertEqual(self.client.post('/api/skills/', {'name': 'Go'}).status_code, 401)
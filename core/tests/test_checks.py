@@ -0,0 +1,24 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import require_shared_cache
+
+LOCAL = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+REDIS = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://redis:6379/1'}}
+
+
+# Несколько воркеров с локальным кэшем — каждый видел бы свои версии и флаги
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_workers_require_shared_cache(self):
+        with override_settings(CACHES=LOCAL):
+            require_shared_cache(1)
+            with self.assertRaisesMessage(ImproperlyConfigured, 'claims'):
+                require_shared_cache(4)
+            with override_settings(AUTH_CLAIMS_SHORTCUTS=False):
+                with self.assertRaisesMessage(ImproperlyConfigured, 'ETag'):
+                    require_shared_cache(4)
+            with override_settings(DATABASE_REPLICAS=['replica_1']):
+                with self.assertRaisesMessage(ImproperlyConfigured, 'реплик'):
+                    require_shared_cache(4)
+        with override_settings(CACHES=REDIS):
+            require_shared_cache(4)
@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import OrganizerProfile, TalentProfile
+
+
+class CleanupMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        talent = User.objects.create_user(username='talent', password='testpass')
+        TalentProfile.objects.create(user=talent, avatar='avatars/talent.jpg')
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=organizer, organization_name='АГУ', contact_info='-',
+                                        avatar='avatars/organizer.png')
+
+        old = time.time() - 7200
+        for name in ('avatars/talent.jpg', 'avatars/organizer.png',
+                     'variants/avatars/talent.jpg__thumb.webp', 'events/orphan.jpg',
+                     'variants/events/orphan.jpg__card.jpg'):
+            self._touch(name, mtime=old)
+        self._touch('events/uploading.jpg')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _touch(self, name, mtime=None):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'data')
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command('cleanup_media', '--json', '--batch-size=2', *args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_dry_run_keeps_files(self):
+        summary = self._run('--dry-run')
+        self.assertEqual(summary['deleted'], 2)
+        self.assertTrue(self._exists('events/orphan.jpg'))
+
+    # Удаляются только неиспользуемые старые файлы; аватары организаторов и варианты живых файлов остаются
+    def test_removes_only_unreferenced_old_files(self):
+        summary = self._run('--workers=2')
+        self.assertEqual(summary['deleted'], 2)
+        self.assertEqual(summary['skipped_recent'], 1)
+        self.assertFalse(self._exists('events/orphan.jpg'))
+        self.assertFalse(self._exists('variants/events/orphan.jpg__card.jpg'))
+        self.assertTrue(self._exists('avatars/organizer.png'))
+        self.assertTrue(self._exists('avatars/talent.jpg'))
+        self.assertTrue(self._exists('variants/avatars/talent.jpg__thumb.webp'))
+        self.assertTrue(self._exists('events/uploading.jpg'))
@@ -0,0 +1,52 @@
+import os
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient, APITestCase
+
+from talent_system.settings import database_from_url
+
+
+class DatabaseUrlTests(SimpleTestCase):
+    def test_postgres_with_pool(self):
+        with mock.patch.dict(os.environ, {'DB_POOL': '1', 'DB_POOL_MAX_SIZE': '20', 'DB_POOL_TIMEOUT': '2.5'}):
+            database = database_from_url('postgres://app:p%40ss@db:5433/talent_system?sslmode=require')
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(
+            (database['NAME'], database['USER'], database['PASSWORD'], database['HOST'], database['PORT']),
+            ('talent_system', 'app', 'p@ss', 'db', '5433'),
+        )
+        self.assertEqual(database['OPTIONS']['sslmode'], 'require')
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 20)
+        self.assertEqual(database['OPTIONS']['pool']['timeout'], 2.5)
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_persistent_connections_without_pool(self):
+        with mock.patch.dict(os.environ, {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '120'}):
+            database = database_from_url('postgresql://postgres@localhost/talent_system')
+        self.assertNotIn('pool', database['OPTIONS'])
+        self.assertEqual(database['CONN_MAX_AGE'], 120)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_sqlite_and_unknown_scheme(self):
+        self.assertEqual(database_from_url('sqlite:////tmp/app.db')['NAME'], '/tmp/app.db')
+        self.assertEqual(database_from_url('sqlite:///app.db')['NAME'], 'app.db')
+        with self.assertRaises(ValueError):
+            database_from_url('mysql://localhost/app')
+
+
+class DatabasePoolStatsViewTests(APITestCase):
+    def test_staff_only(self):
+        client = APIClient()
+        user = User.objects.create_user(username='user', password='testpass')
+        client.force_authenticate(user)
+        self.assertEqual(client.get('/api/metrics/db-pool/').status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        response = client.get('/api/metrics/db-pool/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['databases'][0]['alias'], 'default')
+        self.assertIn('pooled', response.data['databases'][0])
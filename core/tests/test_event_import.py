@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Event, EventSkillIndex, Faculty, OrganizerProfile, Skill
+
+CSV = '''title,description,date,location,status,faculty_restriction,skills,faculties
+Хакатон,Описание,2031-03-01,Астрахань,published,true,python; Новый навык,фцтк
+Форум,Описание,2020-01-01,Астрахань,,,,
+Олимпиада,Описание,2031-04-01,Астрахань,,true,Python,Неизвестный
+'''
+
+
+def _event(title, **extra):
+    return {'title': title, 'description': 'Описание', 'date': '2031-01-01', 'location': 'Астрахань', **extra}
+
+
+class EventImportTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        self.python = Skill.objects.create(name='Python')
+        self.faculty = Faculty.objects.create(name='Факультет цифровых технологий', short_name='ФЦТК')
+        refresh = RefreshToken.for_user(self.organizer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _import(self, events):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/events/import/', {'events': events}, format='json')
+        return response, len(ctx.captured_queries)
+
+    def test_json_import_with_row_errors(self):
+        response, _ = self._import([
+            _event('Хакатон', status='published', skills=['PYTHON', 'Робототехника'], faculties=['фцтк']),
+            _event('Без даты', date=''),
+            _event('Закрытое', faculty_restriction=True),
+            'не объект',
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['created_skills'], ['Робототехника'])
+        self.assertEqual([row['row'] for row in response.data['results']], [1, 2, 3, 4])
+        self.assertIn('date', response.data['results'][1]['errors'])
+        self.assertIn('faculties', response.data['results'][2]['errors'])
+
+        event = Event.objects.get(pk=response.data['results'][0]['id'])
+        self.assertEqual(event.organizer, self.organizer)
+        self.assertEqual({skill.name for skill in event.required_skills.all()}, {'Python', 'Робототехника'})
+        self.assertEqual(list(event.faculties.all()), [self.faculty])
+        # Индекс рекомендаций заполнен без m2m-сигналов
+        self.assertEqual(
+            set(EventSkillIndex.objects.filter(event=event).values_list('skill_id', 'event_status')),
+            {(skill.pk, 'published') for skill in event.required_skills.all()},
+        )
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile('events.csv', CSV.encode('utf-8-sig'), content_type='text/csv')
+        response = self.client.post('/api/events/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        results = response.data['results']
+        self.assertEqual(response.data['created'], 1)
+        self.assertIn('id', results[0])
+        self.assertIn('date', results[1]['errors'])
+        self.assertIn('faculties', results[2]['errors'])
+        event = Event.objects.get(pk=results[0]['id'])
+        self.assertTrue(event.faculty_restriction)
+        self.assertEqual(event.required_skills.count(), 2)
+
+    # Число запросов не зависит от числа мероприятий в пакете
+    def test_query_count_is_flat(self):
+        _, small = self._import([_event(f'Событие {i}', skills=['Python', f'Навык {i}']) for i in range(2)])
+        _, large = self._import([_event(f'Событие {i}', skills=['Python', f'Навык {i}']) for i in range(2, 30)])
+        self.assertEqual(small, large)
+        self.assertEqual(Event.objects.count(), 30)
+
+    def test_talent_forbidden(self):
+        talent = User.objects.create_user(username='talent', password='testpass')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(talent).access_token}')
+        response, _ = self._import([_event('Хакатон')])
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Event.objects.exists())
+
+    def test_invalid_payload(self):
+        response = self.client.post('/api/events/import/', {'events': 'нет'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_malformed_csv(self):
+        # Перевод строки \r внутри поля без кавычек
+        content = CSV.replace('Форум', 'Фо\rрум').encode('utf-8')
+        upload = SimpleUploadedFile('events.csv', content, content_type='text/csv')
+        response = self.client.post('/api/events/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('строка 2', response.data['message'])
+        self.assertFalse(Event.objects.exists())
+
+    # Навык создан параллельным импортом в другом регистре — вставка пропущена как конфликт
+    def test_skill_created_concurrently_in_other_case(self):
+        def create_elsewhere(objs, **kwargs):
+            Skill.objects.create(name='РОБОТОТЕХНИКА')
+            return []
+
+        with mock.patch.object(Skill.objects, 'bulk_create', side_effect=create_elsewhere):
+            response, _ = self._import([_event('Хакатон', skills=['Робототехника'])])
+        self.assertEqual(response.status_code, 201)
+        event = Event.objects.get(pk=response.data['results'][0]['id'])
+        self.assertEqual([skill.name for skill in event.required_skills.all()], ['РОБОТОТЕХНИКА'])
+
+
+class ImportEventsCommandTests(TestCase):
+    def test_command(self):
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=organizer, organization_name='АГУ', contact_info='-')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.json')
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump([_event('Хакатон', skills=['Python']), _event('')], file, ensure_ascii=False)
+            out = StringIO()
+            call_command('import_events', path, '--organizer=organizer', stdout=out)
+        self.assertIn('Создано мероприятий: 1, строк с ошибками: 1', out.getvalue())
+        self.assertEqual(Event.objects.get().required_skills.get().name, 'Python')
@@ -0,0 +1,170 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Application, Event, Faculty, OrganizerProfile, Skill, TalentProfile
+
+
+class EventListQueryTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        self.user = User.objects.create_user(username='talent', password='testpass')
+        TalentProfile.objects.create(user=self.user)
+        self.skills = [Skill.objects.create(name=f'Skill {i}') for i in range(3)]
+        self.faculty = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК')
+
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _create_events(self, count):
+        for i in range(count):
+            event = Event.objects.create(
+                organizer=self.organizer,
+                title=f'Event {i}',
+                description='Description',
+                location='Астрахань',
+                status='published',
+                date=date(2030, 6, 1),
+            )
+            event.required_skills.set(self.skills)
+            event.faculties.set([self.faculty])
+            Application.objects.create(user=self.user, event=event, status='approved')
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    # Число запросов не зависит от размера страницы
+    def test_queries_do_not_grow_with_page(self):
+        self._create_events(1)
+        small, _ = self._count_queries()
+        self._create_events(9)
+        large, response = self._count_queries()
+        self.assertEqual(small, large)
+
+        row = response.data['results'][0]
+        self.assertEqual(row['applications_count'], 1)
+        self.assertEqual(row['organization_name'], 'АГУ')
+        self.assertEqual(row['user_application_status'], 'approved')
+        self.assertEqual(len(row['required_skills']), 3)
+        self.assertEqual(row['faculties'][0]['id'], self.faculty.id)
+
+    # Курсорная пагинация проходит все мероприятия без пропусков и повторов
+    def test_cursor_pagination_walks_all_events(self):
+        self._create_events(7)
+        url = '/api/events/?pagination=cursor&page_size=3'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, list(Event.objects.order_by('-date', '-id').values_list('id', flat=True)))
+
+    # Первое поле сортировки ограничено и само по себе — иначе индекс не используется как диапазон
+    def test_cursor_condition_has_leading_bound(self):
+        self._create_events(3)
+        cursor = self.client.get('/api/events/?pagination=cursor&page_size=1').data['next']
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(cursor)
+        page_sql = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT "core_event"'))
+        self.assertIn('"core_event"."date" <=', page_sql)
+
+    def test_cursor_pagination_count_on_request(self):
+        self._create_events(2)
+        response = self.client.get('/api/events/?pagination=cursor&with_count=1')
+        self.assertEqual(response.data['count'], 2)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/events/?cursor=broken')
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_rejects_cursor(self):
+        response = self.client.get('/api/events/?search=Event&pagination=cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('search', response.data['errors'])
+
+
+class EventSearchTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=organizer, organization_name='Студсовет', contact_info='-')
+        self.hackathon = Event.objects.create(
+            organizer=organizer, title='Хакатон', description='Командная разработка',
+            location='Астрахань', status='published', date=date(2030, 6, 1),
+        )
+        self.concert = Event.objects.create(
+            organizer=organizer, title='Концерт', description='Хакатон закрытия сезона',
+            location='Актовый зал', status='draft', date=date(2030, 7, 1),
+        )
+        refresh = RefreshToken.for_user(organizer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    # Совпадение в заголовке ранжируется выше совпадения в описании
+    def test_search_ranks_title_first(self):
+        response = self.client.get('/api/events/?search=Хакатон')
+        self.assertEqual([e['id'] for e in response.data['results']], [self.hackathon.id, self.concert.id])
+
+    def test_search_composes_with_filters(self):
+        response = self.client.get('/api/events/?search=Студсовет&status=draft')
+        self.assertEqual([e['id'] for e in response.data['results']], [self.concert.id])
+
+
+class AsyncEventViewTests(TransactionTestCase):
+    """Список мероприятий и статистика обслуживаются async-обработчиками (ASGI)."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        self.skill = Skill.objects.create(name='Python')
+        for i in range(3):
+            event = Event.objects.create(
+                organizer=self.organizer, title=f'Event {i}', description='Description',
+                location='Астрахань', status='published', date=date(2030, 6, 1),
+            )
+            event.required_skills.set([self.skill])
+        token = RefreshToken.for_user(self.organizer).access_token
+        self.auth = {'Authorization': f'Bearer {token}'}
+        self.client = AsyncClient()
+
+    async def test_list_pages(self):
+        response = await self.client.get('/api/events/?page_size=2', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 3)
+
+        response = await self.client.get('/api/events/?page=99', headers=self.auth)
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.client.get('/api/events/?pagination=cursor&with_count=1', headers=self.auth)
+        self.assertEqual(response.json()['count'], 3)
+
+    # Синхронные действия того же ViewSet продолжают работать
+    async def test_sync_actions_on_async_viewset(self):
+        response = await self.client.post('/api/events/', {
+            'title': 'New', 'description': 'Description', 'location': 'Астрахань',
+            'date': '2030-07-01', 'required_skill_ids': [self.skill.id],
+        }, content_type='application/json', headers=self.auth)
+        self.assertEqual(response.status_code, 201)
+        response = await self.client.get(f"/api/events/{response.json()['id']}/", headers=self.auth)
+        self.assertEqual(response.json()['title'], 'New')
+
+    async def test_stats_and_recommendations(self):
+        for url in ('/api/faculty/stats/', '/api/recommendations/'):
+            response = await self.client.get(url, headers=self.auth)
+            self.assertEqual(response.status_code, 200, url)
+        response = await self.client.get('/api/user/activity/stats/', headers=self.auth)
+        self.assertEqual(response.status_code, 403)
+
+        response = await AsyncClient().get('/api/events/')
+        self.assertEqual(response.status_code, 401)
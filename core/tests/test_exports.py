@@ -0,0 +1,135 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from xml.etree import ElementTree
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from docx import Document
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.exports import _async_chunks
+from core.models import Application, Event, Faculty, OrganizerProfile, Skill, TalentProfile
+
+SHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+class ApplicantExportTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        self.event = Event.objects.create(
+            organizer=self.organizer, title='Хакатон', description='Описание',
+            location='Астрахань', status='published', date=date(2030, 6, 1),
+        )
+        self.faculty = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК')
+        self.skills = [Skill.objects.create(name=name) for name in ('Python', 'Django')]
+        self.url = f'/api/events/{self.event.id}/applicants/export/'
+        refresh = RefreshToken.for_user(self.organizer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _create_applicants(self, start, count):
+        for i in range(start, start + count):
+            user = User.objects.create_user(username=f'talent{i}', password='testpass', first_name='Иван')
+            profile = TalentProfile.objects.create(user=user, faculty=self.faculty, education_level='master', course=2)
+            profile.skills.set(self.skills)
+            Application.objects.create(user=user, event=self.event, message='Хочу <участвовать> & всё')
+
+    def _export(self, file_type):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'{self.url}?type={file_type}')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            content = b''.join(response.streaming_content)
+        return content, len(ctx.captured_queries)
+
+    def test_csv(self):
+        self._create_applicants(0, 3)
+        content, _ = self._export('csv')
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0][0], 'ID заявки')
+        header = rows[0]
+        row = dict(zip(header, rows[1]))
+        self.assertEqual(row['Навыки'], 'Django, Python')
+        self.assertEqual(row['Факультет'], 'ФЦТК')
+        self.assertEqual(row['Уровень образования'], 'Магистратура')
+        self.assertEqual(row['Статус'], 'На рассмотрении')
+
+    # Пользовательский текст не должен выполняться как формула в Excel
+    def test_csv_escapes_formulas(self):
+        self._create_applicants(0, 1)
+        Application.objects.update(message='=HYPERLINK("http://evil","x")', organizer_comment='-1+2')
+        User.objects.filter(username='talent0').update(first_name='@SUM(A1)', last_name='\tТаб')
+        content, _ = self._export('csv')
+        header, values = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+        cells = set(values)
+        for text in ('=HYPERLINK("http://evil","x")', '-1+2', '@SUM(A1)', '\tТаб'):
+            self.assertIn("'" + text, cells)
+        self.assertIn('2', cells)  # числа и обычный текст не меняются
+
+    def test_xlsx(self):
+        self._create_applicants(0, 3)
+        content, _ = self._export('xlsx')
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall(f'{SHEET_NS}sheetData/{SHEET_NS}row')
+        self.assertEqual(len(rows), 4)
+        texts = [t.text for t in rows[1].iter(f'{SHEET_NS}t')]
+        self.assertIn('Хочу <участвовать> & всё', texts)
+
+    def test_docx(self):
+        self._create_applicants(0, 3)
+        content, _ = self._export('docx')
+        document = Document(io.BytesIO(content))
+        table = document.tables[0]
+        self.assertEqual(len(table.rows), 4)
+        self.assertEqual(table.rows[0].cells[0].text, 'ID заявки')
+        self.assertIn('Django, Python', [cell.text for cell in table.rows[1].cells])
+
+    # Число запросов не зависит от числа заявителей
+    def test_query_count_is_flat(self):
+        self._create_applicants(0, 2)
+        _, small = self._export('csv')
+        self._create_applicants(2, 10)
+        _, large = self._export('csv')
+        self.assertEqual(small, large)
+
+    def test_only_own_events(self):
+        other = User.objects.create_user(username='other', password='testpass')
+        refresh = RefreshToken.for_user(other)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_unknown_type(self):
+        response = self.client.get(f'{self.url}?type=pdf')
+        self.assertEqual(response.status_code, 400)
+
+    # Под ASGI порции читаются по одной; генератор закрывается и при обрыве соединения
+    def test_async_chunks(self):
+        closed = []
+
+        def chunks():
+            try:
+                yield from (b'a', b'b', b'c')
+            finally:
+                closed.append(True)
+
+        async def first_two():
+            result = []
+            stream = _async_chunks(chunks())
+            async for chunk in stream:
+                result.append(chunk)
+                if len(result) == 2:
+                    break
+            await stream.aclose()
+            return result
+
+        self.assertEqual(async_to_sync(first_two)(), [b'a', b'b'])
+        self.assertEqual(closed, [True])
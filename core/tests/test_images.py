@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image, ImageSequence
+from rest_framework.test import APIClient
+
+from core.images import VARIANTS, process_image, strip_metadata, variant_name, variant_urls
+from core.authentication import get_tokens_for_user
+from core.models import OrganizerProfile, TalentProfile
+
+
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _jpeg(self, size=(2000, 1000), orientation=None):
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera'  # Make
+        exif[0x8825] = {0x0001: 'N', 0x0002: (46.0, 21.0, 0.0)}  # GPSInfo
+        if orientation:
+            exif[0x0112] = orientation
+        buffer = BytesIO()
+        Image.new('RGB', size, (200, 30, 30)).save(buffer, 'JPEG', exif=exif)
+        return buffer.getvalue()
+
+    def _upload(self, name, size=(2000, 1000)):
+        return default_storage.save(name, SimpleUploadedFile(name, self._jpeg(size)))
+
+    def test_variants_are_resized_without_exif(self):
+        name = self._upload('events/photo.jpg')
+        self.assertEqual(process_image(name), len(VARIANTS) * 2)
+
+        for variant, (max_w, max_h) in VARIANTS.items():
+            for fmt in ('webp', 'jpeg'):
+                with default_storage.open(variant_name(name, variant, fmt)) as f:
+                    image = Image.open(f)
+                    self.assertLessEqual(image.width, max_w)
+                    self.assertLessEqual(image.height, max_h)
+                    self.assertEqual(len(image.getexif()), 0)
+
+        # Повторный запуск ничего не перезаписывает, с force — перезаписывает всё
+        self.assertEqual(process_image(name), 0)
+        self.assertEqual(process_image(name, force=True), len(VARIANTS) * 2)
+
+    def test_variant_urls(self):
+        self.assertIsNone(variant_urls(TalentProfile().avatar))
+        user = User.objects.create_user(username='talent', password='testpass')
+        profile = TalentProfile.objects.create(user=user, avatar=self._upload('avatars/me.jpg'))
+        # Варианты ещё не созданы фоновой задачей
+        self.assertIsNone(variant_urls(profile.avatar))
+
+        self.assertEqual(process_image(profile.avatar.name), len(VARIANTS) * 2)
+        profile.refresh_from_db()
+        with mock.patch.object(default_storage, 'exists') as exists:
+            urls = variant_urls(profile.avatar)
+        exists.assert_not_called()
+        self.assertEqual(urls['thumb']['webp'], '/media/variants/avatars/me.jpg__thumb.webp')
+        self.assertEqual(urls['card']['jpeg'], '/media/variants/avatars/me.jpg__card.jpg')
+
+        # Правка других полей готовность не сбрасывает, замена файла — сбрасывает
+        profile.bio = 'О себе'
+        profile.save()
+        self.assertTrue(TalentProfile.objects.get(pk=profile.pk).avatar_variants_ready)
+        profile.avatar = self._upload('avatars/new.jpg')
+        profile.save()
+        self.assertIsNone(variant_urls(TalentProfile.objects.get(pk=profile.pk).avatar))
+
+    def test_strip_metadata(self):
+        # Ориентация 6 — снимок повёрнут на 90°: после удаления EXIF поворот применён к пикселям
+        upload = strip_metadata(SimpleUploadedFile('photo.jpg', self._jpeg((40, 20), orientation=6)))
+        self.assertEqual(upload.name, 'photo.jpg')
+        image = Image.open(upload)
+        self.assertEqual(image.format, 'JPEG')
+        self.assertEqual(image.size, (20, 40))
+        self.assertEqual(len(image.getexif()), 0)
+
+        buffer = BytesIO()
+        Image.new('RGB', (10, 10)).save(buffer, 'PNG')
+        clean = SimpleUploadedFile('clean.png', buffer.getvalue())
+        self.assertIs(strip_metadata(clean), clean)
+
+    def test_strip_metadata_multi_frame(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation
+        frames = [Image.new('RGB', (40, 20), color) for color in ((200, 30, 30), (30, 200, 30))]
+
+        # MPO камеры телефона: остаётся основной кадр, повёрнутый по EXIF
+        buffer = BytesIO()
+        frames[0].save(buffer, 'MPO', save_all=True, append_images=frames[1:], exif=exif)
+        image = Image.open(strip_metadata(SimpleUploadedFile('photo.jpg', buffer.getvalue())))
+        self.assertEqual((image.format, image.size, len(image.getexif())), ('JPEG', (20, 40), 0))
+
+        # Анимация: поворот применяется к каждому кадру
+        buffer = BytesIO()
+        frames[0].save(buffer, 'WEBP', save_all=True, append_images=frames[1:], exif=exif, lossless=True)
+        image = Image.open(strip_metadata(SimpleUploadedFile('anim.webp', buffer.getvalue())))
+        self.assertEqual((image.n_frames, len(image.getexif())), (2, 0))
+        for frame in ImageSequence.Iterator(image):
+            self.assertEqual(frame.size, (20, 40))
+
+    def test_uploaded_original_has_no_exif(self):
+        user = User.objects.create_user(username='organizer', password='testpass')
+        profile = OrganizerProfile.objects.create(user=user, organization_name='АГУ', contact_info='-')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(user).access_token}')
+
+        response = client.patch(f'/api/organizer/profiles/{profile.pk}/', {
+            'avatar': SimpleUploadedFile('me.jpg', self._jpeg((40, 20)), content_type='image/jpeg'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertIsNone(response.data['avatar_variants'])
+
+        profile.refresh_from_db()
+        with default_storage.open(profile.avatar.name) as f:
+            self.assertEqual(len(Image.open(f).getexif()), 0)
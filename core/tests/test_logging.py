@@ -0,0 +1,69 @@
+import json
+import logging
+from io import StringIO
+
+from django.test import SimpleTestCase, TestCase
+
+from core.log import QueueJsonHandler, SamplingFilter, request_id_var
+
+
+class QueueJsonHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.stream = StringIO()
+        self.handler = QueueJsonHandler(stream=self.stream)
+        self.logger = logging.getLogger('core.tests.logging')
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def _records(self):
+        self.handler.flush()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_json_with_request_id_and_extra(self):
+        token = request_id_var.set('req-1')
+        try:
+            self.logger.info('Заявка %s создана', 5, extra={'event_id': 7})
+        finally:
+            request_id_var.reset(token)
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.logger.exception('Ошибка')
+
+        created, failed = self._records()
+        self.assertEqual(created['message'], 'Заявка 5 создана')
+        self.assertEqual(created['level'], 'INFO')
+        self.assertEqual(created['logger'], 'core.tests.logging')
+        self.assertEqual(created['request_id'], 'req-1')
+        self.assertEqual(created['event_id'], 7)
+        self.assertNotIn('request_id', failed)
+        self.assertIn('ValueError: boom', failed['exception'])
+
+    def test_sampling_keeps_warnings(self):
+        self.handler.addFilter(SamplingFilter({'core.tests': 0}))
+        self.logger.info('отброшено')
+        self.logger.warning('сохранено')
+        self.assertEqual([r['message'] for r in self._records()], ['сохранено'])
+
+    def test_sampling_rate_prefix(self):
+        sampling = SamplingFilter({'core': 0.5, 'core.views': 0.1})
+        self.assertEqual(sampling.rate_for('core.views'), 0.1)
+        self.assertEqual(sampling.rate_for('core.viewsets'), 0.5)
+        self.assertEqual(sampling.rate_for('django.request'), 1.0)
+
+
+class RequestIdMiddlewareTests(TestCase):
+    def test_generates_and_echoes_request_id(self):
+        response = self.client.get('/api/skills/')
+        self.assertEqual(len(response['X-Request-ID']), 32)
+
+        response = self.client.get('/api/skills/', headers={'X-Request-ID': 'nginx-42'})
+        self.assertEqual(response['X-Request-ID'], 'nginx-42')
+
+        response = self.client.get('/api/skills/', headers={'X-Request-ID': 'bad id\n'})
+        self.assertNotEqual(response['X-Request-ID'], 'bad id\n')
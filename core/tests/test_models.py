@@ -1,23 +1,26 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
-from core.models import Event, TalentProfile, Application
+from core.models import Event, TalentProfile, Application, Skill
 from datetime import date 
 
 class ModelTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.python = Skill.objects.create(name='Python')
         self.event = Event.objects.create(
             organizer=self.user,
             title='Test Event',
             description='Test Description',
-            required_skills='Python',
+            location='Астрахань',
             date=date(2025, 6, 1) 
         )
-        self.profile = TalentProfile.objects.create(user=self.user, skills='Python')
+        self.event.required_skills.set([self.python])
+        self.profile = TalentProfile.objects.create(user=self.user)
+        self.profile.skills.set([self.python])
 
     def test_event_creation(self):
         self.assertEqual(self.event.title, 'Test Event')
-        self.assertEqual(self.event.required_skills, 'Python')
+        self.assertEqual(list(self.event.required_skills.values_list('name', flat=True)), ['Python'])
 
     def test_application_creation(self):
         application = Application.objects.create(user=self.user, event=self.event)
@@ -0,0 +1,171 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APITestCase
+
+from core import notifications
+from core.authentication import get_tokens_for_user
+from core.models import Event, EventNotification, Faculty, OrganizerProfile, Skill, TalentProfile
+
+
+def _talent(username, skills, faculty=None):
+    user = User.objects.create_user(username=username, password='testpass')
+    profile = TalentProfile.objects.create(user=user, faculty=faculty)
+    profile.skills.set(skills)
+    return user
+
+
+class FanOutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user(username='organizer', password='testpass')
+        cls.fctk = Faculty.objects.create(name='Факультет цифровых технологий', short_name='ФЦТК')
+        cls.law = Faculty.objects.create(name='Юридический институт', short_name='ЮИ')
+        cls.python, cls.django, cls.sql = (Skill.objects.create(name=name) for name in ('Python', 'Django', 'SQL'))
+        cls.both = _talent('both', [cls.python, cls.django], cls.fctk)
+        cls.one = _talent('one', [cls.python], cls.law)
+        cls.other = _talent('other', [cls.sql], cls.fctk)
+        cls.event = Event.objects.create(
+            organizer=cls.organizer, title='Хакатон', description='-', location='Астрахань',
+            date='2031-01-01', status='published',
+        )
+        cls.event.required_skills.set([cls.python, cls.django])
+
+    def _inbox(self, event):
+        return dict(EventNotification.objects.filter(event=event).values_list('user_id', 'match_count'))
+
+    def test_skill_overlap(self):
+        self.assertEqual(notifications.notify_event_published(self.event.pk), 2)
+        self.assertEqual(self._inbox(self.event), {self.both.pk: 2, self.one.pk: 1})
+
+    def test_faculty_restriction(self):
+        self.event.faculty_restriction = True
+        self.event.save()
+        self.event.faculties.set([self.fctk])
+        notifications.notify_event_published(self.event.pk)
+        self.assertEqual(self._inbox(self.event), {self.both.pk: 2})
+
+    def test_rerun_and_batches(self):
+        with mock.patch.object(notifications, 'BATCH_SIZE', 1):
+            self.assertEqual(notifications.notify_event_published(self.event.pk), 2)
+            # Дубли пропущены — новых уведомлений нет
+            self.assertEqual(notifications.notify_event_published(self.event.pk), 0)
+        self.assertEqual(EventNotification.objects.filter(event=self.event).count(), 2)
+
+    def test_sweep_resends_lost_fan_out(self):
+        # Задача рассылки потеряна при перезапуске воркера: мероприятие без отметки
+        self.assertQuerySetEqual(notifications.pending_events(), [self.event])
+        out = StringIO()
+        call_command('notify_published_events', stdout=out)
+        self.assertEqual(self._inbox(self.event), {self.both.pk: 2, self.one.pk: 1})
+        self.assertIsNotNone(Event.objects.get(pk=self.event.pk).notified_at)
+        self.assertFalse(notifications.pending_events().exists())
+
+    def test_unpublished_event_is_skipped(self):
+        Event.objects.filter(pk=self.event.pk).update(status='cancelled')
+        self.assertEqual(notifications.notify_event_published(self.event.pk), 0)
+        self.assertFalse(EventNotification.objects.exists())
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class PublicationTests(APITestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        self.python = Skill.objects.create(name='Python')
+        self.talent = _talent('talent', [self.python])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(self.organizer).access_token}')
+
+    def _create(self, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/events/', {
+                'title': 'Хакатон', 'description': '-', 'location': 'Астрахань', 'date': '2031-01-01',
+                'status': status, 'required_skill_ids': [self.python.pk],
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def test_create_published(self):
+        event_id = self._create('published')
+        self.assertTrue(EventNotification.objects.filter(user=self.talent, event_id=event_id).exists())
+
+    def test_publish_draft(self):
+        event_id = self._create('draft')
+        self.assertFalse(EventNotification.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.patch(f'/api/events/{event_id}/', {'status': 'published'}, format='json')
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(EventNotification.objects.filter(user=self.talent, event_id=event_id).exists())
+
+        # Правка уже опубликованного мероприятия рассылку не повторяет
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(f'/api/events/{event_id}/', {'title': 'Хакатон 2'}, format='json')
+        self.assertEqual(callbacks, [])
+
+        # Снятие с публикации и повторная публикация снова ждут завершения рассылки
+        self.client.patch(f'/api/events/{event_id}/', {'status': 'draft'}, format='json')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(f'/api/events/{event_id}/', {'status': 'published'}, format='json')
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(notifications.pending_events().filter(pk=event_id).exists())
+
+    def test_import_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/events/import/', {'events': [
+                {'title': 'Хакатон', 'description': '-', 'date': '2031-01-01', 'location': 'Астрахань',
+                 'status': 'published', 'skills': ['python']},
+                {'title': 'Черновик', 'description': '-', 'date': '2031-01-01', 'location': 'Астрахань',
+                 'skills': ['python']},
+            ]}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            list(EventNotification.objects.values_list('event_id', flat=True)),
+            [response.data['results'][0]['id']],
+        )
+
+
+class InboxTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        cls.talent = User.objects.create_user(username='talent', password='testpass')
+        stranger = User.objects.create_user(username='stranger', password='testpass')
+        cls.events = [
+            Event.objects.create(organizer=organizer, title=f'Мероприятие {i}', description='-',
+                                 location='Астрахань', date='2031-01-01', status='published')
+            for i in range(3)
+        ]
+        cls.notifications = [
+            EventNotification.objects.create(user=cls.talent, event=event, match_count=1) for event in cls.events
+        ]
+        EventNotification.objects.create(user=stranger, event=cls.events[0], match_count=1)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(self.talent).access_token}')
+
+    def _ids(self, query=''):
+        response = self.client.get(f'/api/notifications/{query}')
+        self.assertEqual(response.status_code, 200)
+        return [notification['id'] for notification in response.data['results']]
+
+    def test_feed_newest_first(self):
+        self.assertEqual(self._ids(), [notification.pk for notification in reversed(self.notifications)])
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(response.data['results'][0]['event']['title'], 'Мероприятие 2')
+
+    def test_mark_read(self):
+        first, second, third = self.notifications
+        response = self.client.post('/api/notifications/read/', {'ids': [first.pk]}, format='json')
+        self.assertEqual(response.data, {'updated': 1})
+        self.assertEqual(self._ids('?unread=1'), [third.pk, second.pk])
+
+        response = self.client.post('/api/notifications/read/', {}, format='json')
+        self.assertEqual(response.data, {'updated': 2})
+        self.assertEqual(self._ids('?unread=1'), [])
+        # Уведомление другого пользователя не тронуто
+        self.assertEqual(EventNotification.objects.filter(read_at__isnull=True).count(), 1)
@@ -0,0 +1,141 @@
+import json
+import os
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIClient, APITestCase
+
+from core import background, perf
+from core.log import request_id_var
+from core.models import Event, OrganizerProfile, Skill
+
+
+@override_settings(PERF_SERVER_TIMING=True, PERF_QUERY_COUNT_HEADER=True)
+class PerformanceMiddlewareTests(APITestCase):
+    def setUp(self):
+        perf.reset_all()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=self.organizer, organization_name='АГУ', contact_info='-')
+        for index in range(3):
+            event = Event.objects.create(
+                organizer=self.organizer, title=f'Событие {index}', description='Description',
+                location='Астрахань', status='published', date=date(2030, 6, 1),
+            )
+            event.required_skills.set([Skill.objects.get_or_create(name='Python')[0]])
+        self.talent = User.objects.create_user(username='talent', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.talent)
+
+    def tearDown(self):
+        perf.reset_all()
+
+    def test_headers(self):
+        response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn(f'desc="{response["X-Query-Count"]} queries"', timing)
+
+    @override_settings(PERF_SERVER_TIMING=False, PERF_QUERY_COUNT_HEADER=False)
+    def test_headers_disabled(self):
+        response = self.client.get('/api/skills/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('X-Query-Count', response)
+
+    def test_route_histograms(self):
+        for _ in range(3):
+            self.client.get('/api/events/')
+        self.client.get('/api/skills/')
+
+        self.assertEqual(self.client.get('/api/metrics/requests/').status_code, 403)
+        self.talent.is_staff = True
+        self.talent.save()
+        response = self.client.get('/api/metrics/requests/')
+        self.assertEqual(response.status_code, 200)
+
+        routes = {row['route']: row for row in response.data['routes']}
+        events = routes['GET event-list']
+        self.assertEqual(events['count'], 3)
+        self.assertGreater(events['avg_queries'], 0)
+        self.assertGreater(events['avg_bytes'], 0)
+        self.assertEqual(sum(events['buckets_ms'].values()), 3)
+        self.assertEqual(routes['GET skill-list']['count'], 1)
+
+    def test_perf_report_command(self):
+        self.client.get('/api/events/')
+        out = StringIO()
+        call_command('perf_report', '--json', '--reset', stdout=out)
+        rows = json.loads(out.getvalue().split('\nГистограммы')[0])
+        self.assertEqual(rows[0]['route'], 'GET event-list')
+        self.assertEqual(perf.collect(), {})
+
+
+class PublishedHistogramTests(SimpleTestCase):
+    def setUp(self):
+        perf.reset_all()
+        self.registry = perf.RouteHistograms()
+        self.metrics = perf.RequestMetrics()
+
+    def tearDown(self):
+        perf.reset_all()
+
+    def _publish_other_worker(self, pid, epoch):
+        registry = perf.RouteHistograms()
+        registry.record('GET skill-list', 5, self.metrics, 10)
+        cache.set(perf.WORKER_KEY.format(pid=pid), {'epoch': epoch, 'routes': registry.snapshot()})
+
+    def test_collect_prunes_finished_workers(self):
+        epoch = perf.current_epoch()
+        self._publish_other_worker(1, epoch)
+        # Воркер 2 перезапущен, его снимок истёк
+        cache.set(perf.WORKERS_KEY, [1, 2])
+        self.assertEqual(perf.collect()['GET skill-list']['count'], 1)
+        self.assertEqual(cache.get(perf.WORKERS_KEY), [1])
+
+    def test_worker_lost_from_list_registers_again(self):
+        self.registry.publish(force=True)
+        cache.set(perf.WORKERS_KEY, [1])
+        self.registry.publish(force=True)
+        self.assertEqual(cache.get(perf.WORKERS_KEY), [1, os.getpid()])
+
+    def test_reset_clears_live_workers(self):
+        self.registry.record('GET event-list', 5, self.metrics, 10)
+        self.registry.publish(force=True)
+        old_epoch = perf.current_epoch()
+        # reset_all из другого процесса: меняет эпоху, память этого воркера не трогает
+        cache.set(perf.EPOCH_KEY, 'new')
+        self._publish_other_worker(1, old_epoch)
+        cache.set(perf.WORKERS_KEY, [1])
+        self.assertEqual(perf.collect(), {})
+
+        self.registry.publish(force=True)
+        self.assertEqual(self.registry.snapshot(), {})
+        self.assertEqual(cache.get(perf.WORKER_KEY.format(pid=os.getpid())), {'epoch': 'new', 'routes': {}})
+
+
+class BackgroundContextTests(APITestCase):
+    # Запросы фоновой задачи не попадают в метрики запроса, который её поставил
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_tasks_do_not_inherit_request_metrics(self):
+        seen = {}
+
+        def task():
+            seen['request_id'] = request_id_var.get()
+            seen['metrics'] = perf._current.get()
+            list(User.objects.all())
+
+        metrics, token = perf.start_request()
+        request_token = request_id_var.set('req-1')
+        try:
+            background.submit(task)
+        finally:
+            request_id_var.reset(request_token)
+            perf.finish_request(token)
+        self.assertEqual(seen, {'request_id': 'req-1', 'metrics': None})
+        self.assertEqual(metrics.queries, 0)
@@ -0,0 +1,289 @@
+"""
+Бюджеты SQL-запросов для всех маршрутов core/urls.py.
+
+База заполняется объёмами, близкими к рабочим (сотни мероприятий, тысячи заявок,
+десятки навыков и факультетов). Для каждого вызова проверяется, что число запросов
+не превышает бюджет, а для списков — что оно не меняется с размером страницы:
+эндпоинт, который начал делать запрос на строку, падает здесь, а не в проде.
+
+Новый маршрут в core/urls.py без записи в CALLS валит test_every_route_has_budget.
+Бюджет меняется только вместе с объяснением в коммите, почему запросов стало больше.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import NamedTuple
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver
+from rest_framework.test import APIClient, APITestCase
+
+from core import urls
+from core.authentication import get_tokens_for_user
+from core.models import (Application, Event, EventNotification, EventSkillIndex, Faculty, OrganizerProfile,
+                         Skill, TalentProfile)
+from core.pagination import AsyncPageNumberPagination
+
+FACULTIES = 12
+SKILLS = 80
+ORGANIZERS = 6
+EVENTS = 300
+TALENTS = 200
+APPLICATIONS_PER_TALENT = 10
+
+SMALL_PAGE, LARGE_PAGE = 2, 50
+
+
+class Call(NamedTuple):
+    route: str
+    method: str
+    url: str
+    user: str = None
+    budget: int = 0
+    data: dict = None
+    # 'page' — PageNumberPagination, 'cursor' — ?pagination=cursor&page_size=...
+    paginated: str = None
+
+
+CALLS = [
+    Call('api-root', 'get', '/api/', 'talent', 0),
+    Call('register', 'post', '/api/register/', None, 11,
+         {'username': 'newtalent', 'email': 'new@example.com', 'password': 'Sup3r-secret!', 'skills': '{skills}'}),
+    Call('register-organizer', 'post', '/api/register/organizer/', None, 5,
+         {'username': 'neworg', 'email': 'org@example.com', 'password': 'Sup3r-secret!',
+          'organization_name': 'ООО', 'contact_info': '-'}),
+    Call('login', 'post', '/api/login/', None, 3, {'username': 'talent', 'password': 'testpass'}),
+
+    Call('talentprofile-list', 'get', '/api/profiles/', 'talent', 6),
+    Call('talentprofile-detail', 'get', '/api/profiles/{talent_profile}/', 'talent', 5),
+    Call('talentprofile-detail', 'patch', '/api/profiles/{talent_profile}/', 'talent', 16,
+         {'bio': 'Обновлено', 'faculty_id': '{faculty}'}),
+    Call('talentprofile-get-talent-profile', 'get', '/api/profiles/talent/{talent_user}/', 'organizer', 5),
+    Call('organizer-profile-list', 'get', '/api/organizer/profiles/', 'organizer', 4),
+    Call('organizer-profile-detail', 'get', '/api/organizer/profiles/{organizer_profile}/', 'organizer', 3),
+    Call('organizer-profile-detail', 'patch', '/api/organizer/profiles/{organizer_profile}/', 'organizer', 5,
+         {'description': 'Обновлено'}),
+    Call('organizer-public-profile', 'get', '/api/organizers/{organizer_profile}/', None, 3),
+
+    Call('event-list', 'get', '/api/events/', 'talent', 5, paginated='page'),
+    Call('event-list', 'get', '/api/events/?pagination=cursor', 'talent', 4, paginated='cursor'),
+    Call('event-list', 'get', '/api/events/?organizer=me&status=published', 'organizer', 5, paginated='page'),
+    Call('event-list', 'get', '/api/events/?faculty={faculty}', 'talent', 6, paginated='page'),
+    Call('event-list', 'get', '/api/events/?search=Хакатон', 'talent', 5, paginated='page'),
+    Call('event-list', 'post', '/api/events/', 'organizer', 18,
+         {'title': 'Новое', 'description': '-', 'location': 'Астрахань', 'date': '2031-01-01',
+          'status': 'published', 'required_skill_ids': '{skills}', 'faculty_ids': '{faculties}'}),
+    Call('event-detail', 'get', '/api/events/{event}/', 'talent', 4),
+    Call('event-detail', 'patch', '/api/events/{event}/', 'organizer', 26,
+         {'title': 'Переименовано', 'required_skill_ids': '{skills}'}),
+    Call('event-detail', 'delete', '/api/events/{event}/', 'organizer', 36),
+    Call('event-import', 'post', '/api/events/import/', 'organizer', 12, {'events': [
+        {'title': f'Импорт {i}', 'description': '-', 'date': '2031-01-01', 'location': 'Астрахань',
+         'status': 'published', 'skills': ['Навык 1', 'Навык 2', f'Новый навык {i}'], 'faculties': ['Ф1']}
+        for i in range(20)
+    ]}),
+    Call('event-export-applicants', 'get', '/api/events/{event}/applicants/export/?type=xlsx', 'organizer', 3),
+
+    Call('application-list', 'get', '/api/applications/', 'talent', 7, paginated='page'),
+    Call('application-list', 'get', '/api/applications/', 'organizer', 7, paginated='page'),
+    Call('application-list', 'get', '/api/applications/?pagination=cursor', 'organizer', 6, paginated='cursor'),
+    Call('application-list', 'post', '/api/applications/', 'talent', 21, {'event_id': '{open_event}'}),
+    Call('application-inbox', 'get', '/api/applications/inbox/', 'organizer', 7, paginated='page'),
+    Call('application-inbox', 'get', '/api/applications/inbox/?pagination=cursor', 'organizer', 6,
+         paginated='cursor'),
+    Call('application-detail', 'get', '/api/applications/{application}/', 'organizer', 6),
+    Call('application-change-status', 'post', '/api/applications/{application}/change_status/', 'organizer', 17,
+         {'status': 'approved', 'comment': 'Ждём'}),
+    Call('application-bulk-status', 'post', '/api/applications/bulk_status/', 'organizer', 10,
+         {'items': '{status_items}'}),
+    Call('create-application', 'post', '/api/apply/', 'talent', 21, {'event_id': '{open_event}'}),
+    Call('recommendations', 'get', '/api/recommendations/', 'talent', 5, paginated='page'),
+    Call('notification-list', 'get', '/api/notifications/', 'talent', 6, paginated='page'),
+    Call('notification-list', 'get', '/api/notifications/?pagination=cursor&unread=1', 'talent', 5,
+         paginated='cursor'),
+    Call('notification-read', 'post', '/api/notifications/read/', 'talent', 2),
+    Call('talent-search', 'get', '/api/talents/search/?skills={skill}', 'organizer', 4, paginated='page'),
+    Call('talent-search', 'get', '/api/talents/search/?skills={skill}&match=all&course=1', 'organizer', 4,
+         paginated='page'),
+
+    Call('faculty-list', 'get', '/api/faculties/', 'talent', 2, paginated='page'),
+    Call('faculty-list', 'post', '/api/faculties/', 'staff', 2, {'name': 'Новый', 'short_name': 'Н'}),
+    Call('faculty-detail', 'get', '/api/faculties/{faculty}/', 'talent', 1),
+    Call('skill-list', 'get', '/api/skills/', None, 1),
+    Call('skill-list', 'post', '/api/skills/', 'organizer', 4, {'name': 'Rust'}),
+    Call('skill-detail', 'get', '/api/skills/{skill}/', None, 1),
+    Call('faculty-stats', 'get', '/api/faculty/stats/', 'talent', 1),
+    Call('user-activity-stats', 'get', '/api/user/activity/stats/', 'talent', 2),
+
+    Call('metrics-db-pool', 'get', '/api/metrics/db-pool/', 'staff', 0),
+    Call('metrics-requests', 'get', '/api/metrics/requests/', 'staff', 0),
+]
+
+
+def route_names(patterns=urls.urlpatterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from route_names(pattern.url_patterns)
+        else:
+            yield pattern.name
+
+
+class QueryBudgetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(17)
+        faculties = Faculty.objects.bulk_create(
+            [Faculty(name=f'Факультет {i}', short_name=f'Ф{i}') for i in range(FACULTIES)]
+        )
+        skills = Skill.objects.bulk_create([Skill(name=f'Навык {i}') for i in range(SKILLS)])
+
+        cls.organizer = User.objects.create_user(username='organizer', password='testpass')
+        cls.talent = User.objects.create_user(username='talent', password='testpass')
+        cls.staff = User.objects.create_user(username='staff', password='testpass', is_staff=True)
+        organizers = [cls.organizer] + User.objects.bulk_create(
+            [User(username=f'organizer{i}', password='!') for i in range(ORGANIZERS - 1)]
+        )
+        talents = [cls.talent] + User.objects.bulk_create(
+            [User(username=f'talent{i}', password='!') for i in range(TALENTS - 1)]
+        )
+        organizer_profiles = OrganizerProfile.objects.bulk_create([
+            OrganizerProfile(user=user, organization_name=f'Организация {i}', contact_info='-')
+            for i, user in enumerate(organizers)
+        ])
+        talent_profiles = TalentProfile.objects.bulk_create([
+            TalentProfile(user=user, faculty=rng.choice(faculties), course=rng.randint(1, 4))
+            for user in talents
+        ])
+        TalentProfile.skills.through.objects.bulk_create([
+            TalentProfile.skills.through(talentprofile_id=profile.pk, skill_id=skill.pk)
+            for profile in talent_profiles
+            for skill in rng.sample(skills, 5)
+        ])
+
+        # Половина мероприятий — у основного организатора, чтобы его входящие были большими
+        start = date(2030, 1, 1)
+        events = Event.objects.bulk_create([
+            Event(
+                organizer=cls.organizer if i % 2 == 0 else rng.choice(organizers[1:]),
+                title=f'Хакатон {i}' if i % 5 == 0 else f'Мероприятие {i}',
+                description='Описание мероприятия', location='Астрахань',
+                status='published' if i % 10 else 'draft',
+                date=start + timedelta(days=i), faculty_restriction=i % 7 == 0,
+            )
+            for i in range(EVENTS)
+        ])
+        event_skills = {event.pk: rng.sample(skills, 4) for event in events}
+        Event.required_skills.through.objects.bulk_create([
+            Event.required_skills.through(event_id=event_id, skill_id=skill.pk)
+            for event_id, event_skills_ in event_skills.items()
+            for skill in event_skills_
+        ])
+        Event.faculties.through.objects.bulk_create([
+            Event.faculties.through(event_id=event.pk, faculty_id=faculty.pk)
+            for event in events
+            for faculty in rng.sample(faculties, 3)
+        ])
+        # bulk_create не вызывает m2m_changed — индекс рекомендаций заполняется явно
+        EventSkillIndex.objects.bulk_create([
+            EventSkillIndex(skill=skill, event=event, event_status=event.status, event_date=event.date)
+            for event in events
+            for skill in event_skills[event.pk]
+        ])
+
+        # Основной талант не подаёт заявку на последнее мероприятие — на него подаём в тестах
+        Application.objects.bulk_create([
+            Application(user=user, event=event, status=rng.choice(['pending', 'approved', 'rejected']))
+            for user in talents
+            for event in rng.sample(events[:-1], APPLICATIONS_PER_TALENT * (5 if user == cls.talent else 1))
+        ])
+
+        # Лента уведомлений основного таланта; каждое второе уже прочитано
+        EventNotification.objects.bulk_create([
+            EventNotification(user=cls.talent, event=event, match_count=1, read_at=event.created_at if i % 2 else None)
+            for i, event in enumerate(events[:LARGE_PAGE * 2])
+        ])
+
+        organizer_applications = Application.objects.filter(event__organizer=cls.organizer).values_list('pk', flat=True)
+        cls.ids = {
+            'talent_user': cls.talent.pk,
+            'talent_profile': talent_profiles[0].pk,
+            'organizer_profile': organizer_profiles[0].pk,
+            'event': events[0].pk,
+            'open_event': events[-1].pk,
+            'application': organizer_applications[0],
+            'status_items': [
+                {'id': pk, 'status': rng.choice(['approved', 'rejected']), 'comment': 'Ок'}
+                for pk in organizer_applications[:LARGE_PAGE]
+            ],
+            'faculty': faculties[0].pk,
+            'skill': skills[0].pk,
+            'skills': [skill.pk for skill in skills[:3]],
+            'faculties': [faculty.pk for faculty in faculties[:2]],
+        }
+        Event.objects.filter(pk=cls.ids['open_event']).update(status='published', faculty_restriction=False)
+
+    def setUp(self):
+        self.users = {'talent': self.talent, 'organizer': self.organizer, 'staff': self.staff}
+
+    def _fill(self, value):
+        if isinstance(value, str) and value.startswith('{') and value.endswith('}') and value[1:-1] in self.ids:
+            return self.ids[value[1:-1]]
+        if isinstance(value, str):
+            return value.format(**self.ids)
+        return value
+
+    def _client(self, user):
+        client = APIClient()
+        if user:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(self.users[user]).access_token}')
+        return client
+
+    def _measure(self, call, url=None):
+        """Число запросов одного вызова; изменения в базе откатываются."""
+        # Холодный кэш (справочники, версии claims), но токен выдан заранее
+        cache.clear()
+        client = self._client(call.user)
+        data = {key: self._fill(value) for key, value in (call.data or {}).items()}
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(client, call.method)(url or self._fill(call.url), data or None, format='json')
+                if response.streaming:
+                    # Потоковые ответы читают базу по мере отдачи
+                    b''.join(response.streaming_content)
+            transaction.set_rollback(True)
+        if response.status_code >= 400:
+            self.fail(f'{call.method.upper()} {call.url}: {response.status_code} {response.content[:500]}')
+        return len(queries), queries
+
+    def _report(self, queries):
+        return '\n'.join(query['sql'] for query in queries.captured_queries)
+
+    def test_every_route_has_budget(self):
+        covered = {call.route for call in CALLS}
+        self.assertEqual(set(route_names()) - covered, set())
+
+    def test_query_budgets(self):
+        for call in CALLS:
+            with self.subTest(route=call.route, method=call.method, url=call.url, user=call.user):
+                count, queries = self._measure(call)
+                self.assertLessEqual(count, call.budget, self._report(queries))
+
+    def test_queries_do_not_grow_with_page_size(self):
+        for call in CALLS:
+            if not call.paginated:
+                continue
+            with self.subTest(route=call.route, url=call.url, user=call.user):
+                counts = []
+                for page_size in (SMALL_PAGE, LARGE_PAGE):
+                    url = self._fill(call.url)
+                    if call.paginated == 'cursor':
+                        counts.append(self._measure(call, f'{url}&page_size={page_size}'))
+                    else:
+                        with mock.patch.object(AsyncPageNumberPagination, 'page_size', page_size):
+                            counts.append(self._measure(call, url))
+                (small, _), (large, queries) = counts
+                self.assertEqual(small, large, self._report(queries))
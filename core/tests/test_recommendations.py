@@ -0,0 +1,81 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Event, EventSkillIndex, Skill, TalentProfile
+from core.recommendations import recommended_events
+
+
+class RecommendationTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        self.user = User.objects.create_user(username='talent', password='testpass')
+        self.profile = TalentProfile.objects.create(user=self.user)
+
+        self.python = Skill.objects.create(name='Python')
+        self.django = Skill.objects.create(name='Django')
+        self.java = Skill.objects.create(name='Java')
+        self.profile.skills.set([self.python, self.django])
+
+        self.one_match = self._event('Python Meetup', [self.python])
+        self.two_matches = self._event('Django Sprint', [self.python, self.django])
+        self.no_match = self._event('Java Day', [self.java])
+        self.draft = self._event('Draft', [self.python, self.django], status='draft')
+
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _event(self, title, skills, status='published'):
+        event = Event.objects.create(
+            organizer=self.organizer,
+            title=title,
+            description='Description',
+            location='Астрахань',
+            status=status,
+            date=date(2030, 6, 1),
+        )
+        event.required_skills.set(skills)
+        return event
+
+    # Проверка ранжирования по числу совпавших навыков
+    def test_ranked_by_overlap(self):
+        events = list(recommended_events(self.profile))
+        self.assertEqual(events, [self.two_matches, self.one_match])
+        self.assertEqual([e.match_score for e in events], [2, 1])
+
+    def test_recommendations_endpoint(self):
+        response = self.client.get('/api/recommendations/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [e['id'] for e in response.data['results']],
+            [self.two_matches.id, self.one_match.id],
+        )
+
+    # Проверки синхронизации индекса сигналами
+    def test_index_follows_required_skills(self):
+        self.no_match.required_skills.add(self.python)
+        self.assertTrue(EventSkillIndex.objects.filter(event=self.no_match, skill=self.python).exists())
+        self.assertIn(self.no_match, recommended_events(self.profile))
+
+        self.python.events.remove(self.one_match)
+        self.assertNotIn(self.one_match, recommended_events(self.profile))
+
+        self.two_matches.required_skills.clear()
+        self.assertFalse(EventSkillIndex.objects.filter(event=self.two_matches).exists())
+
+    def test_index_follows_event_status(self):
+        self.draft.status = 'published'
+        self.draft.save()
+        self.assertEqual(
+            set(EventSkillIndex.objects.filter(event=self.draft).values_list('event_status', flat=True)),
+            {'published'},
+        )
+        self.assertIn(self.draft, recommended_events(self.profile))
+
+    def test_talent_skills_change(self):
+        self.profile.skills.set([self.java])
+        self.assertEqual(list(recommended_events(self.profile)), [self.no_match])
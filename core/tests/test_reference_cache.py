@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from core.models import Skill
+
+
+class ReferenceCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Skill.objects.create(name='Python')
+
+    def test_skills_served_from_cache(self):
+        response = self.client.get('/api/skills/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('max-age', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            cached = self.client.get('/api/skills/')
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(cached.json(), response.json())
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get('/api/skills/')['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/skills/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    # Изменение справочника меняет версию и ETag
+    def test_save_invalidates_cache(self):
+        etag = self.client.get('/api/skills/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Django')
+            # До коммита версия прежняя: чтение видит ещё старые данные
+            self.assertEqual(self.client.get('/api/skills/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        response = self.client.get('/api/skills/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([s['name'] for s in response.data], ['Django', 'Python'])
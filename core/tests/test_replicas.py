@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Event, OrganizerProfile, Skill, TalentProfile
+
+REPLICA = 'replica_test'
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Реплика — второе подключение к той же тестовой базе (как TEST MIRROR), поэтому
+    данные совпадают, а маршрутизацию видно по запросам каждого подключения.
+    """
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = dict(connections['default'].settings_dict)
+        cls.replicas_override = override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_STICKY_SECONDS=30)
+        cls.replicas_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.replicas_override.disable()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=organizer, organization_name='АГУ', contact_info='-')
+        self.event = Event.objects.create(
+            organizer=organizer, title='Хакатон', description='Description',
+            location='Астрахань', status='published', date=date(2030, 6, 1),
+        )
+        self.event.required_skills.set([Skill.objects.create(name='Python')])
+        self.talent = User.objects.create_user(username='talent', password='testpass')
+        TalentProfile.objects.create(user=self.talent)
+
+        self.client = APIClient()
+        token = RefreshToken.for_user(self.talent).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _request(self, method, url, data=None):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(self.client, method)(url, data, format='json')
+        return response, len(primary.captured_queries), len(replica.captured_queries)
+
+    def test_safe_requests_read_from_replica(self):
+        for url in ('/api/events/', f'/api/events/{self.event.id}/', '/api/recommendations/',
+                    '/api/faculty/stats/', '/api/user/activity/stats/', '/api/skills/',
+                    f'/api/organizers/{OrganizerProfile.objects.get().id}/'):
+            response, primary, replica = self._request('get', url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertGreater(replica, 0, url)
+            # С основной базы читается только пользователь из токена
+            self.assertLessEqual(primary, 1, url)
+
+    def test_views_without_mixin_use_primary(self):
+        response, _, replica = self._request('get', '/api/applications/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, 0)
+
+    # После записи пользователь какое-то время читает из default
+    def test_read_your_writes_after_application(self):
+        response, _, replica = self._request('post', '/api/apply/', {'event_id': self.event.id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(replica, 0)
+
+        response, primary, replica = self._request('get', '/api/events/')
+        self.assertEqual(response.data['results'][0]['user_application_status'], 'pending')
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+        cache.clear()
+        _, _, replica = self._request('get', '/api/events/')
+        self.assertGreater(replica, 0)
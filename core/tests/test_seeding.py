@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from core.benchmark import parse_mix, run
+from core.models import Application, Event, EventNotification, EventSkillIndex, FacultyStats, UserActivityStats
+from core.notifications import notify_event_published
+from core.seeding import clear_seeded, seed
+
+
+class SeedLoadDataTests(TestCase):
+    def test_seed_and_clear(self):
+        real = User.objects.create_user(username='real', password='testpass')
+        counts = seed(talents=20, organizers=3, events=30, applications=150, skills=10, faculties=3)
+
+        self.assertEqual(counts['users'], 23)
+        self.assertEqual(Application.objects.count(), 150)
+        self.assertEqual(Application.objects.values('user_id', 'event_id').distinct().count(), 150)
+        self.assertEqual(Event.objects.count(), 30)
+        # Индекс рекомендаций и статистика согласованы с данными
+        self.assertEqual(EventSkillIndex.objects.count(), Event.required_skills.through.objects.count())
+        self.assertEqual(sum(UserActivityStats.objects.values_list('total_applications', flat=True)), 150)
+        self.assertEqual(sum(FacultyStats.objects.values_list('users_count', flat=True)), 20)
+
+        with self.assertRaises(ValueError):
+            seed(talents=1, organizers=1, events=1, applications=1)
+
+        # Ленты уведомлений ссылаются и на мероприятия, и на пользователей
+        for event_id in Event.objects.filter(status='published').values_list('pk', flat=True):
+            notify_event_published(event_id)
+        self.assertTrue(EventNotification.objects.exists())
+
+        self.assertEqual(clear_seeded(), 23)
+        self.assertEqual(list(User.objects.all()), [real])
+        self.assertFalse(EventNotification.objects.exists())
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(UserActivityStats.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command('seed_load_data', '--talents=5', '--organizers=2', '--events=8', '--applications=100',
+                     '--skills=5', stdout=out)
+        # Заявок не больше, чем пар (талант, мероприятие)
+        self.assertIn('applications: 40', out.getvalue())
+
+
+class BenchmarkTests(TransactionTestCase):
+    def test_mixed_run(self):
+        seed(talents=10, organizers=2, events=20, applications=60, skills=5, faculties=2)
+        # Один поток: общая in-memory база SQLite в тестах блокирует таблицы при параллельной записи
+        summary = run(parse_mix('mixed'), requests=40, concurrency=1, users=5, random_seed=1)
+
+        self.assertEqual(summary['total']['requests'], 40)
+        self.assertEqual(summary['total']['errors'], 0)
+        self.assertEqual(sum(row['requests'] for row in summary['scenarios'].values()), 40)
+        self.assertIsNotNone(summary['total']['p95'])
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('events=3,apply'), {'events': 3.0, 'apply': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('unknown=1')
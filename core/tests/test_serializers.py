@@ -0,0 +1,53 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Faculty, Skill
+from core.serializers import EventSerializer, TalentProfileSerializer
+
+
+class BatchedPrimaryKeyRelatedFieldTests(TestCase):
+    def setUp(self):
+        self.skills = Skill.objects.bulk_create([Skill(name=f'Навык {i}') for i in range(30)])
+        self.faculty = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК')
+
+    def _event(self, **data):
+        return EventSerializer(data={
+            'title': 'Хакатон', 'description': '-', 'location': 'Астрахань', 'date': date(2031, 1, 1), **data,
+        })
+
+    # Все ID проверяются одним запросом, а не запросом на каждый ID
+    def test_one_query_per_relation(self):
+        serializer = self._event(
+            required_skill_ids=[skill.pk for skill in reversed(self.skills)], faculty_ids=[self.faculty.pk],
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        # Порядок как в запросе
+        self.assertEqual(serializer.validated_data['required_skills'], list(reversed(self.skills)))
+
+    def test_reports_all_missing_ids(self):
+        serializer = self._event(required_skill_ids=[self.skills[0].pk, 999998, 999999])
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['required_skill_ids'], ['Объекты с ID 999998, 999999 не существуют.'])
+
+    def test_incorrect_type(self):
+        for value in (['abc'], [True], 'строка'):
+            with self.subTest(value=value):
+                serializer = self._event(required_skill_ids=value)
+                self.assertFalse(serializer.is_valid())
+                self.assertIn('required_skill_ids', serializer.errors)
+
+    def test_duplicates_and_strings(self):
+        pk = self.skills[0].pk
+        serializer = self._event(required_skill_ids=[pk, str(pk)])
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['required_skills'], [self.skills[0]])
+
+    def test_single_relation(self):
+        field = TalentProfileSerializer().fields['faculty_id']
+        self.assertEqual(field.run_validation(str(self.faculty.pk)), self.faculty)
+        self.assertIsNone(field.run_validation(None))
@@ -0,0 +1,97 @@
+from io import StringIO
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import (Application, Event, Faculty, FacultyStats, Skill, TalentProfile,
+                         UserActivityStats, UserSkillStat)
+
+
+class StatsCountersTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', password='testpass')
+        self.faculty = Faculty.objects.create(name='ФЦТК', short_name='ФЦТК')
+        self.other_faculty = Faculty.objects.create(name='ФИЯ', short_name='ФИЯ')
+        self.python = Skill.objects.create(name='Python')
+        self.django = Skill.objects.create(name='Django')
+
+        self.user = User.objects.create_user(username='talent', password='testpass')
+        self.profile = TalentProfile.objects.create(user=self.user, faculty=self.faculty)
+        self.events = []
+        for i in range(3):
+            event = Event.objects.create(
+                organizer=self.organizer, title=f'Event {i}', description='Description',
+                location='Астрахань', status='published', date=date(2030, 6, 1),
+            )
+            event.required_skills.set([self.python])
+            self.events.append(event)
+
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def _snapshot(self):
+        # Строки с нулевыми счётчиками эквивалентны отсутствующим
+        return (
+            sorted(FacultyStats.objects.exclude(users_count=0, applications_count=0)
+                   .values_list('faculty_id', 'users_count', 'applications_count')),
+            sorted(UserActivityStats.objects.exclude(total_applications=0)
+                   .values_list('user_id', 'total_applications', 'approved_applications')),
+            sorted(UserSkillStat.objects.values_list('user_id', 'skill_id', 'count')),
+        )
+
+    def _assert_matches_rebuild(self):
+        incremental = self._snapshot()
+        call_command('rebuild_stats', stdout=StringIO())
+        self.assertEqual(incremental, self._snapshot())
+
+    # Инкрементальные счётчики совпадают с полным пересчётом
+    def test_counters_follow_changes(self):
+        first = Application.objects.create(user=self.user, event=self.events[0])
+        second = Application.objects.create(user=self.user, event=self.events[1], status='approved')
+        self.events[0].required_skills.add(self.django)
+        self._assert_matches_rebuild()
+
+        first.status = 'approved'
+        first.save()
+        self.events[1].required_skills.clear()
+        self._assert_matches_rebuild()
+
+        self.profile.faculty = self.other_faculty
+        self.profile.save()
+        second.delete()
+        self._assert_matches_rebuild()
+
+        self.events[0].delete()
+        self._assert_matches_rebuild()
+
+    def test_deleting_user_with_applications(self):
+        # Второй талант того же факультета — его вклад должен остаться
+        other = User.objects.create_user(username='other', password='testpass')
+        TalentProfile.objects.create(user=other, faculty=self.faculty)
+        Application.objects.create(user=other, event=self.events[0], status='approved')
+        for event in self.events:
+            Application.objects.create(user=self.user, event=event, status='approved')
+        self._assert_matches_rebuild()
+
+        self.user.delete()
+        self._assert_matches_rebuild()
+
+        # Удаление организатора каскадом удаляет заявки других пользователей
+        self.organizer.delete()
+        self._assert_matches_rebuild()
+
+    def test_stats_endpoints(self):
+        Application.objects.create(user=self.user, event=self.events[0], status='approved')
+        Application.objects.create(user=self.user, event=self.events[1])
+
+        response = self.client.get('/api/faculty/stats/')
+        self.assertEqual(response.data['stats'], {'total_users': 1, 'total_applications': 2})
+
+        response = self.client.get('/api/user/activity/stats/')
+        self.assertEqual(response.data['total_applications'], 2)
+        self.assertEqual(response.data['approved_applications'], 1)
+        self.assertEqual(response.data['skill_stats'], {'Python': 2})
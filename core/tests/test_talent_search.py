@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from core.authentication import get_tokens_for_user
+from core.models import Faculty, OrganizerProfile, Skill, TalentProfile
+from core.talent_search import facets_query, parse_filters
+
+
+class TalentSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user(username='organizer', password='testpass')
+        OrganizerProfile.objects.create(user=cls.organizer, organization_name='АГУ', contact_info='-')
+        cls.fctk = Faculty.objects.create(name='Факультет цифровых технологий', short_name='ФЦТК')
+        cls.law = Faculty.objects.create(name='Юридический институт', short_name='ЮИ')
+        cls.python, cls.django, cls.sql = (Skill.objects.create(name=name) for name in ('Python', 'Django', 'SQL'))
+
+        def talent(username, skills, faculty, level='bachelor', course=1):
+            user = User.objects.create_user(username=username, password='testpass', email=f'{username}@example.com')
+            profile = TalentProfile.objects.create(user=user, faculty=faculty, education_level=level, course=course)
+            profile.skills.set(skills)
+            return profile
+
+        cls.full = talent('full', [cls.python, cls.django, cls.sql], cls.fctk, course=3)
+        cls.pair = talent('pair', [cls.python, cls.django], cls.law, level='master')
+        cls.single = talent('single', [cls.sql], cls.fctk, level='master', course=3)
+        cls.none = talent('none', [], cls.law)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(self.organizer).access_token}')
+
+    def _search(self, query=''):
+        response = self.client.get(f'/api/talents/search/{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def _ids(self, response):
+        return [profile['id'] for profile in response.data['results']]
+
+    def test_any_ranks_by_match_count(self):
+        response = self._search(f'?skills={self.python.pk},{self.django.pk},{self.sql.pk}')
+        self.assertEqual(self._ids(response), [self.full.pk, self.pair.pk, self.single.pk])
+        self.assertEqual([profile['match_count'] for profile in response.data['results']], [3, 2, 1])
+        self.assertNotIn('email', response.data['results'][0]['user'])
+
+    def test_all_requires_every_skill(self):
+        response = self._search(f'?skills={self.python.pk},{self.django.pk}&match=all')
+        self.assertEqual(self._ids(response), [self.pair.pk, self.full.pk])
+        self.assertEqual({profile['match_count'] for profile in response.data['results']}, {2})
+
+    def test_profile_filters(self):
+        self.assertEqual(self._ids(self._search(f'?faculty={self.fctk.pk}')), [self.single.pk, self.full.pk])
+        self.assertEqual(self._ids(self._search('?education_level=master&course=3')), [self.single.pk])
+        response = self._search(f'?skills={self.sql.pk}&faculty={self.fctk.pk}&education_level=bachelor')
+        self.assertEqual(self._ids(response), [self.full.pk])
+
+    def test_facets_cover_all_found_profiles(self):
+        response = self._search(f'?skills={self.python.pk},{self.sql.pk}')
+        self.assertEqual(response.data['facets'], {
+            'skills': {str(self.python.pk): 2, str(self.django.pk): 2, str(self.sql.pk): 2},
+            'faculties': {str(self.fctk.pk): 2, str(self.law.pk): 1},
+            'education_levels': {'bachelor': 1, 'master': 2},
+        })
+
+    def test_facets_are_one_query(self):
+        filters = parse_filters({'skills': f'{self.python.pk}', 'match': 'all', 'course': '3'})
+        with CaptureQueriesContext(connection) as ctx:
+            rows = list(facets_query(filters))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn(('education_level', 'bachelor', 1), rows)
+
+    def test_invalid_filters(self):
+        for query in ('?skills=1,x', '?match=some', '?education_level=phd', '?course=first'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/talents/search/{query}').status_code, 400)
+
+    def test_talents_are_forbidden(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(self.full.user).access_token}')
+        self.assertEqual(self.client.get('/api/talents/search/').status_code, 403)
+
+    def test_query_count_does_not_depend_on_results(self):
+        counts = []
+        for query in (f'?skills={self.sql.pk}', f'?skills={self.python.pk},{self.django.pk},{self.sql.pk}'):
+            with CaptureQueriesContext(connection) as ctx:
+                self._search(query)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
@@ -2,10 +2,8 @@ import json
 from rest_framework.test import APIClient, APITestCase
 from django.contrib.auth.models import User
 from rest_framework_simplejwt.tokens import RefreshToken
-from core.models import Event, TalentProfile
-from datetime import date
-from django.utils import timezone
-from datetime import datetime, date
+from core.models import Application, Event, Skill, TalentProfile
+from datetime import date, timedelta
 
 class APITests(APITestCase):
     def setUp(self):
@@ -15,19 +13,30 @@ class APITests(APITestCase):
         TalentProfile.objects.all().delete()
         Event.objects.all().delete()
 
+        self.python = Skill.objects.create(name='Python')
+        self.java = Skill.objects.create(name='Java')
+        self.event_date = date.today() + timedelta(days=30)
+
         self.user = User.objects.create_user(username='testuser', password='testpass')
-        self.profile = TalentProfile.objects.create(user=self.user, skills='Python')
-        self.event = Event.objects.create(
-            organizer=self.user,
-            title='Test Event',
-            description='Test Description',
-            required_skills='Python',
-            date=date(2025, 6, 1)
-        )
+        self.profile = TalentProfile.objects.create(user=self.user)
+        self.profile.skills.set([self.python])
+        self.event = self._create_event('Test Event', self.python, self.event_date)
         refresh = RefreshToken.for_user(self.user)
         self.token = str(refresh.access_token)
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
 
+    def _create_event(self, title, skill, event_date):
+        event = Event.objects.create(
+            organizer=self.user,
+            title=title,
+            description='Test Description',
+            location='Астрахань',
+            status='published',
+            date=event_date
+        )
+        event.required_skills.set([skill])
+        return event
+
     # Тесты для /api/login/
     
     # Проверка логина
@@ -43,7 +52,7 @@ class APITests(APITestCase):
         data = {'username': 'newuser', 'password': 'newpass123', 'email': 'newuser@example.com'}
         response = self.client.post('/api/register/', data, format='json')
         self.assertEqual(response.status_code, 201)
-        self.assertEqual(response.data['username'], 'newuser')
+        self.assertEqual(response.data['user']['username'], 'newuser')
         self.assertEqual(User.objects.count(), 2)
 
     def test_register_user_missing_fields(self):
@@ -63,18 +72,17 @@ class APITests(APITestCase):
     # Проверки взаимодействий с профилем таланта
     def test_get_profile(self):
         response = self.client.get('/api/profiles/')
-        print("Response data:", response.data)  # Отладочный вывод
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['user']['id'], self.user.id)
-        self.assertEqual(response.data['results'][0]['skills'], 'Python')
+        self.assertEqual([skill['name'] for skill in response.data['results'][0]['skills']], ['Python'])
 
     def test_update_profile(self):
-        data = {'skills': 'Python, Django', 'preferences': 'Remote', 'bio': 'Developer'}
-        response = self.client.post('/api/profiles/', data, format='json')
-        self.assertEqual(response.status_code, 201)
+        data = {'preferences': 'Remote', 'bio': 'Developer'}
+        response = self.client.patch(f'/api/profiles/{self.profile.id}/', data, format='json')
+        self.assertEqual(response.status_code, 200)
         updated_profile = TalentProfile.objects.get(user=self.user)
-        self.assertEqual(updated_profile.skills, 'Python, Django')
+        self.assertEqual(updated_profile.bio, 'Developer')
         self.assertEqual(updated_profile.preferences, 'Remote')
 
     def test_get_profile_unauthenticated(self):
@@ -88,42 +96,41 @@ class APITests(APITestCase):
     def test_get_recommendations(self):
         response = self.client.get('/api/recommendations/')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Event')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Event')
 
     def test_get_recommendations_no_matching_skills(self):
-        self.profile.skills = 'Java'
-        self.profile.save()
+        self.profile.skills.set([self.java])
         response = self.client.get('/api/recommendations/')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
 
     def test_get_recommendations_unauthenticated(self):
         self.client.credentials()  # Убираем токен
         response = self.client.get('/api/recommendations/')
         self.assertEqual(response.status_code, 401)
-        self.assertIn('detail', response.data)
+        self.assertIn('message', response.data)
 
     # Тесты для /api/applications/
         
     # Проверки подачи заявки на участие в мероприятии
     def test_application_creation(self):
-        data = {'event': self.event.id}
+        data = {'event_id': self.event.id}
         response = self.client.post('/api/applications/', data, format='json')
         self.assertEqual(response.status_code, 201)
-        self.assertEqual(response.data['user'], self.user.id)
         self.assertEqual(response.data['event'], self.event.id)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertTrue(Application.objects.filter(user=self.user, event=self.event).exists())
 
     def test_application_creation_invalid_event(self):
-        data = {'event': 999}  # Несуществующий ID события
+        data = {'event_id': 999}  # Несуществующий ID события
         response = self.client.post('/api/applications/', data, format='json')
         self.assertEqual(response.status_code, 400)
-        self.assertIn('event', response.data)  # Проверяем наличие ошибки для 'event'
-        self.assertEqual(response.data['event'][0].code, 'does_not_exist')  # Проверяем код ошибки
+        self.assertIn('999', str(response.data['message']))
 
     def test_application_creation_unauthenticated(self):
         self.client.credentials()  # Убираем токен
-        data = {'event': self.event.id}
+        data = {'event_id': self.event.id}
         response = self.client.post('/api/applications/', data, format='json')
         self.assertEqual(response.status_code, 401)
 
@@ -141,8 +148,9 @@ class APITests(APITestCase):
         data = {
             'title': 'New Event',
             'description': 'New Description',
-            'required_skills': 'Django',
-            'date': date(2025, 7, 1).isoformat()  # Используем date и преобразуем в строку
+            'location': 'Астрахань',
+            'required_skill_ids': [self.python.id],
+            'date': (self.event_date + timedelta(days=30)).isoformat()  # Используем date и преобразуем в строку
         }
         response = self.client.post('/api/events/', data, format='json')
         self.assertEqual(response.status_code, 201)
@@ -155,8 +163,9 @@ class APITests(APITestCase):
         data = {
             'title': 'New Event',
             'description': 'New Description',
-            'required_skills': 'Django',
-            'date': date(2025, 7, 1).isoformat()
+            'location': 'Астрахань',
+            'required_skill_ids': [self.python.id],
+            'date': (self.event_date + timedelta(days=30)).isoformat()
         }
         response = self.client.post('/api/events/', data, format='json')
         self.assertEqual(response.status_code, 401)
@@ -165,13 +174,7 @@ class APITests(APITestCase):
     def test_event_pagination(self):
     # Создаём 15 событий
         for i in range(15):
-            Event.objects.create(
-                organizer=self.user,
-                title=f'Event {i}',
-                description='Description',
-                required_skills='Python',
-                date=date(2025, 6, 1)
-            )
+            self._create_event(f'Event {i}', self.python, self.event_date)
         response = self.client.get('/api/events/')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 10)  # PAGE_SIZE = 10
@@ -182,27 +185,15 @@ class APITests(APITestCase):
     # Проверка фильтров для запросов пользователей
     
     def test_event_filter_by_skills(self):
-        Event.objects.create(
-            organizer=self.user,
-            title='Java Event',
-            description='Description',
-            required_skills='Java',
-            date=date(2025, 6, 2)
-        )
-        response = self.client.get('/api/events/?required_skills=Python')
+        self._create_event('Java Event', self.java, self.event_date + timedelta(days=1))
+        response = self.client.get(f'/api/events/?required_skills={self.python.id}')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['required_skills'], 'Python')
+        self.assertEqual(response.data['results'][0]['required_skills'][0]['name'], 'Python')
 
     def test_event_filter_by_date(self):
-        Event.objects.create(
-            organizer=self.user,
-            title='Another Event',
-            description='Description',
-            required_skills='Python',
-            date=date(2025, 6, 2)
-        )
-        response = self.client.get('/api/events/?date=2025-06-01')
+        self._create_event('Another Event', self.python, self.event_date + timedelta(days=1))
+        response = self.client.get(f'/api/events/?date={self.event_date.isoformat()}')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['date'], '2025-06-01')
\ No newline at end of file
+        self.assertEqual(response.data['results'][0]['date'], self.event_date.isoformat())
\ No newline at end of file
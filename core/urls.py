@@ -4,7 +4,8 @@ from .views import (TalentProfileViewSet, OrganizerProfileViewSet, EventViewSet,
                    ApplicationViewSet, RecommendationView, register_user, 
                    register_organizer, login, FacultyViewSet, create_application,
                    FacultyStatsView, UserActivityStatsView, SkillViewSet,
-                   OrganizerProfilePublicView)
+                   OrganizerProfilePublicView, DatabasePoolStatsView,
+                   RequestMetricsView, TalentSearchView, NotificationViewSet)
 from rest_framework_simplejwt.views import TokenObtainPairView 
 
 router = DefaultRouter()
@@ -14,6 +15,7 @@ router.register(r'events', EventViewSet)
 router.register(r'applications', ApplicationViewSet, basename='application')
 router.register(r'faculties', FacultyViewSet)
 router.register(r'skills', SkillViewSet)
+router.register(r'notifications', NotificationViewSet, basename='notification')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -21,8 +23,11 @@ urlpatterns = [
     path('register/organizer/', register_organizer, name='register-organizer'),
     path('login/', login, name='login'),
     path('recommendations/', RecommendationView.as_view(), name='recommendations'),
+    path('talents/search/', TalentSearchView.as_view(), name='talent-search'),
     path('apply/', create_application, name='create-application'),
     path('faculty/stats/', FacultyStatsView.as_view(), name='faculty-stats'),
     path('user/activity/stats/', UserActivityStatsView.as_view(), name='user-activity-stats'),
     path('organizers/<int:pk>/', OrganizerProfilePublicView.as_view(), name='organizer-public-profile'),
+    path('metrics/db-pool/', DatabasePoolStatsView.as_view(), name='metrics-db-pool'),
+    path('metrics/requests/', RequestMetricsView.as_view(), name='metrics-requests'),
 ]
\ No newline at end of file
@@ -4,25 +4,51 @@ from rest_framework.response import Response
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView # Для создания эндпоинта для логина
-from .models import TalentProfile, OrganizerProfile, Event, Application, Faculty, Skill
+from .models import (TalentProfile, OrganizerProfile, Event, Application, Faculty, Skill,
+                     UserActivityStats, UserSkillStat, EventNotification)
+from .applications import SubmissionError, submit_application
+from .async_views import AsyncAPIViewMixin, AsyncListMixin
+from .authentication import (ROLE_CLAIM, IsOrganizer, aget_faculty_id, aget_talent_profile_id,
+                             get_talent_profile_id, get_tokens_for_user, is_organizer)
+from .cache import ReferenceDataCacheMixin
+from .dbpool import all_pool_stats
+from .event_import import import_events, parse_file as parse_event_file
+from .exports import FORMATS as EXPORT_FORMATS, export_response
+from .log import field_names
+from .notifications import schedule_publication_notifications
+from .perf import collect, summarize
+from .images import schedule_image_processing
+from .pagination import KeysetPagination, KeysetPaginationMixin
+from .routers import ReplicaReadMixin
+from .recommendations import recommended_events
+from .search import search_events
+from .stats import applications_status_changed
+from .talent_search import facets_query, group_facets, parse_filters, search_talents
 from .serializers import (UserSerializer, TalentProfileSerializer, OrganizerProfileSerializer, 
-                        EventSerializer, ApplicationSerializer, FacultySerializer, SkillSerializer)
-from django.db.models import Q, Count
+                        EventSerializer, ApplicationSerializer, FacultySerializer, SkillSerializer,
+                        ApplicationInboxSerializer, ApplicationSubmitSerializer, ApplicationBulkStatusSerializer,
+                        TalentSearchSerializer, EventNotificationSerializer, NotificationReadSerializer)
+from django.db import transaction
+from django.db.models import Q, Count, Prefetch
 from django.contrib.auth import authenticate
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from functools import reduce
+import logging
 import operator
+import os
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 from rest_framework import serializers
-from collections import Counter
+
+logger = logging.getLogger(__name__)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def register_user(request):
     try:
-        print(f"Регистрация пользователя, данные: {request.data}")
+        logger.debug('Регистрация пользователя', extra={'fields': field_names(request.data)})
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
@@ -34,31 +60,31 @@ def register_user(request):
                 education_level=request.data.get('education_level'),
                 course=request.data.get('course')
             )
-            print(f"Создан профиль таланта с ID: {profile.id}")
+            logger.info('Создан профиль таланта', extra={'user_id': user.id, 'profile_id': profile.id})
             
             skills_data = request.data.get('skills')
             if skills_data and isinstance(skills_data, list):
                 profile.skills.set(skills_data)
-                print(f"Установлены навыки для профиля {profile.id}: {skills_data}")
+                logger.debug('Установлены навыки профиля', extra={'profile_id': profile.id, 'skills': skills_data})
 
             # Генерация токена
-            refresh = RefreshToken.for_user(user)
+            refresh = get_tokens_for_user(user)
             return Response({
                 'user': serializer.data,
                 'token': str(refresh.access_token),
                 'refresh': str(refresh),
                 'userType': 'talent'
             }, status=status.HTTP_201_CREATED)
-        print(f"Ошибки валидации при регистрации: {serializer.errors}")
+        logger.info('Ошибки валидации при регистрации', extra={'errors': serializer.errors})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        print(f"Ошибка при регистрации пользователя: {str(e)}")
+        logger.exception('Ошибка при регистрации пользователя')
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def register_organizer(request):
-    print("Начинаем регистрацию организатора:", request.data)
+    logger.debug('Регистрация организатора', extra={'fields': field_names(request.data)})
     
     user_data = {
         'username': request.data.get('username'),
@@ -69,7 +95,7 @@ def register_organizer(request):
     user_serializer = UserSerializer(data=user_data)
     if user_serializer.is_valid():
         user = user_serializer.save()
-        print(f"Создан пользователь с ID: {user.id}")
+        logger.info('Создан пользователь-организатор', extra={'user_id': user.id})
         
         try:
             organizer_data = {
@@ -80,8 +106,6 @@ def register_organizer(request):
                 'website': request.data.get('website', '')
             }
             
-            print(f"Данные организатора: {organizer_data}")
-            
             organizer_profile = OrganizerProfile.objects.create(
                 user=user,
                 organization_name=organizer_data['organization_name'],
@@ -90,7 +114,7 @@ def register_organizer(request):
                 website=organizer_data['website']
             )
             
-            refresh = RefreshToken.for_user(user)
+            refresh = get_tokens_for_user(user)
             
             return Response({
                 'user': user_serializer.data,
@@ -109,10 +133,10 @@ def register_organizer(request):
             
         except Exception as e:
             user.delete()
-            print(f"Ошибка при создании профиля организатора: {str(e)}")
+            logger.exception('Ошибка при создании профиля организатора', extra={'user_id': user.id})
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
-    print(f"Ошибки в данных пользователя: {user_serializer.errors}")
+    logger.info('Ошибки в данных организатора', extra={'errors': user_serializer.errors})
     return Response(user_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['POST'])
@@ -123,8 +147,8 @@ def login(request):
         password = request.data.get('password')
         user = authenticate(request, username=username, password=password)
         if user is not None:
-            refresh = RefreshToken.for_user(user)
-            user_type = 'organizer' if hasattr(user, 'organizerprofile') else 'talent'
+            refresh = get_tokens_for_user(user)
+            user_type = refresh[ROLE_CLAIM]
             response = Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -144,53 +168,18 @@ def login(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_application(request):
-    print(f"Создание заявки, данные: {request.data}")
-    
-    event_id = request.data.get('event_id')
-    if not event_id:
-        return Response({"detail": "Отсутствует ID мероприятия (event_id)"}, status=status.HTTP_400_BAD_REQUEST)
-    
-    try:
-        event = Event.objects.get(id=event_id)
+    logger.debug('Создание заявки', extra={'event_id': request.data.get('event_id')})
 
-        try:
-            talent_profile = request.user.talent_profile
-            user_faculty = talent_profile.faculty
-        except TalentProfile.DoesNotExist:
-             return Response({"detail": "У вас нет профиля таланта для подачи заявки"}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Проверка ограничения по факультетам
-        if event.faculty_restriction:
-            if user_faculty is None or user_faculty not in event.faculties.all():
-                 return Response(
-                     {"detail": "Это мероприятие ограничено по факультетам, и ваш факультет не соответствует."},
-                     status=status.HTTP_403_FORBIDDEN
-                 )
-
-        # Проверка на дубликаты заявок
-        existing_application = Application.objects.filter(
-            user=request.user,
-            event=event
-        ).exists()
-        
-        if existing_application:
-            return Response({"detail": "Вы уже подали заявку на это мероприятие"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        serializer = ApplicationSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(
-                user=request.user, 
-                event=event
-            )
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        
+    serializer = ApplicationSubmitSerializer(data=request.data)
+    if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-    except Event.DoesNotExist:
-        return Response({"detail": f"Мероприятие с ID {event_id} не найдено"}, status=status.HTTP_404_NOT_FOUND)
-    except Exception as e:
-        print(f"Ошибка при создании заявки: {str(e)}")
-        return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    try:
+        application = submit_application(
+            request.user, request.data.get('event_id'), serializer.validated_data.get('message', '')
+        )
+    except SubmissionError as e:
+        return Response({"detail": e.detail}, status=e.status_code)
+    return Response(ApplicationSubmitSerializer(application).data, status=status.HTTP_201_CREATED)
 
 class TalentProfileViewSet(viewsets.ModelViewSet):
     queryset = TalentProfile.objects.all()
@@ -204,14 +193,14 @@ class TalentProfileViewSet(viewsets.ModelViewSet):
             user = self.request.user
             try:
                 profile = TalentProfile.objects.get(user=user)
-                print(f"Найден существующий профиль для {user.username}")
+                logger.debug('Обновление существующего профиля таланта', extra={'user_id': user.pk})
                 serializer.update(profile, serializer.validated_data)
             except TalentProfile.DoesNotExist:
-                print(f"Создание нового профиля для {user.username}")
+                logger.debug('Создание профиля таланта', extra={'user_id': user.pk})
                 serializer.save(user=user)
                 
         except Exception as e:
-            print(f"Ошибка в perform_create: {str(e)}")
+            logger.exception('Ошибка в TalentProfileViewSet.perform_create')
             TalentProfile.objects.get_or_create(
                 user=self.request.user,
                 defaults={'skills': "", 'preferences': "", 'bio': ""}
@@ -224,27 +213,24 @@ class TalentProfileViewSet(viewsets.ModelViewSet):
                 user_id = self.kwargs.get('user_id')
                 if user_id:
                     return TalentProfile.objects.filter(user_id=user_id).order_by('id')
-                return TalentProfile.objects.filter(user=self.request.user).order_by('id')
+                return TalentProfile.objects.filter(user_id=self.request.user.pk).order_by('id')
             return TalentProfile.objects.none()
         except Exception as e:
-            print(f"Ошибка в TalentProfileViewSet.get_queryset: {str(e)}")
+            logger.exception('Ошибка в TalentProfileViewSet.get_queryset')
             return TalentProfile.objects.none()
         
     def perform_update(self, serializer):
-        print(f"TalentProfileViewSet perform_update: Request data -> {self.request.data}")
-        print(f"TalentProfileViewSet perform_update: Validated data -> {serializer.validated_data}")
-        
         # Проверяем наличие файла в запросе
         if 'avatar' in self.request.FILES:
-            print(f"Получен новый файл аватара: {self.request.FILES['avatar']}")
+            logger.debug('Получен новый файл аватара', extra={'size': self.request.FILES['avatar'].size})
             if self.request.FILES['avatar'].size > 5 * 1024 * 1024:
                 raise serializers.ValidationError("Размер файла не должен превышать 5MB")
             if not self.request.FILES['avatar'].content_type.startswith('image/'):
                 raise serializers.ValidationError("Файл должен быть изображением")
 
         instance = serializer.save()
-        
-        print(f"TalentProfileViewSet perform_update: Profile after save -> {instance.avatar.name if instance.avatar else 'No avatar'}")
+        if 'avatar' in self.request.FILES:
+            schedule_image_processing(instance.avatar)
         return instance
 
     @action(detail=False, methods=['get'], url_path='talent/(?P<user_id>[^/.]+)')
@@ -265,39 +251,44 @@ class OrganizerProfileViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         if self.request.user.is_authenticated:
-            return OrganizerProfile.objects.filter(user=self.request.user)
+            return OrganizerProfile.objects.filter(user_id=self.request.user.pk)
         return OrganizerProfile.objects.none()
 
     def perform_update(self, serializer):
-        print(f"OrganizerProfileViewSet perform_update: Request data -> {self.request.data}")
-        print(f"OrganizerProfileViewSet perform_update: Validated data -> {serializer.validated_data}")
         serializer.save()
-        print(f"OrganizerProfileViewSet perform_update: Profile after save -> {serializer.instance.avatar.name if serializer.instance.avatar else 'No avatar'}")
+        if 'avatar' in self.request.FILES:
+            schedule_image_processing(serializer.instance.avatar)
 
-class FacultyViewSet(viewsets.ModelViewSet):
+class FacultyViewSet(ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = Faculty.objects.all()
     serializer_class = FacultySerializer
     permission_classes = [IsAuthenticated]
+    cache_namespace = 'faculties'
+    cache_public = False
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [IsAuthenticated()]
         return [IsAdminUser()]
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ReplicaReadMixin, KeysetPaginationMixin, AsyncListMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('-date')
     serializer_class = EventSerializer
+    keyset_ordering = ('-date', '-id')
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['required_skills', 'date', 'status']
     parser_classes = [JSONParser, FormParser, MultiPartParser]
 
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
     def get_queryset(self):
-        queryset = Event.objects.all().order_by('-date')
+        queryset = Event.objects.with_list_plan(self.request.user).order_by('-date')
 
         # Фильтрация по организатору
         if self.request.query_params.get('organizer') == 'me':
-            queryset = queryset.filter(organizer=self.request.user)
+            queryset = queryset.filter(organizer_id=self.request.user.pk)
         
         # Фильтрация по статусу (если не 'published', так как RecommendationView фильтрует только опубликованные)
         status_filter = self.request.query_params.get('status')
@@ -317,74 +308,125 @@ class EventViewSet(viewsets.ModelViewSet):
 
                  return Event.objects.none()
 
+        # Полнотекстовый поиск (название, описание, место, организация)
+        search = self.request.query_params.get('search')
+        if search:
+            # Курсор задаёт сортировку по дате и ранжирование по релевантности отбросил бы
+            if KeysetPagination.is_requested(self.request):
+                raise serializers.ValidationError({'search': 'Поиск не поддерживает ?pagination=cursor'})
+            queryset = search_events(queryset, search)
 
         return queryset
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+    def perform_create(self, serializer):
+        instance = serializer.save()
+        schedule_publication_notifications(instance)
+
+    def perform_update(self, serializer):
+        previous_status = serializer.instance.status
+        instance = serializer.save()
+        if 'image' in self.request.FILES:
+            schedule_image_processing(instance.image)
+        schedule_publication_notifications(instance, previous_status)
+
+    @action(detail=False, methods=['post'], url_path='import', url_name='import',
+            permission_classes=[IsAuthenticated, IsOrganizer])
+    def import_events(self, request):
+        """
+        Массовое создание мероприятий: JSON-список (или {"events": [...]}) либо файл
+        .csv/.json в поле file. Строки с ошибками пропускаются, остальные создаются.
+        """
+        try:
+            upload = request.FILES.get('file')
+            if upload is not None:
+                rows = parse_event_file(upload.name, upload.read())
+            else:
+                rows = request.data if isinstance(request.data, list) else request.data.get('events')
+                if not isinstance(rows, list):
+                    raise ValueError('Ожидается список мероприятий или объект с ключом events')
+            result = import_events(request.user, rows)
+        except ValueError as e:
+            raise serializers.ValidationError({'detail': str(e)})
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path='applicants/export')
+    def export_applicants(self, request, pk=None):
+        """
+        Потоковая выгрузка заявителей мероприятия организатора: ?type=csv|xlsx|docx.
+        Параметр называется не format — его занимает выбор рендерера DRF.
+        """
+        file_type = request.query_params.get('type', 'csv')
+        if file_type not in EXPORT_FORMATS:
+            raise serializers.ValidationError({'type': f'Допустимые значения: {", ".join(EXPORT_FORMATS)}'})
+        queryset = Event.objects.filter(organizer_id=request.user.pk).only('id', 'title', 'date')
+        event = get_object_or_404(queryset, pk=pk)
+        # Все строки выгрузки читаются из той же базы, что и мероприятие
+        return export_response(request, event, file_type, using=queryset.db)
+
+class ApplicationViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         try:
             user = self.request.user
-            if hasattr(user, 'organizerprofile'):
-
-                return Application.objects.filter(event__organizer=user).order_by('-created_at')
+            if is_organizer(user):
+                queryset = Application.objects.filter(event__organizer_id=user.pk)
             else:
-
-                return Application.objects.filter(user=user).order_by('-created_at')
+                queryset = Application.objects.filter(user_id=user.pk)
+
+            queryset = queryset.order_by('-created_at')
+            if self.action == 'inbox':
+                return queryset.with_applicant_plan()
+            if self.action in ('list', 'retrieve'):
+                return queryset.with_applicant_plan().with_event_plan(user)
+            return queryset
         except Exception as e:
-            print(f"Ошибка в ApplicationViewSet.get_queryset: {str(e)}")
+            logger.exception('Ошибка в ApplicationViewSet.get_queryset')
             return Application.objects.none()
 
-    def perform_create(self, serializer):
-        print(f"Создание заявки, данные: {self.request.data}")
-        
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return ApplicationSubmitSerializer
+        return ApplicationSerializer
 
+    def perform_create(self, serializer):
         event_id = self.request.data.get('event_id')
-        if not event_id:
-            raise serializers.ValidationError({"detail": "Отсутствует ID мероприятия (event_id)"})
-        
+        logger.debug('Создание заявки', extra={'event_id': event_id})
         try:
-
-            event = Event.objects.get(id=event_id)
-            user = self.request.user
-
-
-            try:
-                talent_profile = user.talent_profile
-                user_faculty = talent_profile.faculty
-            except TalentProfile.DoesNotExist:
-
-                 raise serializers.ValidationError({"detail": "У вас нет профиля таланта для подачи заявки"})
-
-            # Проверка ограничения по факультетам
-            if event.faculty_restriction:
-                if user_faculty is None or user_faculty not in event.faculties.all():
-                     raise serializers.ValidationError(
-                         {"detail": "Это мероприятие ограничено по факультетам, и ваш факультет не соответствует."}
-                     )
-
-            # Проверка на дубликаты заявок
-            existing_application = Application.objects.filter(
-                user=user,
-                event=event
-            ).exists()
-            
-            if existing_application:
-                raise serializers.ValidationError({"detail": "Вы уже подали заявку на это мероприятие"})
-            
-
-            serializer.save(
-                user=user, 
-                event=event
+            serializer.instance = submit_application(
+                self.request.user, event_id, serializer.validated_data.get('message', '')
             )
-            
-        except Event.DoesNotExist:
-            raise serializers.ValidationError({"detail": f"Мероприятие с ID {event_id} не найдено"})
-        except Exception as e:
-            print(f"Ошибка при создании заявки: {str(e)}")
-            raise serializers.ValidationError({"detail": str(e)})
+        except SubmissionError as e:
+            raise serializers.ValidationError({"detail": e.detail})
+
+    @action(detail=False, methods=['get'])
+    def inbox(self, request):
+        """
+        Компактные входящие заявки: мероприятие указывается по ID, а каждое
+        уникальное мероприятие страницы сериализуется один раз в словаре events.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        applications = page if page is not None else list(queryset)
+
+        event_ids = {application.event_id for application in applications}
+        events = Event.objects.with_list_plan(request.user).filter(pk__in=event_ids)
+        events_data = {
+            str(event['id']): event
+            for event in EventSerializer(events, many=True, context=self.get_serializer_context()).data
+        }
+
+        results = ApplicationInboxSerializer(
+            applications, many=True, context=self.get_serializer_context()
+        ).data
+        if page is not None:
+            response = self.get_paginated_response(results)
+        else:
+            response = Response({'results': results})
+        response.data['events'] = events_data
+        return response
 
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
@@ -398,39 +440,124 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application.save()
         return Response(ApplicationSerializer(application).data)
 
-class RecommendationView(ListAPIView):
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        Массовая смена статусов: {"items": [{"id", "status", "comment"?}, ...]}.
+        Принадлежность проверяется одним фильтром по организатору мероприятия,
+        изменения пишутся одним bulk_update в транзакции. Чужие и несуществующие
+        заявки не меняются и возвращаются с ошибкой.
+        """
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = {item['id']: item for item in serializer.validated_data['items']}
+
+        with transaction.atomic():
+            # of=('self',): без него PostgreSQL блокирует и строки мероприятий из JOIN,
+            # а с ними — новые заявки на эти мероприятия и их редактирование
+            applications = list(
+                Application.objects.select_for_update(of=('self',))
+                .filter(pk__in=items, event__organizer_id=request.user.pk)
+                .only('id', 'user_id', 'status', 'organizer_comment')
+            )
+            changes = []
+            for application in applications:
+                item = items[application.pk]
+                changes.append((application.user_id, application.status, item['status']))
+                application.status = item['status']
+                if 'comment' in item:
+                    application.organizer_comment = item['comment']
+            Application.objects.bulk_update(applications, ['status', 'organizer_comment'])
+            # bulk_update не шлёт post_save — счётчики статистики обновляются явно
+            applications_status_changed(changes)
+
+        found = {application.pk: application.status for application in applications}
+        return Response({
+            'updated': len(found),
+            'results': [
+                {'id': pk, 'status': found[pk]} if pk in found else {'id': pk, 'error': 'Заявка не найдена'}
+                for pk in items
+            ],
+        })
+
+class RecommendationView(ReplicaReadMixin, AsyncListMixin, ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = EventSerializer
 
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
     def get_queryset(self):
         try:
-            talent_profile = self.request.user.talent_profile
-            talent_skills = set(talent_profile.skills.all())
-            events = Event.objects.filter(status='published')
-            
-            recommended_events = []
-            for event in events:
-                event_skills = set(event.required_skills.all())
+            talent_profile_id = get_talent_profile_id(self.request.user)
+            if talent_profile_id is None:
+                return Event.objects.none()
+            # Ранжирование и пагинация выполняются в базе (см. core/recommendations.py);
+            # для подбора нужен только ID профиля, поэтому профиль не загружается
+            return recommended_events(
+                TalentProfile(pk=talent_profile_id),
+                queryset=Event.objects.with_list_plan(self.request.user)
+            )
 
-                if talent_skills & event_skills:
-                    recommended_events.append(event)
-            
-            return recommended_events
-            
-        except TalentProfile.DoesNotExist:
-            return Event.objects.none()
         except Exception as e:
-            print(f"Ошибка в RecommendationView.get_queryset: {str(e)}")
+            logger.exception('Ошибка в RecommendationView.get_queryset')
             return Event.objects.none()
 
-class FacultyStatsView(APIView):
+class NotificationViewSet(ReplicaReadMixin, KeysetPaginationMixin, AsyncListMixin, viewsets.GenericViewSet):
+    """
+    Лента уведомлений о подходящих опубликованных мероприятиях (core/notifications.py):
+    готовые строки, без пересчёта рекомендаций. ?unread=1 — только непрочитанные.
+    """
+    serializer_class = EventNotificationSerializer
+    permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-id',)
+
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = EventNotification.objects.filter(user_id=user.pk).order_by('-id')
+        if self.request.query_params.get('unread') in ('1', 'true'):
+            queryset = queryset.filter(read_at__isnull=True)
+        return queryset.prefetch_related(Prefetch('event', queryset=Event.objects.with_list_plan(user)))
+
+    @action(detail=False, methods=['post'])
+    def read(self, request):
+        """Отмечает прочитанными уведомления из ids (или все) одним UPDATE."""
+        serializer = NotificationReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = EventNotification.objects.filter(user_id=request.user.pk, read_at__isnull=True)
+        if 'ids' in serializer.validated_data:
+            queryset = queryset.filter(pk__in=serializer.validated_data['ids'])
+        return Response({'updated': queryset.update(read_at=timezone.now())})
+
+class TalentSearchView(ReplicaReadMixin, AsyncListMixin, ListAPIView):
+    """
+    Поиск талантов: ?skills=1,2&match=any|all&faculty=&education_level=&course=.
+    Кроме страницы профилей возвращает фасеты по всем найденным профилям.
+    """
+    permission_classes = [IsAuthenticated, IsOrganizer]
+    serializer_class = TalentSearchSerializer
+
+    async def get(self, request, *args, **kwargs):
+        self.filters = parse_filters(request.query_params)
+        response = await self.alist(request, *args, **kwargs)
+        response.data['facets'] = group_facets([row async for row in facets_query(self.filters)])
+        return response
+
+    def get_queryset(self):
+        return search_talents(self.filters).select_related('user', 'faculty').prefetch_related('skills')
+
+class FacultyStatsView(ReplicaReadMixin, AsyncAPIViewMixin, APIView):
     permission_classes = [IsAuthenticated]
     
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         try:
-            talent_profile = request.user.talent_profile
-            
-            if not talent_profile or not talent_profile.faculty:
+            faculty_id = await aget_faculty_id(request.user)
+            faculty = await Faculty.objects.select_related('stats').filter(pk=faculty_id).afirst() if faculty_id else None
+
+            if faculty is None:
                 return Response({
                     'faculty': None,
                     'message': 'Нет информации',
@@ -440,13 +567,11 @@ class FacultyStatsView(APIView):
                     }
                 })
             
-            faculty = talent_profile.faculty
-            
-            total_users = TalentProfile.objects.filter(faculty=faculty).count()
-            
-            faculty_users = TalentProfile.objects.filter(faculty=faculty).values_list('user_id', flat=True)
-            total_applications = Application.objects.filter(user_id__in=faculty_users).count()
-            
+            # Счётчики поддерживаются сигналами (core/stats.py)
+            faculty_stats = getattr(faculty, 'stats', None)
+            total_users = faculty_stats.users_count if faculty_stats else 0
+            total_applications = faculty_stats.applications_count if faculty_stats else 0
+
             return Response({
                 'faculty': {
                     'id': faculty.id,
@@ -465,35 +590,32 @@ class FacultyStatsView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class UserActivityStatsView(APIView):
+class UserActivityStatsView(ReplicaReadMixin, AsyncAPIViewMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         try:
             user = request.user
 
-            if not hasattr(user, 'talent_profile'):
+            if await aget_talent_profile_id(user) is None:
                  return Response({
                      'message': 'Эта страница доступна только для пользователей-талантов.'
                  }, status=status.HTTP_403_FORBIDDEN)
 
-            total_applications = Application.objects.filter(user=user).count()
-
-            approved_applications = Application.objects.filter(user=user, status='approved').count()
+            # Счётчики поддерживаются сигналами (core/stats.py)
+            activity = await UserActivityStats.objects.filter(user_id=user.pk).afirst()
 
             # Статистика по навыкам из мероприятий, на которые пользователь подал заявку
-            applied_events = Event.objects.filter(application__user=user)
-
-            skill_list = []
-            for event in applied_events:
-                if event.required_skills.exists():
-                    skill_list.extend(event.required_skills.values_list('name', flat=True))
-
-            skill_counts = dict(Counter(skill_list))
+            skill_counts = {
+                name: count
+                async for name, count in UserSkillStat.objects.filter(user_id=user.pk, count__gt=0)
+                .order_by('-count', 'skill__name')
+                .values_list('skill__name', 'count')
+            }
 
             return Response({
-                'total_applications': total_applications,
-                'approved_applications': approved_applications,
+                'total_applications': activity.total_applications if activity else 0,
+                'approved_applications': activity.approved_applications if activity else 0,
                 'skill_stats': skill_counts
             })
 
@@ -502,20 +624,35 @@ class UserActivityStatsView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ReplicaReadMixin, ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all().order_by('name')
     serializer_class = SkillSerializer
     permission_classes = [AllowAny]
     pagination_class = None 
+    cache_namespace = 'skills'
+
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
-            if self.request.user.is_authenticated and (self.request.user.is_staff or hasattr(self.request.user, 'organizerprofile')):
-                return [permissions.IsAuthenticated()]
-            return [permissions.IsAdminUser()]
+            return [(IsAdminUser | IsOrganizer)()]
         return [AllowAny()]
 
-class OrganizerProfilePublicView(RetrieveAPIView):
+class OrganizerProfilePublicView(ReplicaReadMixin, RetrieveAPIView):
     queryset = OrganizerProfile.objects.all()
     serializer_class = OrganizerProfileSerializer
     permission_classes = [AllowAny]
     lookup_field = 'pk'
+
+class DatabasePoolStatsView(APIView):
+    """Заполненность пула соединений с базой в текущем воркере (см. core/dbpool.py)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(all_pool_stats())
+
+
+class RequestMetricsView(APIView):
+    """Гистограммы времени, SQL-запросов и размера ответов по маршрутам (см. core/perf.py)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'pid': os.getpid(), 'routes': summarize(collect())})
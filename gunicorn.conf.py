@@ -0,0 +1,56 @@
+# Конфигурация gunicorn для продакшена (подхватывается автоматически из корня проекта).
+#
+# SERVER_MODE=asgi (по умолчанию) — воркеры uvicorn, приложение talent_system.asgi.
+#   Async-представления (список мероприятий, рекомендации, статистика) ждут базу
+#   без блокировки потока; синхронные выполняются в пуле потоков Django.
+# SERVER_MODE=wsgi — воркеры gevent, приложение talent_system.wsgi. psycopg 3
+#   сам определяет monkey-patching gevent и не блокирует воркер на запросах к базе.
+#
+# Соединения с базой (пул, CONN_MAX_AGE) настраиваются в settings.py через DB_*.
+#
+# Все параметры переопределяются переменными окружения GUNICORN_*.
+
+import multiprocessing
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'asgi')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+if SERVER_MODE == 'wsgi':
+    wsgi_app = 'talent_system.wsgi:application'
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+    if worker_class == 'gthread':
+        threads = int(os.environ.get('GUNICORN_THREADS', 4))
+    else:
+        # Одновременных соединений на gevent-воркер (потоки gevent не использует)
+        worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 200))
+else:
+    wsgi_app = 'talent_system.asgi:application'
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker')
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Периодический перезапуск воркеров ограничивает рост памяти
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# X-Forwarded-* (is_secure(), редиректы, IP в логах) принимаются только от перечисленных
+# прокси. Порт 8000 опубликован напрямую (docker-compose.yml), поэтому '*' — только
+# если до gunicorn нельзя достучаться в обход прокси
+forwarded_allow_ips = os.environ.get('GUNICORN_FORWARDED_ALLOW_IPS', '127.0.0.1')
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # Состояние в кэше (версии claims и т.п.) должно быть общим для всех воркеров:
+    # с локальным кэшем каждого процесса запуск завершается ошибкой (core/checks.py)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_system.settings')
+    from core.checks import require_shared_cache
+    require_shared_cache(server.cfg.workers)